@@ -0,0 +1,188 @@
+"""
+Declarative achievements for the Number Guessing Game.
+
+An achievement is a Rule: when `event` happens, unlock if `counter` compares
+to `threshold` with `op`, e.g. Rule('winning_streak', ..., 'win',
+'winning_streak', '>=', 3). Counters are named getters on the engine
+(COUNTERS); new ones are added with register_counter() and new
+achievements with register_achievement().
+
+An AchievementEngine indexes the still-locked rules by event and counter,
+with each counter's thresholds kept sorted. An event reads only the
+counters that rules for it depend on and finds the rules to unlock by
+bisection, so its cost grows with the counters involved, not with the
+number of achievements. Unlocked rules leave the index; restore() takes
+out the ones a saved profile has already unlocked.
+"""
+import operator
+from bisect import bisect_left, bisect_right
+
+# Events the engine fires
+WIN = 'win'
+LOSS = 'loss'
+GUESS = 'guess'
+
+OPS = {
+    '>=': operator.ge,
+    '>': operator.gt,
+    '<=': operator.le,
+    '<': operator.lt,
+    '==': operator.eq
+}
+
+# Counter name -> getter on the engine
+COUNTERS = {
+    'score': lambda engine: engine.score,
+    'attempts': lambda engine: engine.attempts,
+    'time_elapsed': lambda engine: engine.time_elapsed,
+    'hints_used': lambda engine: engine.hint_budget - engine.hints_remaining,
+    # Wins this session; never reset by a loss
+    'winning_streak': lambda engine: engine.winning_streak,
+    'session_wins': lambda engine: engine.games_played,
+    'total_wins': lambda engine: engine.player_profile['games_played'],
+    'total_score': lambda engine: engine.player_profile['total_score'],
+    'total_guesses': lambda engine: engine.player_profile['stats']['total_guesses']
+}
+
+
+def register_counter(name, getter):
+    """Make getter(engine) available to rules as counter `name`"""
+    COUNTERS[name] = getter
+
+
+class Rule:
+    """Unlock achievement `id` when, on `event`, `counter` `op` `threshold` holds"""
+    def __init__(self, id, name, description, event, counter, op, threshold):
+        if op not in OPS:
+            raise ValueError(f"Unknown comparison: {op}")
+        self.id = id
+        self.name = name
+        self.description = description
+        self.event = event
+        self.counter = counter
+        self.op = op
+        self.threshold = threshold
+
+    def matches(self, value):
+        return OPS[self.op](value, self.threshold)
+
+
+RULES = {}
+
+
+def register_achievement(rule):
+    """Add an achievement for engines created from now on; returns it"""
+    RULES[rule.id] = rule
+    ACHIEVEMENTS[rule.id] = {'name': rule.name, 'description': rule.description}
+    return rule
+
+
+# Display names and descriptions, by id
+ACHIEVEMENTS = {}
+
+for _rule in (
+        Rule('first_win', 'First Win', 'Win your first game', WIN, 'score', '>', 0),
+        Rule('winning_streak', 'Winning Streak', 'Win 3 games in a row',
+             WIN, 'winning_streak', '>=', 3),
+        Rule('perfect_game', 'Perfect Game', 'Win with the first guess', WIN, 'attempts', '==', 1),
+        Rule('speed_demon', 'Speed Demon', 'Win in under 30 seconds', WIN, 'time_elapsed', '<', 30),
+        Rule('master_guesser', 'Master Guesser', 'Play 10 games', WIN, 'session_wins', '>=', 10)):
+    register_achievement(_rule)
+
+
+class CounterIndex:
+    """Locked rules on one counter for one event, sorted by threshold"""
+    def __init__(self, counter, rules):
+        self.counter = counter
+        self.getter = COUNTERS[counter]
+        self.rising = {}
+        self.falling = {}
+        self.equal = {}
+        for rule in rules:
+            if rule.op == '==':
+                self.equal.setdefault(rule.threshold, []).append(rule)
+            else:
+                side = self.rising if rule.op in ('>=', '>') else self.falling
+                side.setdefault(rule.op, []).append(rule)
+        for side in (self.rising, self.falling):
+            for op, group in side.items():
+                group.sort(key=lambda rule: rule.threshold)
+                side[op] = (group, [rule.threshold for rule in group])
+
+    def match(self, value):
+        """Rules that value satisfies; removes them from the index"""
+        matched = []
+        for op, (group, thresholds) in self.rising.items():
+            # Thresholds below the value (or equal, for >=) all match
+            cut = (bisect_right if op == '>=' else bisect_left)(thresholds, value)
+            if cut:
+                matched.extend(group[:cut])
+                del group[:cut], thresholds[:cut]
+        for op, (group, thresholds) in self.falling.items():
+            cut = (bisect_left if op == '<=' else bisect_right)(thresholds, value)
+            if cut < len(group):
+                matched.extend(group[cut:])
+                del group[cut:], thresholds[cut:]
+        if self.equal:
+            matched.extend(self.equal.pop(value, ()))
+        return matched
+
+    def remove(self, rule):
+        if rule.op == '==':
+            group = self.equal.get(rule.threshold, [])
+            if rule in group:
+                group.remove(rule)
+            return
+        group, thresholds = (self.rising if rule.op in ('>=', '>') else self.falling)[rule.op]
+        if rule in group:
+            del thresholds[group.index(rule)]
+            group.remove(rule)
+
+
+class AchievementEngine:
+    """Unlock state for a set of rules, indexed by the events that trigger them"""
+    def __init__(self, rules=None):
+        if rules is None:
+            rules = RULES
+        rules = list(rules.values()) if isinstance(rules, dict) else list(rules)
+        self.rules = {rule.id: rule for rule in rules}
+        self._order = {rule.id: position for position, rule in enumerate(rules)}
+        # The engine's achievements dict: id -> name, description, unlocked
+        self.state = {rule.id: {'name': rule.name, 'description': rule.description, 'unlocked': False}
+                      for rule in rules}
+        self._index = {}
+        grouped = {}
+        for rule in rules:
+            grouped.setdefault(rule.event, {}).setdefault(rule.counter, []).append(rule)
+        for event, counters in grouped.items():
+            self._index[event] = [CounterIndex(counter, group) for counter, group in counters.items()]
+
+    def fire(self, event, engine):
+        """Evaluate the locked rules that depend on event; returns the ids unlocked, in rule order"""
+        indexes = self._index.get(event)
+        if not indexes:
+            return []
+        matched = []
+        for index in indexes:
+            matched.extend(index.match(index.getter(engine)))
+        if not matched:
+            return []
+        for rule in matched:
+            self.state[rule.id]['unlocked'] = True
+        matched.sort(key=lambda rule: self._order[rule.id])
+        return [rule.id for rule in matched]
+
+    def restore(self, unlocked_ids):
+        """Mark saved unlocks (e.g. player_profile['achievements']) as unlocked"""
+        for achievement_id in unlocked_ids:
+            rule = self.rules.get(achievement_id)
+            if rule is None or self.state[achievement_id]['unlocked']:
+                continue
+            self.state[achievement_id]['unlocked'] = True
+            for index in self._index.get(rule.event, ()):
+                if index.counter == rule.counter:
+                    index.remove(rule)
+
+    def unlock(self, achievement_id):
+        """Unlock directly, outside any rule"""
+        self.restore([achievement_id])
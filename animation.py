@@ -0,0 +1,135 @@
+"""
+Central animation and timer scheduler for the Tk games.
+
+Every animated widget and on-screen timer registers a task here instead of
+running its own after() chain. One after() timer drives all tasks from a
+single clock: it wakes only when the next task is due, gives each frame a
+time budget (tasks that do not fit wait for the next frame), drops missed
+frames instead of replaying them, and stops scheduling entirely when no
+task is registered, so an idle window uses no CPU.
+"""
+import time
+
+# Default animation frame interval and per-frame work budget
+FRAME_MS = 50
+BUDGET_MS = 8
+
+
+class Task:
+    """A callback the scheduler runs every interval_ms"""
+    def __init__(self, callback, interval_ms, widget=None):
+        self.callback = callback
+        self.interval = interval_ms / 1000
+        self.widget = widget
+        self.due = 0.0
+        self.active = True
+
+
+class AnimationScheduler:
+    """Runs all registered tasks from one Tk after() timer"""
+    def __init__(self, root, budget_ms=BUDGET_MS, clock=time.perf_counter):
+        self.root = root
+        self.budget = budget_ms / 1000
+        self.clock = clock
+        self.tasks = []
+        self._job = None
+        self._wake_at = None
+        self.counters = {'frames': 0, 'runs': 0, 'deferred': 0, 'dropped': 0}
+
+    def add(self, callback, interval_ms=FRAME_MS, widget=None, delay_ms=None):
+        """Call callback(now) every interval_ms until it returns False.
+
+        When widget is given the task also ends once the widget is destroyed.
+        The first call happens after delay_ms (default: one interval).
+        """
+        task = Task(callback, interval_ms, widget)
+        delay = task.interval if delay_ms is None else delay_ms / 1000
+        task.due = self.clock() + delay
+        self.tasks.append(task)
+        self._schedule()
+        return task
+
+    def remove(self, task):
+        """Stop a task; safe to call more than once"""
+        if task is None or not task.active:
+            return
+        task.active = False
+        if task in self.tasks:
+            self.tasks.remove(task)
+        if not self.tasks:
+            self._cancel()
+
+    @property
+    def idle(self):
+        return not self.tasks
+
+    def _cancel(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+            self._wake_at = None
+
+    def _schedule(self):
+        """Wake up when the earliest task is due (or not at all)"""
+        if not self.tasks:
+            self._cancel()
+            return
+        wake_at = min(task.due for task in self.tasks)
+        if self._job is not None and self._wake_at is not None and self._wake_at <= wake_at:
+            return
+        self._cancel()
+        delay_ms = max(0, int((wake_at - self.clock()) * 1000))
+        self._wake_at = wake_at
+        self._job = self.root.after(delay_ms, self._tick)
+
+    def _tick(self):
+        self._job = None
+        self._wake_at = None
+        frame_start = self.clock()
+        self.counters['frames'] += 1
+
+        due = sorted((task for task in self.tasks if task.due <= frame_start), key=lambda t: t.due)
+        for i, task in enumerate(due):
+            if self.clock() - frame_start > self.budget:
+                # Over budget: the rest run first thing next frame
+                self.counters['deferred'] += len(due) - i
+                break
+            if not task.active:
+                continue
+            if task.widget is not None and not self._widget_alive(task.widget):
+                self.remove(task)
+                continue
+            now = self.clock()
+            try:
+                keep = task.callback(now)
+            except Exception as e:
+                print(f"Animation error: {e}")
+                keep = False
+            self.counters['runs'] += 1
+            if keep is False:
+                self.remove(task)
+                continue
+            # Skip frames we are already late for instead of replaying them
+            missed = int((now - task.due) // task.interval)
+            if missed > 0:
+                self.counters['dropped'] += missed
+            task.due += (missed + 1) * task.interval
+
+        self._schedule()
+
+    @staticmethod
+    def _widget_alive(widget):
+        try:
+            return bool(widget.winfo_exists())
+        except Exception:
+            return False
+
+
+def get_scheduler(widget):
+    """The shared scheduler for widget's Tk root"""
+    root = widget._root()
+    scheduler = getattr(root, '_animation_scheduler', None)
+    if scheduler is None:
+        scheduler = AnimationScheduler(root)
+        root._animation_scheduler = scheduler
+    return scheduler
@@ -0,0 +1,234 @@
+"""
+Vectorized batch simulator for the Number Guessing Game.
+
+Plays many rounds at once as NumPy arrays (one row per round) using the
+rules from game_engine.py, so game_modes and the calculate_score penalties
+can be tuned from score and win-rate distributions instead of by feel.
+
+Each round keeps a mask of the numbers still possible. The hint removes
+every number whose hint text differs from the secret's (using the
+generators' vectorised classes(), as calibrator.py does) and each wrong
+guess removes one side. Policies pick a position among the remaining
+candidates, so a hint that is not an interval (parity, divisibility, digit
+sum) is used in full.
+
+Usage:
+    python batch_simulator.py [rounds] [policy]
+"""
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from game_engine import GAME_MODES, DIFFICULTY_ATTEMPTS
+from hints import HINTS, hint_family
+
+# Score constants, mirroring GameEngine.calculate_score
+BASE_SCORE = 1000
+TIME_PENALTY = 2
+HINT_PENALTY = 100
+ATTEMPT_PENALTY = 50
+
+CHUNK_SIZE = 1_000_000
+
+
+# Policies get, per round, the first and last position among the remaining
+# candidates (0 and candidates - 1) and return the position to guess
+def binary_policy(lo, hi, rng):
+    """Guess the middle remaining candidate"""
+    return (lo + hi) // 2
+
+
+def random_policy(lo, hi, rng):
+    """Guess a remaining candidate uniformly"""
+    return rng.integers(lo, hi + 1)
+
+
+def linear_policy(lo, hi, rng):
+    """Guess the smallest number still possible"""
+    return lo.copy()
+
+
+POLICIES = {
+    'binary': binary_policy,
+    'random': random_policy,
+    'linear': linear_policy
+}
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("batch_simulator needs numpy: pip install numpy")
+
+
+def _hint_candidates(difficulty, secret, numbers, low, high, rng):
+    """Mask of the numbers that get the same hint text as each round's secret.
+
+    Like the engine's 'random' hint policy, each round is shown one
+    generator of the difficulty's family, picked uniformly.
+    """
+    names = hint_family(difficulty)
+    picked = rng.integers(0, len(names), size=secret.shape)
+    candidates = np.zeros((secret.shape[0], numbers.shape[0]), dtype=bool)
+    for index, name in enumerate(names):
+        rows = picked == index
+        labels = np.asarray(HINTS[name].classes(numbers, low, high))
+        candidates[rows] = labels[None, :] == labels[secret[rows] - low][:, None]
+    return candidates
+
+
+def simulate_chunk(mode, difficulty, n_rounds, policy, rng, use_hint=False,
+                   seconds_per_guess=3.0, max_attempts=None):
+    """Play n_rounds rounds at once and return the per-round arrays.
+
+    max_attempts defaults to the difficulty's attempts, as in the game.
+    Returns a dict of arrays: secret, won, attempts, elapsed, hints_used
+    and score (0 for lost rounds, as the game only scores wins).
+    """
+    _require_numpy()
+    config = GAME_MODES[mode]
+    low, high = config['range']
+    time_limit = config['time_limit']
+    if max_attempts is None:
+        max_attempts = DIFFICULTY_ATTEMPTS[difficulty]
+
+    secret = rng.integers(low, high + 1, size=n_rounds, dtype=np.int64)
+    numbers = np.arange(low, high + 1, dtype=np.int64)
+    attempts = np.zeros(n_rounds, dtype=np.int64)
+    elapsed = np.zeros(n_rounds, dtype=np.float64)
+    won = np.zeros(n_rounds, dtype=bool)
+    active = np.ones(n_rounds, dtype=bool)
+    hints_used = np.full(n_rounds, int(use_hint), dtype=np.int64)
+
+    if use_hint:
+        candidates = _hint_candidates(difficulty, secret, numbers, low, high, rng)
+    else:
+        candidates = np.ones((n_rounds, numbers.shape[0]), dtype=bool)
+
+    first = np.zeros(n_rounds, dtype=np.int64)
+    # Smallest type that counts every number in the range
+    count_type = np.min_scalar_type(numbers.shape[0])
+    for _ in range(max_attempts):
+        # Candidates up to each number; the secret is always one, so no row is empty
+        counted = np.cumsum(candidates, axis=1, dtype=count_type)
+        position = policy(first, counted[:, -1].astype(np.int64) - 1, rng)
+        guess = numbers[np.argmax(counted > position[:, None], axis=1)]
+
+        elapsed += np.where(active, rng.exponential(seconds_per_guess, size=n_rounds), 0.0)
+        if time_limit is not None:
+            active &= elapsed <= time_limit
+        attempts += active
+
+        correct = active & (guess == secret)
+        too_low = active & (guess < secret)
+        too_high = active & (guess > secret)
+        candidates &= ~(too_low[:, None] & (numbers[None, :] <= guess[:, None]))
+        candidates &= ~(too_high[:, None] & (numbers[None, :] >= guess[:, None]))
+        won |= correct
+        active &= ~correct
+        if not active.any():
+            break
+
+    score = (BASE_SCORE - (elapsed * TIME_PENALTY).astype(np.int64)
+             - hints_used * HINT_PENALTY - attempts * ATTEMPT_PENALTY)
+    score = np.where(won, np.maximum(score, 0), 0)
+    return {
+        'secret': secret,
+        'won': won,
+        'attempts': attempts,
+        'elapsed': elapsed,
+        'hints_used': hints_used,
+        'score': score
+    }
+
+
+def simulate(mode, difficulty, n_rounds, policy='binary', use_hint=False,
+             seconds_per_guess=3.0, seed=None, chunk_size=CHUNK_SIZE, max_attempts=None):
+    """Simulate n_rounds rounds and return their summary statistics"""
+    _require_numpy()
+    if isinstance(policy, str):
+        policy = POLICIES[policy]
+    rng = np.random.default_rng(seed)
+    if max_attempts is None:
+        max_attempts = DIFFICULTY_ATTEMPTS[difficulty]
+
+    wins = 0
+    score_sum = 0
+    score_histogram = np.zeros(BASE_SCORE + 1, dtype=np.int64)
+    attempt_counts = np.zeros(max_attempts + 1, dtype=np.int64)
+    remaining = n_rounds
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        rounds = simulate_chunk(mode, difficulty, size, policy, rng,
+                                use_hint=use_hint, seconds_per_guess=seconds_per_guess,
+                                max_attempts=max_attempts)
+        won = rounds['won']
+        wins += int(won.sum())
+        score_sum += int(rounds['score'].sum())
+        score_histogram += np.bincount(rounds['score'][won], minlength=BASE_SCORE + 1)
+        attempt_counts += np.bincount(rounds['attempts'][won], minlength=max_attempts + 1)
+        remaining -= size
+
+    return summarize(n_rounds, wins, score_sum, score_histogram, attempt_counts)
+
+
+def summarize(n_rounds, wins, score_sum, score_histogram, attempt_counts):
+    """Build the result dict from merged counters"""
+    result = {
+        'rounds': n_rounds,
+        'wins': wins,
+        'win_rate': wins / n_rounds if n_rounds else 0,
+        'mean_score': score_sum / n_rounds if n_rounds else 0,
+        'score_percentiles': {},
+        'attempts_distribution': {
+            attempts: int(count) for attempts, count in enumerate(attempt_counts) if count
+        }
+    }
+    if wins:
+        cumulative = np.cumsum(score_histogram)
+        for pct in (10, 50, 90):
+            result['score_percentiles'][f'p{pct}'] = int(np.searchsorted(cumulative, wins * pct / 100))
+    return result
+
+
+def simulate_all(n_rounds, policy='binary', use_hint=False, seconds_per_guess=3.0, seed=None):
+    """Simulate every mode and difficulty; returns {mode: {difficulty: summary}}"""
+    _require_numpy()
+    seeds = np.random.SeedSequence(seed).spawn(len(GAME_MODES) * len(DIFFICULTY_ATTEMPTS))
+    results = {}
+    index = 0
+    for mode in GAME_MODES:
+        results[mode] = {}
+        for difficulty in DIFFICULTY_ATTEMPTS:
+            results[mode][difficulty] = simulate(mode, difficulty, n_rounds, policy=policy,
+                                                 use_hint=use_hint,
+                                                 seconds_per_guess=seconds_per_guess,
+                                                 seed=seeds[index])
+            index += 1
+    return results
+
+
+def main():
+    n_rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    policy = sys.argv[2] if len(sys.argv) > 2 else 'binary'
+
+    start = time.perf_counter()
+    results = simulate_all(n_rounds, policy=policy)
+    duration = time.perf_counter() - start
+    total = n_rounds * len(GAME_MODES) * len(DIFFICULTY_ATTEMPTS)
+
+    print(f"=== Batch simulation: {policy} policy, {n_rounds} rounds per cell ===")
+    for mode, by_difficulty in results.items():
+        for difficulty, summary in by_difficulty.items():
+            percentiles = summary['score_percentiles']
+            print(f"{mode:>12} {difficulty:>6}: win rate {summary['win_rate'] * 100:5.1f}%  "
+                  f"mean score {summary['mean_score']:7.1f}  "
+                  f"p50 {percentiles.get('p50', 0):4d}  p90 {percentiles.get('p90', 0):4d}")
+    print(f"\n{total} rounds in {duration:.2f}s ({total / duration * 60 / 1e6:.1f}M rounds/minute)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Hint and difficulty calibrator for the Number Guessing Game.
+
+For a range, a hint family and a hint policy, works out over every secret
+at once (with NumPy) what the hint tells an optimal player:
+
+  * A hint splits the range into classes of numbers that get the same
+    text; seeing the text leaves the player with its class. The expected
+    entropy reduction is log2(n) minus the average log2 of the class left.
+    Under the 'random' policy each generator of the family is equally
+    likely, so the player also learns which one was drawn.
+  * Taking the hint first is never worse (see solver.py), and after it k
+    guesses find at most 2**k - 1 numbers of the class, so the win
+    probability with k attempts is sum(min(class size, 2**k - 1)) / n.
+
+calibrate() searches range widths, attempt counts and hint budgets for the
+preset whose optimal-play win rate is closest to a target, preferring the
+mode's own range when a preset on it is close enough and otherwise the
+width nearest to it. Presets are written to data/difficulty_presets.json
+and can be played with GameEngine.apply_preset(). The engine gives one
+hint text per round (a second hint would repeat it), so budgets are 0 or 1.
+
+Usage:
+    python calibrator.py [easy_target] [medium_target] [hard_target] [policy]
+"""
+import math
+import os
+import sys
+import time
+
+from game_engine import GAME_MODES, DIFFICULTY_ATTEMPTS, attempts_for_range
+from hints import HINTS, HINT_POLICIES, hint_family
+from persistence import write_json
+
+PRESETS_FILE = os.path.join('data', 'difficulty_presets.json')
+
+# Every secret is labelled in memory, so ranges are capped
+MAX_RANGE = 1 << 22
+
+# Range widths (starting at the mode's low end) tried by calibrate()
+RANGE_WIDTHS = range(10, 1001)
+
+# Optimal-play win rates the presets aim for
+TARGET_WIN_RATES = {
+    'easy': 0.9,
+    'medium': 0.6,
+    'hard': 0.3
+}
+
+# A preset on the mode's range is kept if it is this close to the target
+TOLERANCE = 0.05
+
+
+class HintPartition:
+    """Classes a hint family splits [low, high] into, as seen by the player"""
+    def __init__(self, low, high, names=(), policy='random'):
+        import numpy as np
+        size = high - low + 1
+        if size > MAX_RANGE:
+            raise ValueError(f"Range {low}-{high} is too wide to calibrate (max {MAX_RANGE} numbers)")
+        if policy not in HINT_POLICIES:
+            raise ValueError(f"Unknown hint policy: {policy}")
+        self.low = low
+        self.high = high
+        self.size = size
+        self.names = tuple(names)
+        self.policy = policy
+        if not self.names:
+            # No hint: one class, the whole range
+            self.sizes = np.array([size], dtype=np.int64)
+            self.weight = 1.0
+            return
+        numbers = np.arange(low, high + 1, dtype=np.int64)
+        labels = []
+        for name in self.names:
+            _, inverse, counts = np.unique(HINTS[name].classes(numbers, low, high),
+                                           return_inverse=True, return_counts=True)
+            labels.append((inverse, counts))
+        if policy == 'random':
+            # Each generator shows its whole split, 1/len(names) of the time
+            self.sizes = np.concatenate([counts for _, counts in labels])
+            self.weight = 1 / len(self.names)
+            return
+        # Every secret sees one generator, picked by the gains HintSet ranks
+        shared = np.stack([counts[inverse] for inverse, counts in labels])
+        if policy == 'most_informative':
+            # Smallest class; ties go to the last generator, as in HintSet
+            chosen = len(self.names) - 1 - np.argmin(shared[::-1], axis=0)
+        else:
+            chosen = np.argmax(shared, axis=0)
+        stacked = np.stack([inverse for inverse, _ in labels])
+        observed = chosen * size + stacked[chosen, np.arange(size)]
+        self.sizes = np.unique(observed, return_counts=True)[1]
+        self.weight = 1.0
+
+    @property
+    def expected_bits(self):
+        """Expected entropy reduction of the hint, in bits"""
+        import numpy as np
+        sizes = self.sizes.astype(np.float64)
+        left = self.weight * np.sum(sizes * np.log2(sizes)) / self.size
+        return math.log2(self.size) - float(left)
+
+    def win_probability(self, attempts):
+        """Chance an optimal player who takes the hint wins with these attempts"""
+        import numpy as np
+        if attempts <= 0:
+            return 0.0
+        cap = (1 << min(attempts, 62)) - 1
+        return float(self.weight * np.minimum(self.sizes, cap).sum() / self.size)
+
+
+def hint_report(low, high, attempts=tuple(DIFFICULTY_ATTEMPTS.values())):
+    """Expected bits and win probabilities for each registered hint alone"""
+    report = {}
+    for name in HINTS:
+        partition = HintPartition(low, high, (name,))
+        report[name] = {
+            'bits': partition.expected_bits,
+            'win_probability': {k: partition.win_probability(k) for k in attempts}
+        }
+    return report
+
+
+def calibrate(target, names, policy='random', low=1, widths=RANGE_WIDTHS, default_width=20,
+              tolerance=TOLERANCE):
+    """The preset whose optimal-play win rate is closest to target.
+
+    Presets within tolerance of the target on default_width are preferred;
+    otherwise the smallest error wins, then the width nearest default_width,
+    then presets with a hint.
+    """
+    best = None
+    for width in widths:
+        high = low + width - 1
+        partitions = {0: HintPartition(low, high), 1: HintPartition(low, high, names, policy)}
+        for hints, partition in partitions.items():
+            for attempts in range(1, attempts_for_range(low, high) + 1):
+                chance = partition.win_probability(attempts)
+                error = abs(chance - target)
+                near_default = width == default_width and error <= tolerance
+                key = (not near_default, error, abs(width - default_width), -hints, attempts)
+                if best is None or key < best[0]:
+                    best = (key, {
+                        'range': [low, high],
+                        'max_attempts': attempts,
+                        'hints': hints,
+                        'hint_family': list(names),
+                        'hint_policy': policy,
+                        'win_probability': chance,
+                        'hint_bits': partition.expected_bits if hints else 0.0
+                    })
+    return best[1]
+
+
+def calibrate_presets(targets=TARGET_WIN_RATES, policy='random', mode='classic'):
+    """A preset per difficulty, using its hint family and the mode's range"""
+    low, high = GAME_MODES[mode]['range']
+    return {difficulty: calibrate(target, hint_family(difficulty), policy, low,
+                                  default_width=high - low + 1)
+            for difficulty, target in targets.items()}
+
+
+def main():
+    targets = dict(TARGET_WIN_RATES)
+    for difficulty, arg in zip(TARGET_WIN_RATES, sys.argv[1:4]):
+        targets[difficulty] = float(arg)
+    policy = sys.argv[4] if len(sys.argv) > 4 else 'random'
+
+    ranges = {}
+    for config in GAME_MODES.values():
+        ranges.setdefault(config['range'], []).append(config['name'])
+    for (low, high), names in ranges.items():
+        print(f"=== {', '.join(names)} ({low}-{high}) ===")
+        print(f"{'Hint':>16}{'bits':>7}" + ''.join(f"{k:>5} att" for k in DIFFICULTY_ATTEMPTS.values()))
+        for name, row in hint_report(low, high).items():
+            chances = ''.join(f"{chance:>9.3f}" for chance in row['win_probability'].values())
+            print(f"{name:>16}{row['bits']:>7.2f}{chances}")
+        for difficulty, attempts in DIFFICULTY_ATTEMPTS.items():
+            partition = HintPartition(low, high, hint_family(difficulty), policy)
+            print(f"  {difficulty} as shipped ({attempts} attempts, {policy} hint): "
+                  f"{partition.expected_bits:.2f} bits, win {partition.win_probability(attempts):.3f}")
+
+    start = time.perf_counter()
+    presets = calibrate_presets(targets, policy)
+    duration = time.perf_counter() - start
+    print(f"\n=== Calibrated presets ({duration:.2f}s) ===")
+    for difficulty, preset in presets.items():
+        low, high = preset['range']
+        print(f"{difficulty:>8}: target {targets[difficulty]:.2f} -> range {low}-{high}, "
+              f"{preset['max_attempts']} attempts, {preset['hints']} hint(s), "
+              f"win {preset['win_probability']:.3f}, hint {preset['hint_bits']:.2f} bits")
+    try:
+        os.makedirs(os.path.dirname(PRESETS_FILE), exist_ok=True)
+        write_json(PRESETS_FILE, presets)
+        print(f"Presets written to {PRESETS_FILE}")
+    except OSError:
+        print("Error saving difficulty presets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Client for game_server.py.
+
+GameClient is a small blocking JSON-lines client. RemoteEngine is a
+GameEngine whose secret number lives on the server: the server picks it,
+judges every guess, hands out hints and enforces attempt and time limits,
+while scoring, the player profile and achievements stay local so the Tk UI
+works the same with either engine.
+
+Final_fixed_game.py uses it when GAME_SERVER is set:
+    GAME_SERVER=127.0.0.1:8765 python Final_fixed_game.py
+"""
+import json
+import socket
+
+from game_engine import GameEngine, INACTIVE
+
+
+class GameServerError(Exception):
+    """The server rejected a request"""
+
+
+class RoundOver(Exception):
+    """The server ended the round (e.g. the time limit ran out)"""
+    def __init__(self, secret=None, seed=None):
+        super().__init__("Round is over")
+        self.secret = secret
+        self.seed = seed
+
+
+class GameClient:
+    """Blocking connection to a game server"""
+    def __init__(self, host='127.0.0.1', port=8765, timeout=5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.file = self.sock.makefile('rwb')
+        self.events = []
+        self._next_id = 1
+
+    def request(self, op, **params):
+        """Send one request and return its reply; raises GameServerError"""
+        request_id = self._next_id
+        self._next_id += 1
+        self.file.write(json.dumps(dict(params, op=op, id=request_id)).encode() + b'\n')
+        self.file.flush()
+        while True:
+            line = self.file.readline()
+            if not line:
+                raise ConnectionError("Game server closed the connection")
+            message = json.loads(line)
+            if 'event' in message:
+                # Pushed by the server, e.g. a round timing out
+                self.events.append(message)
+                continue
+            if not message.get('ok'):
+                raise GameServerError(message.get('error', 'Unknown error'))
+            return message
+
+    def pop_event(self, name):
+        for i, event in enumerate(self.events):
+            if event['event'] == name:
+                return self.events.pop(i)
+        return None
+
+    def close(self):
+        try:
+            self.request('quit')
+        except (OSError, ValueError, GameServerError):
+            pass
+        self.file.close()
+        self.sock.close()
+
+
+class RemoteEngine(GameEngine):
+    """GameEngine that plays its rounds on a game server"""
+    def __init__(self, host='127.0.0.1', port=8765, **kwargs):
+        super().__init__(**kwargs)
+        self.client = GameClient(host, port)
+
+    def start_round(self, secret_number=None, now=None):
+        """Start a round on the server; the secret stays unknown until it ends"""
+        self.client.events.clear()
+        params = {'mode': self.current_mode, 'difficulty': self.difficulty,
+                  'max_attempts': self.max_attempts, 'hints': self.hint_budget}
+        if self.custom_range is not None:
+            params['range'] = list(self.custom_range)
+        self.client.request('new_game', **params)
+        super().start_round(secret_number=0, now=now)
+        self.secret_number = None
+        return None
+
+    def judge(self, guess):
+        try:
+            reply = self.client.request('guess', value=guess)
+        except GameServerError:
+            timeout = self.client.pop_event('timeout')
+            if timeout is None:
+                raise RoundOver()
+            raise RoundOver(timeout['secret'], timeout.get('seed'))
+        if 'secret' in reply:
+            self.secret_number = reply['secret']
+        if 'seed' in reply:
+            self.round.seed = reply['seed']
+        return reply['result']
+
+    def make_guess(self, guess, now=None):
+        try:
+            return super().make_guess(guess, now)
+        except RoundOver as e:
+            # Undo the local attempt that the server never counted
+            self.attempts -= 1
+            self.game_active = False
+            self.secret_number = e.secret
+            self.round.seed = e.seed
+            return {
+                'result': INACTIVE,
+                'game_over': True,
+                'won': False,
+                'score': 0,
+                'new_high_score': False,
+                'achievements': [],
+                'seed': e.seed
+            }
+
+    def get_dynamic_hint(self):
+        return self.client.request('hint')['hint']
+
+    def close(self):
+        self.client.close()
@@ -0,0 +1,592 @@
+"""
+Headless game engine for the Number Guessing Game.
+
+All of the game rules (modes, difficulty, scoring, hints, achievements and
+profile statistics) live here so they can run without a display. The Tk UI
+in Final_fixed_game.py is a thin view on top of GameEngine. RoundRules plays
+bare RoundStates by the same rules, for servers that keep many rounds and
+no player profile.
+"""
+import time
+
+from achievements import WIN, LOSS, GUESS, AchievementEngine
+from hints import HINT_POLICIES, hint_family, hint_set
+from online_stats import ModeStats
+from rng_service import RNGService, secret_for
+from round_state import RoundState
+
+# Game modes
+GAME_MODES = {
+    'classic': {
+        'name': 'Classic Mode',
+        'description': 'Standard number guessing game',
+        'max_attempts': 7,
+        'time_limit': None,
+        'range': (1, 20)
+    },
+    'sudden_death': {
+        'name': 'Sudden Death',
+        'description': 'One attempt to guess correctly!',
+        'max_attempts': 1,
+        'time_limit': None,
+        'range': (1, 20)
+    },
+    'survival': {
+        'name': 'Survival Mode',
+        'description': 'Score accumulates across rounds',
+        'max_attempts': 5,
+        'time_limit': None,
+        'range': (1, 20)
+    },
+    'time_attack': {
+        'name': 'Time Attack',
+        'description': 'Guess under time pressure',
+        'max_attempts': 10,
+        'time_limit': 60,
+        'range': (1, 20)
+    }
+}
+
+# Attempts allowed per difficulty
+DIFFICULTY_ATTEMPTS = {
+    'easy': 7,
+    'medium': 5,
+    'hard': 3
+}
+
+# Guess results
+TOO_LOW = 'too_low'
+TOO_HIGH = 'too_high'
+CORRECT = 'correct'
+OUT_OF_RANGE = 'out_of_range'
+INACTIVE = 'inactive'
+
+# Round events passed to GameEngine.event_sink
+EVENT_START = 'start'
+EVENT_GUESS = 'guess'
+EVENT_HINT = 'hint'
+EVENT_TIMEOUT = 'timeout'
+EVENT_END = 'end'
+
+
+def default_high_scores():
+    """High scores for each difficulty and game mode"""
+    return {
+        'easy': 0,
+        'medium': 0,
+        'hard': 0,
+        'sudden_death': 0,
+        'survival': 0,
+        'time_attack': 0
+    }
+
+
+def default_profile():
+    """A fresh player profile"""
+    return {
+        'name': 'Player',
+        'avatar': 'default',
+        'games_played': 0,
+        'total_score': 0,
+        'best_time': float('inf'),
+        'achievements': [],
+        'stats': {
+            'accuracy': 0,
+            'avg_guess_time': 0,
+            'total_guesses': 0,
+            'correct_guesses': 0
+        }
+    }
+
+
+def attempts_for_range(low, high):
+    """Attempts binary search needs to always find a number in [low, high]"""
+    return (high - low + 1).bit_length()
+
+
+def judge_guess(guess, secret):
+    """Compare a guess with the secret: TOO_LOW, TOO_HIGH or CORRECT"""
+    if guess < secret:
+        return TOO_LOW
+    if guess > secret:
+        return TOO_HIGH
+    return CORRECT
+
+
+def round_score(time_elapsed, hints_used, attempts):
+    """Score of a won round"""
+    base_score = 1000
+    time_penalty = int(time_elapsed * 2)
+    hint_penalty = hints_used * 100  # Penalty for hints used
+    attempt_penalty = attempts * 50
+
+    score = base_score - time_penalty - hint_penalty - attempt_penalty
+    return max(0, score)
+
+
+def _round_field(name):
+    """Engine attribute stored on the current RoundState"""
+    return property(lambda self: getattr(self.round, name),
+                    lambda self, value: setattr(self.round, name, value))
+
+
+class GameEngine:
+    """Tk-free game state and rules.
+
+    The engine never touches the disk or the screen: callers read the
+    returned result dicts and decide what to show and what to save.
+
+    Randomness comes from an RNGService: each round has its own seed, given
+    in the final outcome and in round_record(), from which replay_round()
+    plays it again exactly. Pass seed (or an rng to draw one from) to make a
+    whole session reproducible.
+
+    event_sink, when set, is called as event_sink(event, engine, now, value)
+    for every round event (EVENT_START with the seed, EVENT_GUESS with the
+    guess, EVENT_HINT, EVENT_TIMEOUT and EVENT_END with the score), e.g. by
+    a round_log.RoundLog.
+    """
+    def __init__(self, rng=None, clock=time.time, seed=None):
+        if seed is None and rng is not None:
+            seed = rng.getrandbits(64)
+        self.rng_service = RNGService(seed)
+        self.clock = clock
+
+        self.game_modes = GAME_MODES
+        self.current_mode = 'classic'
+        # (low, high) replacing every mode's range, or None
+        self.custom_range = None
+        # Hint generator names replacing the difficulty's family, or None
+        self.hint_names = None
+        self.hint_policy = 'random'
+        # Hints allowed per round
+        self.hint_budget = 1
+        self.event_sink = None
+        self.difficulty = 'medium'
+        self.max_attempts = DIFFICULTY_ATTEMPTS['medium']
+
+        # Round state
+        self.score = 0
+        low, high = self.number_range
+        self.round = RoundState(0, self.max_attempts, low, high, active=False)
+
+        # Session state
+        self.survival_score = 0
+        self.winning_streak = 0
+        self.games_played = 0
+
+        self.high_scores = default_high_scores()
+        self.player_profile = default_profile()
+        # (op, path, value) records of profile mutations not yet persisted
+        self.profile_changes = []
+        # Per-mode guess time / attempts / score distributions
+        self._mode_stats = {}
+        # Registered achievement rules, indexed by trigger
+        self.achievement_engine = AchievementEngine()
+        self.achievements = self.achievement_engine.state
+
+    def set_profile(self, profile):
+        """Replace the player profile, e.g. after loading it from disk"""
+        self.player_profile = profile
+        self._mode_stats = {}
+        self.achievement_engine.restore(profile.get('achievements', ()))
+
+    def mode_stats(self, mode=None):
+        """Streaming distributions for a mode, restored from the profile"""
+        mode = mode or self.current_mode
+        if mode not in self._mode_stats:
+            saved = self.player_profile.get('distributions', {}).get(mode)
+            self._mode_stats[mode] = ModeStats.from_dict(saved)
+        return self._mode_stats[mode]
+
+    # Round state lives in self.round; these keep the engine's attribute names
+    secret_number = _round_field('secret')
+    attempts = _round_field('attempts')
+    game_active = _round_field('active')
+    hints_remaining = _round_field('hints_remaining')
+    start_time = _round_field('start_time')
+    last_guess_at = _round_field('last_guess_at')
+    time_elapsed = _round_field('time_elapsed')
+    low_bound = _round_field('low_bound')
+    high_bound = _round_field('high_bound')
+    hint_text = _round_field('hint_text')
+
+    @property
+    def last_guess(self):
+        return self.round.last_guess
+
+    @property
+    def guess_history(self):
+        return self.round.history
+
+    @property
+    def number_range(self):
+        return self.custom_range or self.game_modes[self.current_mode]['range']
+
+    def set_range(self, low=None, high=None):
+        """Play on [low, high] (any size) in every mode; set_range() undoes it"""
+        if low is None:
+            self.custom_range = None
+            return
+        if low > high:
+            raise ValueError(f"Empty range: {low}-{high}")
+        self.custom_range = (low, high)
+
+    def set_mode(self, mode):
+        if mode not in self.game_modes:
+            raise ValueError(f"Unknown game mode: {mode}")
+        self.current_mode = mode
+
+    def set_difficulty(self, difficulty):
+        self.difficulty = difficulty
+        self.max_attempts = DIFFICULTY_ATTEMPTS.get(difficulty, DIFFICULTY_ATTEMPTS['hard'])
+
+    def reset_round(self):
+        """Return to the idle state between rounds"""
+        low, high = self.number_range
+        self.round = RoundState(self.secret_number, self.max_attempts, low, high, active=False,
+                                hints=self.hint_budget)
+
+    def start_round(self, secret_number=None, now=None, seed=None):
+        """Start a new round and return the secret number.
+
+        seed replays a recorded round; by default the session's next round
+        seed is used.
+        """
+        low, high = self.number_range
+        if seed is None:
+            seed = self.rng_service.next_round()
+        if secret_number is None:
+            secret_number = secret_for(seed, low, high)
+        now = self.clock() if now is None else now
+        self.round = RoundState(secret_number, self.max_attempts, low, high, now,
+                                hints=self.hint_budget, seed=seed)
+        if self.event_sink is not None:
+            self.event_sink(EVENT_START, self, now, seed)
+        return secret_number
+
+    def tick(self, now=None):
+        """Refresh time_elapsed for a running round"""
+        if self.game_active:
+            self.time_elapsed = (self.clock() if now is None else now) - self.start_time
+        return self.time_elapsed
+
+    def calculate_score(self):
+        return round_score(self.time_elapsed, self.hint_budget - self.hints_remaining, self.attempts)
+
+    def get_hint(self):
+        """Use a hint; returns the hint text or None if none are left"""
+        if not self.game_active or self.hints_remaining <= 0:
+            return None
+        self.hints_remaining -= 1
+        self.round.hint_at = self.attempts
+        self.hint_text = self.get_dynamic_hint()
+        if self.event_sink is not None:
+            self.event_sink(EVENT_HINT, self, self.clock(), 0)
+        return self.hint_text
+
+    def get_dynamic_hint(self):
+        low, high = self.number_range
+        names = self.hint_names or hint_family(self.difficulty)
+        return hint_set(self.secret_number, low, high, names).choose(self.hint_policy, self.round.seed)
+
+    def apply_preset(self, preset):
+        """Use a calibrated preset (see calibrator.py) for range, attempts and hints.
+
+        Call it after set_difficulty(), which resets the attempts.
+        """
+        self.set_range(*preset['range'])
+        self.max_attempts = preset['max_attempts']
+        self.hint_budget = preset['hints']
+
+    def set_hints(self, names=None, policy='random'):
+        """Use these registered hint generators and choice policy; set_hints() resets"""
+        if policy not in HINT_POLICIES:
+            raise ValueError(f"Unknown hint policy: {policy}")
+        self.hint_names = tuple(names) if names else None
+        self.hint_policy = policy
+
+    def judge(self, guess):
+        """Compare a guess with the secret: TOO_LOW, TOO_HIGH or CORRECT"""
+        return judge_guess(guess, self.secret_number)
+
+    def make_guess(self, guess, now=None):
+        """Apply one guess and return a result dict.
+
+        Keys: result (TOO_LOW/TOO_HIGH/CORRECT/OUT_OF_RANGE/INACTIVE),
+        game_over, won, score, new_high_score and achievements (ids
+        unlocked by this guess).
+        """
+        outcome = {
+            'result': INACTIVE,
+            'game_over': False,
+            'won': False,
+            'score': 0,
+            'new_high_score': False,
+            'achievements': []
+        }
+        if not self.game_active:
+            return outcome
+
+        low, high = self.number_range
+        if guess < low or guess > high:
+            outcome['result'] = OUT_OF_RANGE
+            return outcome
+
+        state = self.round
+        state.record(guess)
+
+        now = self.clock() if now is None else now
+        guess_time = now - state.start_time
+        state.time_elapsed = guess_time
+        mode_stats = self.mode_stats()
+        mode_stats.add('guess_time', now - state.last_guess_at)
+        state.last_guess_at = now
+
+        result = self.judge(guess)
+        if result == CORRECT:
+            state.active = False
+            self.score = self.calculate_score()
+            self.update_player_stats()
+            self.update_stats(True, guess_time)
+
+            if self.current_mode == 'survival':
+                self.survival_score += self.score
+
+            if self.score > self.high_scores.get(self.difficulty, 0):
+                self.high_scores[self.difficulty] = self.score
+                outcome['new_high_score'] = True
+
+            outcome['result'] = CORRECT
+            outcome['won'] = True
+            outcome['game_over'] = True
+            outcome['score'] = self.score
+            outcome['achievements'] = self.update_achievements()
+            mode_stats.add('attempts_to_win', state.attempts)
+            mode_stats.add('score', self.score)
+        else:
+            self.update_stats(False, guess_time)
+            outcome['result'] = result
+            state.narrow(guess, result == TOO_LOW)
+
+        if state.attempts >= state.max_attempts and state.active:
+            state.active = False
+            outcome['game_over'] = True
+
+        # Win rules ran in update_achievements; usually no rules watch these
+        unlocked = self.achievement_engine.fire(GUESS, self)
+        if outcome['game_over'] and not outcome['won']:
+            unlocked += self.achievement_engine.fire(LOSS, self)
+        if unlocked:
+            outcome['achievements'] = outcome['achievements'] + [
+                self.unlock_achievement(achievement_id) for achievement_id in unlocked]
+
+        if self.event_sink is not None:
+            self.event_sink(EVENT_GUESS, self, now, guess)
+
+        if outcome['game_over']:
+            outcome['seed'] = state.seed
+            # Persist distributions once per round rather than per guess
+            self.profile_changes.append(
+                ('set', ['distributions', self.current_mode], mode_stats.to_dict()))
+            if self.event_sink is not None:
+                self.event_sink(EVENT_END, self, now, outcome['score'])
+
+        return outcome
+
+    def expire(self, now=None):
+        """End a running round whose time limit has passed; returns whether it was running"""
+        if not self.game_active:
+            return False
+        self.game_active = False
+        for achievement_id in self.achievement_engine.fire(LOSS, self):
+            self.unlock_achievement(achievement_id)
+        if self.event_sink is not None:
+            now = self.clock() if now is None else now
+            self.event_sink(EVENT_TIMEOUT, self, now, 0)
+            self.event_sink(EVENT_END, self, now, 0)
+        return True
+
+    def round_record(self):
+        """What replay_round needs to play the current round again"""
+        state = self.round
+        return {
+            'seed': state.seed,
+            'mode': self.current_mode,
+            'difficulty': self.difficulty,
+            'guesses': state.history,
+            'hint_at': state.hint_at,
+            'hint_names': self.hint_names,
+            'hint_policy': self.hint_policy,
+            'range': self.custom_range,
+            'max_attempts': state.max_attempts,
+            'hints': self.hint_budget,
+            'duration': state.time_elapsed,
+            'secret': state.secret,
+            'won': state.attempts > 0 and state.last_guess == state.secret,
+            'score': self.score if state.last_guess == state.secret else 0
+        }
+
+    def _solver(self):
+        from solver import get_solver
+        low, high = self.number_range
+        return get_solver(low, high, self.max_attempts, self.difficulty,
+                          self.hint_names, self.hint_policy)
+
+    def optimal_move(self):
+        """Best move for the current round: ('hint', None) or ('guess', n)"""
+        return self._solver().optimal_move(self.low_bound, self.high_bound,
+                                           self.max_attempts - self.attempts,
+                                           self.hints_remaining > 0, self.hint_text)
+
+    def win_probability(self):
+        """Chance of winning the current round under optimal play"""
+        if not self.game_active:
+            return 1.0 if self.last_guess == self.secret_number else 0.0
+        return self._solver().win_probability(self.low_bound, self.high_bound,
+                                              self.max_attempts - self.attempts,
+                                              self.hints_remaining > 0, self.hint_text)
+
+    def drain_profile_changes(self):
+        """Return and clear the profile mutations since the last call"""
+        changes = self.profile_changes
+        self.profile_changes = []
+        return changes
+
+    def update_player_stats(self):
+        profile = self.player_profile
+        profile['games_played'] += 1
+        profile['total_score'] += self.score
+        if self.time_elapsed < profile['best_time']:
+            profile['best_time'] = self.time_elapsed
+        self.profile_changes.extend([
+            ('set', ['games_played'], profile['games_played']),
+            ('set', ['total_score'], profile['total_score']),
+            ('set', ['best_time'], profile['best_time'])
+        ])
+
+    def update_stats(self, guess_correct=False, guess_time=0):
+        stats = self.player_profile['stats']
+        stats['total_guesses'] += 1
+        if guess_correct:
+            stats['correct_guesses'] += 1
+        if stats['total_guesses'] > 0:  # Prevent division by zero
+            stats['accuracy'] = (stats['correct_guesses'] / stats['total_guesses']) * 100
+        # Update average guess time
+        if stats['total_guesses'] == 1:
+            stats['avg_guess_time'] = guess_time
+        else:
+            stats['avg_guess_time'] = ((stats['avg_guess_time'] * (stats['total_guesses'] - 1)) + guess_time) / stats['total_guesses']
+        for key in ('total_guesses', 'correct_guesses', 'accuracy', 'avg_guess_time'):
+            self.profile_changes.append(('set', ['stats', key], stats[key]))
+
+    def update_achievements(self):
+        """Count the win and run the win rules; returns the newly unlocked ids"""
+        self.winning_streak += 1
+        self.games_played += 1
+        return [self.unlock_achievement(achievement_id)
+                for achievement_id in self.achievement_engine.fire(WIN, self)]
+
+    def unlock_achievement(self, achievement_id):
+        self.achievement_engine.unlock(achievement_id)
+        if achievement_id not in self.player_profile['achievements']:
+            self.player_profile['achievements'].append(achievement_id)
+            self.profile_changes.append(('add', ['achievements'], achievement_id))
+        return achievement_id
+
+
+class RoundRules:
+    """The rules of a round, without a session.
+
+    Starts, judges, hints and scores RoundStates the same way GameEngine
+    does, but keeps no settings, profile, high scores or achievements:
+    what a round needs is passed in or kept on its RoundState. One
+    instance can therefore play any number of rounds, e.g. every session
+    of game_server.py.
+    """
+    def __init__(self, clock=time.time):
+        self.clock = clock
+
+    def start_round(self, seed, low, high, max_attempts, hints=1, now=None):
+        """A running RoundState for this seed"""
+        now = self.clock() if now is None else now
+        return RoundState(secret_for(seed, low, high), max_attempts, low, high, now,
+                          hints=hints, seed=seed)
+
+    def tick(self, state, now=None):
+        """Refresh time_elapsed for a running round"""
+        if state.active:
+            state.time_elapsed = (self.clock() if now is None else now) - state.start_time
+        return state.time_elapsed
+
+    def make_guess(self, state, guess, low, high, hint_budget=1, now=None):
+        """Apply one guess to state; returns result, game_over, won, score (and seed at the end)"""
+        outcome = {'result': INACTIVE, 'game_over': False, 'won': False, 'score': 0}
+        if not state.active:
+            return outcome
+        if guess < low or guess > high:
+            outcome['result'] = OUT_OF_RANGE
+            return outcome
+
+        state.record(guess)
+        now = self.clock() if now is None else now
+        state.time_elapsed = now - state.start_time
+        state.last_guess_at = now
+
+        result = judge_guess(guess, state.secret)
+        outcome['result'] = result
+        if result == CORRECT:
+            state.active = False
+            outcome['won'] = True
+            outcome['score'] = round_score(state.time_elapsed, hint_budget - state.hints_remaining,
+                                           state.attempts)
+        else:
+            state.narrow(guess, result == TOO_LOW)
+            if state.attempts >= state.max_attempts:
+                state.active = False
+        outcome['game_over'] = not state.active
+        if outcome['game_over']:
+            outcome['seed'] = state.seed
+        return outcome
+
+    def get_hint(self, state, low, high, names, policy='random'):
+        """Use a hint; returns the hint text or None if none are left"""
+        if not state.active or state.hints_remaining <= 0:
+            return None
+        state.hints_remaining -= 1
+        state.hint_at = state.attempts
+        state.hint_text = hint_set(state.secret, low, high, tuple(names)).choose(policy, state.seed)
+        return state.hint_text
+
+    def expire(self, state):
+        """End a running round whose time limit has passed; returns whether it was running"""
+        if not state.active:
+            return False
+        state.active = False
+        return True
+
+
+def replay_round(record):
+    """Play a round_record() again on a fresh engine; returns (engine, outcome).
+
+    The secret, hint and every guess result come out the same as in the
+    original round, and so does the score, since the final guess is made
+    at the recorded duration.
+    """
+    engine = GameEngine(clock=lambda: 0)
+    engine.set_mode(record['mode'])
+    engine.set_difficulty(record['difficulty'])
+    engine.set_hints(record.get('hint_names'), record.get('hint_policy', 'random'))
+    if record.get('range'):
+        engine.set_range(*record['range'])
+    engine.max_attempts = record.get('max_attempts', engine.max_attempts)
+    engine.hint_budget = record.get('hints', engine.hint_budget)
+    engine.start_round(now=0, seed=record['seed'])
+    guesses = record['guesses']
+    outcome = None
+    for attempt, guess in enumerate(guesses):
+        if record.get('hint_at') == attempt:
+            engine.get_hint()
+        last = attempt == len(guesses) - 1
+        outcome = engine.make_guess(guess, now=record['duration'] if last else 0)
+    return engine, outcome
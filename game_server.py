@@ -0,0 +1,313 @@
+"""
+Asyncio game server for the Number Guessing Game.
+
+One process hosts many concurrent players. Every TCP connection is a
+session holding its settings and a compact RoundState (secret number,
+attempts, hints and timing); one shared RoundRules judges and scores every
+session's round. The Time Attack limit is enforced by a server-side timer.
+
+The protocol is newline-delimited JSON. Each request is an object with an
+"op" and its parameters; each reply is an object with "ok" plus the result
+or an "error". An "id" in the request is echoed back. Operations:
+
+    {"op": "new_game", "mode": "classic", "difficulty": "medium", "seed": 42}
+    {"op": "guess", "value": 7}
+    {"op": "hint"}
+    {"op": "state"}
+    {"op": "quit"}
+
+new_game also takes an optional "range": [low, high] of any size (Python
+ints, e.g. [1, 18446744073709551616]), "max_attempts" and "hints" (hints
+allowed in the round, 1 by default; a calibrated preset may give 0).
+
+The reply that ends a round carries the round's "seed"; passing it to
+new_game plays the same round again. When a round's time limit runs out
+the server pushes {"event": "timeout", "secret": n, "seed": s} without a
+request.
+
+Run it with:
+    python game_server.py [host] [port] [seed]
+"""
+import asyncio
+import json
+import sys
+import time
+
+from game_engine import RoundRules, DIFFICULTY_ATTEMPTS, GAME_MODES, OUT_OF_RANGE
+from hints import hint_family
+from rng_service import RNGService, derive_seed
+from round_state import RoundState
+
+HOST = '127.0.0.1'
+PORT = 8765
+
+# Sessions that send nothing for this long are closed
+IDLE_TIMEOUT = 300
+
+# Longest accepted request line, in bytes
+MAX_LINE = 4096
+
+# Largest attempt budget a client may ask for (sizes the guess buffer)
+MAX_ATTEMPTS = 4096
+
+# Largest hint budget a client may ask for
+MAX_HINTS = 16
+
+
+class ProtocolError(Exception):
+    """A request the server cannot act on; reported back to the client"""
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class Session:
+    """One connected player: settings, score and the round in progress"""
+    __slots__ = ('id', 'write', 'rng', 'mode', 'difficulty', 'number_range', 'hint_budget',
+                 'round', 'score', 'survival_score', 'timeout_handle')
+
+    # Every session's round is played by these stateless rules
+    rules = RoundRules()
+
+    def __init__(self, session_id, write, seed=None):
+        self.id = session_id
+        self.write = write
+        self.rng = RNGService(seed)
+        self.mode = 'classic'
+        self.difficulty = 'medium'
+        self.number_range = GAME_MODES['classic']['range']
+        # Hints allowed per round
+        self.hint_budget = 1
+        low, high = self.number_range
+        self.round = RoundState(0, DIFFICULTY_ATTEMPTS['medium'], low, high, active=False)
+        self.score = 0
+        self.survival_score = 0
+        self.timeout_handle = None
+
+    def state(self):
+        state = self.round
+        low, high = self.number_range
+        return {
+            'session': self.id,
+            'mode': self.mode,
+            'difficulty': self.difficulty,
+            'range': [low, high],
+            'attempts': state.attempts,
+            'max_attempts': state.max_attempts,
+            'hints': self.hint_budget,
+            'hints_remaining': state.hints_remaining,
+            'time_limit': GAME_MODES[self.mode]['time_limit'],
+            'elapsed': self.rules.tick(state),
+            'active': state.active,
+            'score': self.score,
+            'survival_score': self.survival_score
+        }
+
+    def cancel_timeout(self):
+        if self.timeout_handle is not None:
+            self.timeout_handle.cancel()
+            self.timeout_handle = None
+
+    def new_game(self, loop, mode='classic', difficulty='medium', seed=None,
+                 number_range=None, max_attempts=None, hints=None):
+        if mode not in GAME_MODES:
+            raise ProtocolError(f"Unknown game mode: {mode}")
+        if difficulty not in DIFFICULTY_ATTEMPTS:
+            raise ProtocolError(f"Unknown difficulty: {difficulty}")
+        if seed is not None and (not _is_int(seed) or seed < 0):
+            raise ProtocolError("Seed must be a non-negative integer")
+        if number_range is not None:
+            if (not isinstance(number_range, list) or len(number_range) != 2
+                    or not all(_is_int(value) for value in number_range)
+                    or number_range[0] > number_range[1]):
+                raise ProtocolError("Range must be [low, high] with low <= high")
+        if max_attempts is not None and (not _is_int(max_attempts)
+                                         or not 1 <= max_attempts <= MAX_ATTEMPTS):
+            raise ProtocolError(f"max_attempts must be between 1 and {MAX_ATTEMPTS}")
+        if hints is not None and (not _is_int(hints) or not 0 <= hints <= MAX_HINTS):
+            raise ProtocolError(f"hints must be between 0 and {MAX_HINTS}")
+        self.mode = mode
+        self.difficulty = difficulty
+        self.number_range = tuple(number_range) if number_range is not None else GAME_MODES[mode]['range']
+        if max_attempts is None:
+            max_attempts = DIFFICULTY_ATTEMPTS[difficulty]
+        self.hint_budget = 1 if hints is None else hints
+        if seed is None:
+            seed = self.rng.next_round()
+        low, high = self.number_range
+        self.round = self.rules.start_round(seed, low, high, max_attempts, self.hint_budget)
+        self.cancel_timeout()
+        time_limit = GAME_MODES[mode]['time_limit']
+        if time_limit:
+            self.timeout_handle = loop.call_later(time_limit, self.expire)
+        return self.state()
+
+    def expire(self):
+        """Time limit reached: end the round and tell the client"""
+        self.timeout_handle = None
+        if self.rules.expire(self.round):
+            self.write({'event': 'timeout', 'secret': self.round.secret, 'seed': self.round.seed})
+
+    def guess(self, value):
+        if not _is_int(value):
+            raise ProtocolError("Guess must be an integer")
+        state = self.round
+        if not state.active:
+            raise ProtocolError("No round in progress")
+        low, high = self.number_range
+        outcome = self.rules.make_guess(state, value, low, high, self.hint_budget)
+        reply = dict(outcome, attempts=state.attempts, max_attempts=state.max_attempts,
+                     hints_remaining=state.hints_remaining)
+        if outcome['result'] == OUT_OF_RANGE:
+            reply['range'] = [low, high]
+        if outcome['won']:
+            self.score = outcome['score']
+            if self.mode == 'survival':
+                self.survival_score += self.score
+        if outcome['game_over']:
+            self.cancel_timeout()
+            reply['secret'] = state.secret
+            reply['survival_score'] = self.survival_score
+        return reply
+
+    def hint(self):
+        low, high = self.number_range
+        hint = self.rules.get_hint(self.round, low, high, hint_family(self.difficulty))
+        if hint is None:
+            raise ProtocolError("No hints remaining")
+        return {'hint': hint, 'hints_remaining': self.round.hints_remaining}
+
+
+class GameServer:
+    """Accepts connections and runs one Session per connection"""
+    def __init__(self, host=HOST, port=PORT, max_sessions=None, idle_timeout=IDLE_TIMEOUT,
+                 seed=None):
+        self.host = host
+        self.port = port
+        # With a seed every session's secrets are reproducible (for load tests)
+        self.seed = seed
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.sessions = {}
+        self.server = None
+        self._next_id = 1
+        self.counters = {'sessions_total': 0, 'requests': 0, 'errors': 0, 'rejected': 0}
+        self.started_at = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port, limit=MAX_LINE)
+        # Port 0 picks a free port; report the real one
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.started_at = time.time()
+        return self
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for session in list(self.sessions.values()):
+            session.cancel_timeout()
+
+    def stats(self):
+        return dict(self.counters, sessions_active=len(self.sessions))
+
+    async def handle(self, reader, writer):
+        if self.max_sessions is not None and len(self.sessions) >= self.max_sessions:
+            self.counters['rejected'] += 1
+            writer.write(b'{"ok": false, "error": "Server full"}\n')
+            await writer.drain()
+            writer.close()
+            return
+
+        def write(message):
+            writer.write(json.dumps(message).encode() + b'\n')
+
+        seed = derive_seed(self.seed, self._next_id) if self.seed is not None else None
+        session = Session(self._next_id, write, seed)
+        self._next_id += 1
+        self.sessions[session.id] = session
+        self.counters['sessions_total'] += 1
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except (asyncio.TimeoutError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if not line:
+                    break
+                reply, done = self.dispatch(session, loop, line)
+                write(reply)
+                await writer.drain()
+                if done:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            session.cancel_timeout()
+            del self.sessions[session.id]
+            writer.close()
+
+    def dispatch(self, session, loop, line):
+        """Run one request; returns (reply, close_connection)"""
+        self.counters['requests'] += 1
+        request = {}
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise ProtocolError("Invalid JSON")
+            if not isinstance(request, dict):
+                raise ProtocolError("Request must be an object")
+            op = request.get('op')
+            done = False
+            if op == 'new_game':
+                result = session.new_game(loop, request.get('mode', 'classic'),
+                                          request.get('difficulty', 'medium'),
+                                          request.get('seed'), request.get('range'),
+                                          request.get('max_attempts'), request.get('hints'))
+            elif op == 'guess':
+                result = session.guess(request.get('value'))
+            elif op == 'hint':
+                result = session.hint()
+            elif op == 'state':
+                result = session.state()
+            elif op == 'quit':
+                result, done = {}, True
+            else:
+                raise ProtocolError(f"Unknown op: {op}")
+            reply = dict(result, ok=True)
+        except ProtocolError as e:
+            self.counters['errors'] += 1
+            reply, done = {'ok': False, 'error': str(e)}, False
+        if 'id' in request:
+            reply['id'] = request['id']
+        return reply, done
+
+
+def main():
+    host = sys.argv[1] if len(sys.argv) > 1 else HOST
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else PORT
+    seed = sys.argv[3] if len(sys.argv) > 3 else None
+    server = GameServer(host, port, seed=seed)
+
+    async def run():
+        await server.start()
+        print(f"Game server listening on {server.host}:{server.port}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print(f"Server stopped: {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,466 @@
+"""
+Hint generators for the Number Guessing Game.
+
+A hint generator is a plugin with a name that turns a secret number and the
+round's range into a hint text, and counts how many numbers in the range
+would get the same text. The count measures how informative the hint is:
+a hint shared by m of the n numbers in the range is worth log2(n / m) bits.
+
+Each difficulty has a family of generators (DIFFICULTY_HINTS). The hints a
+secret can get from a family are computed once and cached as a HintSet;
+its information gains are worked out the first time they are asked for,
+after which the most and least informative hints are O(1) lookups.
+
+New generators subclass HintGenerator and are added with register_hint().
+"""
+import math
+from array import array
+from functools import lru_cache
+
+from rng_service import hint_index
+
+# Decimal digits taken off per division in digit_sum
+DIGIT_CHUNK = 10 ** 18
+
+# Hints print bounds of up to this many digits; longer ones are named by
+# their place in the range
+MAX_PRINTED_DIGITS = 300
+PRINT_LIMIT = 10 ** MAX_PRINTED_DIGITS
+
+# Hint sets kept, one per (secret, range, family)
+HINT_CACHE_SIZE = 4096
+
+# Digit-sum counts are exact up to this many digits, estimated beyond
+MAX_EXACT_DIGITS = 60
+
+# Primes are counted with a sieve up to here, estimated beyond
+SIEVE_LIMIT = 2_000_000
+
+
+def decimal_digits(number):
+    """Decimal digits of abs(number), most significant first, without str()"""
+    number = abs(number)
+    digits = []
+    while number >= DIGIT_CHUNK:
+        number, chunk = divmod(number, DIGIT_CHUNK)
+        for _ in range(18):
+            chunk, digit = divmod(chunk, 10)
+            digits.append(digit)
+    while number:
+        number, digit = divmod(number, 10)
+        digits.append(digit)
+    digits.reverse()
+    return digits or [0]
+
+
+def format_number(number):
+    """Decimal text of number, built from decimal_digits() rather than str()"""
+    text = ''.join(map(str, decimal_digits(number)))
+    return '-' + text if number < 0 else text
+
+
+def printable(number):
+    """Whether a hint may print number (at most MAX_PRINTED_DIGITS digits)"""
+    return -PRINT_LIMIT < number < PRINT_LIMIT
+
+
+def digit_sum(number):
+    """Sum of the decimal digits of abs(number), without str().
+
+    str() of a huge int is quadratic and refused past 4300 digits; taking
+    18 digits per division keeps the work proportional to the number of
+    machine words.
+    """
+    number = abs(number)
+    total = 0
+    while number >= DIGIT_CHUNK:
+        number, chunk = divmod(number, DIGIT_CHUNK)
+        while chunk:
+            chunk, digit = divmod(chunk, 10)
+            total += digit
+    while number:
+        number, digit = divmod(number, 10)
+        total += digit
+    return total
+
+
+@lru_cache(maxsize=None)
+def _digit_sum_ways(length):
+    """ways[t] = how many length-digit strings (leading zeros allowed) sum to t"""
+    if length == 0:
+        return (1,)
+    shorter = _digit_sum_ways(length - 1)
+    ways = [0] * (9 * length + 1)
+    for total, count in enumerate(shorter):
+        for digit in range(10):
+            ways[total + digit] += count
+    return tuple(ways)
+
+
+def _count_digit_sum_upto(limit, target):
+    """Numbers in [0, limit] whose digit sum is target"""
+    if limit < 0 or target < 0:
+        return 0
+    digits = decimal_digits(limit)
+    if len(digits) > MAX_EXACT_DIGITS:
+        # Digit sums of d random digits: mean 4.5 d, variance 8.25 d
+        mean, variance = 4.5 * len(digits), 8.25 * len(digits)
+        density = math.exp(-(target - mean) ** 2 / (2 * variance)) / math.sqrt(2 * math.pi * variance)
+        return max(1, int((limit + 1) * density))
+    count = 0
+    prefix = 0
+    for position, limit_digit in enumerate(digits):
+        ways = _digit_sum_ways(len(digits) - position - 1)
+        for digit in range(limit_digit):
+            rest = target - prefix - digit
+            if 0 <= rest < len(ways):
+                count += ways[rest]
+        prefix += limit_digit
+    return count + (1 if prefix == target else 0)
+
+
+def count_in_range(low, high, count_upto):
+    """Apply a [0, n] counter to [low, high], mirroring negative numbers"""
+    total = 0
+    if high >= 0:
+        total += count_upto(high) - (count_upto(low - 1) if low > 0 else 0)
+    if low < 0:
+        # abs() maps [low, min(high, -1)] onto [max(1, -high), -low]
+        top, bottom = -low, max(1, -high)
+        total += count_upto(top) - count_upto(bottom - 1)
+    return total
+
+
+_SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def is_prime(number):
+    """Miller-Rabin; exact below 3.3 * 10**24, overwhelmingly likely above"""
+    if number < 2:
+        return False
+    for prime in _SMALL_PRIMES:
+        if number % prime == 0:
+            return number == prime
+    d, s = number - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for base in _SMALL_PRIMES:
+        x = pow(base, d, number)
+        if x == 1 or x == number - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % number
+            if x == number - 1:
+                break
+        else:
+            return False
+    return True
+
+
+@lru_cache(maxsize=4)
+def _prime_prefix(limit):
+    """prefix[n] = primes <= n, for n <= limit"""
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[0:2] = b'\x00\x00'
+    for n in range(2, int(limit ** 0.5) + 1):
+        if sieve[n]:
+            sieve[n * n::n] = bytearray(len(range(n * n, limit + 1, n)))
+    prefix = array('I', bytes(4 * (limit + 1)))
+    running = 0
+    for n in range(limit + 1):
+        running += sieve[n]
+        prefix[n] = running
+    return prefix
+
+
+def count_primes(low, high):
+    """Primes in [low, high]; estimated from their density past SIEVE_LIMIT"""
+    low = max(low, 2)
+    if high < low:
+        return 0
+    if high <= SIEVE_LIMIT:
+        # Sieve sizes are powers of two so nearby ranges share one
+        prefix = _prime_prefix(max(1024, 1 << high.bit_length()))
+        return prefix[high] - prefix[low - 1]
+    middle = (low + high) // 2
+    return max(1, int((high - low + 1) / math.log(max(middle, 3))))
+
+
+def _count_popcount_upto(limit, ones):
+    """Numbers in [0, limit] with exactly `ones` set bits"""
+    if limit < 0 or ones < 0:
+        return 0
+    count = 0
+    seen = 0
+    for bit in range(limit.bit_length() - 1, -1, -1):
+        if limit >> bit & 1:
+            # Put a 0 here and choose the remaining ones freely below
+            if ones - seen >= 0:
+                count += math.comb(bit, ones - seen)
+            seen += 1
+    return count + (1 if seen == ones else 0)
+
+
+class HintGenerator:
+    """Base class for hint plugins.
+
+    text() is the hint a secret gets; count() is how many numbers in
+    [low, high] get that same text.
+    """
+    name = 'base'
+
+    def text(self, secret, low, high):
+        raise NotImplementedError
+
+    def count(self, secret, low, high):
+        raise NotImplementedError
+
+    def classes(self, numbers, low, high):
+        """Label per number of a NumPy int64 array; equal labels mean equal texts.
+
+        The default calls text() for every number; the built-in generators
+        work on the whole array at once.
+        """
+        import numpy as np
+        labels = {}
+        return np.array([labels.setdefault(self.text(number, low, high), len(labels))
+                         for number in numbers.tolist()], dtype=np.int64)
+
+
+class RangeBucketHint(HintGenerator):
+    """Which quarter of the range (at least 5 wide) the number is in"""
+    name = 'range_bucket'
+
+    def _bucket(self, secret, low, high):
+        size = max(5, -(-(high - low + 1) // 4))
+        bucket = (secret - low) // size
+        return bucket, bucket * size + low, size
+
+    def text(self, secret, low, high):
+        bucket, lower, size = self._bucket(secret, low, high)
+        upper = lower + size - 1
+        if printable(lower) and printable(upper):
+            return f"The number is between {format_number(lower)} and {format_number(upper)}"
+        # Too long to print: name the quarter instead
+        return f"The number is in quarter {bucket + 1} of the range"
+
+    def count(self, secret, low, high):
+        bucket, lower, size = self._bucket(secret, low, high)
+        return min(lower + size - 1, high) - lower + 1
+
+    def classes(self, numbers, low, high):
+        return (numbers - low) // max(5, -(-(high - low + 1) // 4))
+
+
+class ParityHint(HintGenerator):
+    name = 'parity'
+
+    def text(self, secret, low, high):
+        return f"The number is {'even' if secret % 2 == 0 else 'odd'}"
+
+    def count(self, secret, low, high):
+        evens = high // 2 - (low - 1) // 2
+        return evens if secret % 2 == 0 else (high - low + 1) - evens
+
+    def classes(self, numbers, low, high):
+        return numbers % 2
+
+
+class DivisibilityHint(HintGenerator):
+    def __init__(self, divisor):
+        self.divisor = divisor
+        self.name = f'divisible_by_{divisor}'
+
+    def text(self, secret, low, high):
+        divisible = secret % self.divisor == 0
+        return f"The number is {'divisible' if divisible else 'not divisible'} by {self.divisor}"
+
+    def count(self, secret, low, high):
+        multiples = high // self.divisor - (low - 1) // self.divisor
+        return multiples if secret % self.divisor == 0 else (high - low + 1) - multiples
+
+    def classes(self, numbers, low, high):
+        return numbers % self.divisor == 0
+
+
+class MidpointHint(HintGenerator):
+    """Whether the number is above the middle of the range"""
+    name = 'midpoint'
+
+    def text(self, secret, low, high):
+        middle = (low + high) // 2
+        above = secret > middle
+        if printable(middle):
+            return (f"The number is {'greater' if above else 'less than or equal'} "
+                    f"to {format_number(middle)}")
+        return f"The number is in the {'upper' if above else 'lower'} half of the range"
+
+    def count(self, secret, low, high):
+        middle = (low + high) // 2
+        return high - middle if secret > middle else middle - low + 1
+
+    def classes(self, numbers, low, high):
+        return numbers > (low + high) // 2
+
+
+class DigitSumHint(HintGenerator):
+    name = 'digit_sum'
+
+    def text(self, secret, low, high):
+        return f"The sum of its digits is {digit_sum(secret)}"
+
+    def count(self, secret, low, high):
+        target = digit_sum(secret)
+        return max(1, count_in_range(low, high,
+                                     lambda limit: _count_digit_sum_upto(limit, target)))
+
+    def classes(self, numbers, low, high):
+        numbers = abs(numbers)
+        total = numbers * 0
+        while numbers.any():
+            total += numbers % 10
+            numbers = numbers // 10
+        return total
+
+
+class PrimalityHint(HintGenerator):
+    name = 'primality'
+
+    def text(self, secret, low, high):
+        return f"The number is {'prime' if is_prime(secret) else 'not prime'}"
+
+    def count(self, secret, low, high):
+        primes = count_primes(low, high)
+        return primes if is_prime(secret) else (high - low + 1) - primes
+
+    def classes(self, numbers, low, high):
+        import numpy as np
+        top = max(high, 2)
+        if top > SIEVE_LIMIT:
+            return super().classes(numbers, low, high)
+        prefix = np.frombuffer(_prime_prefix(max(1024, 1 << top.bit_length())), dtype=np.uint32)
+        # Numbers below 2 look at prefix[1] - prefix[0] = 0
+        numbers = np.maximum(numbers, 1)
+        return prefix[numbers] - prefix[numbers - 1]
+
+
+class BitCountHint(HintGenerator):
+    """How many ones the number has in binary"""
+    name = 'bit_count'
+
+    def text(self, secret, low, high):
+        ones = abs(secret).bit_count()
+        return f"Its binary form has {ones} {'one' if ones == 1 else 'ones'}"
+
+    def count(self, secret, low, high):
+        ones = abs(secret).bit_count()
+        return max(1, count_in_range(low, high, lambda limit: _count_popcount_upto(limit, ones)))
+
+    def classes(self, numbers, low, high):
+        numbers = abs(numbers)
+        ones = numbers * 0
+        while numbers.any():
+            ones += numbers & 1
+            numbers = numbers >> 1
+        return ones
+
+
+HINTS = {}
+
+
+def register_hint(generator):
+    """Make a generator available to hint families by its name; returns it"""
+    HINTS[generator.name] = generator
+    return generator
+
+
+for _generator in (RangeBucketHint(), ParityHint(), DivisibilityHint(3), MidpointHint(),
+                   DigitSumHint(), PrimalityHint(), BitCountHint()):
+    register_hint(_generator)
+
+# Generators used for each difficulty, in the order hints are drawn from
+DIFFICULTY_HINTS = {
+    'easy': ('range_bucket',),
+    'medium': ('parity',),
+    'hard': ('divisible_by_3', 'midpoint', 'digit_sum')
+}
+
+# How the engine chooses among a family's hints
+HINT_POLICIES = ('random', 'most_informative', 'least_informative')
+
+
+def hint_family(difficulty):
+    return DIFFICULTY_HINTS.get(difficulty, DIFFICULTY_HINTS['hard'])
+
+
+class HintSet:
+    """The hints one secret can get from a family, with their information gain"""
+    __slots__ = ('secret', 'low', 'high', 'names', 'texts', '_gains', '_ranked')
+
+    def __init__(self, secret, low, high, names):
+        self.secret = secret
+        self.low = low
+        self.high = high
+        self.names = names
+        self.texts = tuple(HINTS[name].text(secret, low, high) for name in names)
+        self._gains = None
+        self._ranked = None
+
+    @property
+    def gains(self):
+        """Bits of information each hint gives, in family order"""
+        if self._gains is None:
+            span_bits = math.log2(self.high - self.low + 1)
+            self._gains = tuple(
+                span_bits - math.log2(HINTS[name].count(self.secret, self.low, self.high))
+                for name in self.names)
+        return self._gains
+
+    def _ranking(self):
+        """Hint positions from least to most informative"""
+        if self._ranked is None:
+            gains = self.gains
+            self._ranked = sorted(range(len(gains)), key=gains.__getitem__)
+        return self._ranked
+
+    @property
+    def most_informative(self):
+        return self.texts[self._ranking()[-1]]
+
+    @property
+    def least_informative(self):
+        return self.texts[self._ranking()[0]]
+
+    def choose(self, policy, seed):
+        """Pick a hint by policy; 'random' draws from the round seed"""
+        if policy == 'most_informative':
+            return self.most_informative
+        if policy == 'least_informative':
+            return self.least_informative
+        return self.texts[hint_index(seed, len(self.texts))]
+
+
+@lru_cache(maxsize=HINT_CACHE_SIZE)
+def hint_set(secret, low, high, names):
+    """Cached HintSet for a secret, range and family (a tuple of names)"""
+    return HintSet(secret, low, high, names)
+
+
+def possible_hints(secret_number, difficulty, low=1, high=20, names=None, policy='random'):
+    """Every hint text get_dynamic_hint may give for this secret.
+
+    names and policy are the engine's set_hints() choice: the family
+    replacing the difficulty's, and how one hint is picked from it. Only
+    'random' can give any of the family's hints; the other policies always
+    give the same one.
+
+    Buckets and the midpoint scale with the range; on 1-20 they are the
+    classic 5-wide buckets and "to 10". Bounds are printed without str()
+    up to MAX_PRINTED_DIGITS digits; longer ones are named by their place
+    in the range.
+    """
+    hints = hint_set(secret_number, low, high, tuple(names) if names else hint_family(difficulty))
+    if policy == 'random':
+        return list(hints.texts)
+    return [hints.choose(policy, 0)]
@@ -0,0 +1,391 @@
+"""
+Columnar, memory-mapped game history archive.
+
+Every game is one row across fixed-width columns (timestamp, difficulty,
+mode, attempts_used, won, number, score, duration). Each column is its own
+append-only file in the archive directory, so a column is one contiguous
+array on disk: readers memory-map it and get a NumPy view of millions of
+games without parsing a record. Difficulty and mode are stored as one-byte
+codes; the names behind the codes are kept in codes.json.
+
+A crash in the middle of an append can leave some columns one row longer
+than others; the extra bytes are cut off the next time the archive opens.
+
+Usage:
+    python history_archive.py [games]      # benchmark on synthetic games
+    python history_archive.py import game_history.json [archive_dir]
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from datetime import datetime
+
+from game_engine import GAME_MODES, DIFFICULTY_ATTEMPTS
+
+# NumPy is imported on first use so the game starts without it
+np = None
+
+ARCHIVE_DIR = os.path.join('data', 'history')
+
+# (name, struct/array typecode); all little-endian on disk
+COLUMNS = (
+    ('timestamp', 'd'),
+    ('difficulty', 'B'),
+    ('mode', 'B'),
+    ('attempts_used', 'H'),
+    ('won', 'B'),
+    ('number', 'q'),
+    ('score', 'i'),
+    ('duration', 'f')
+)
+COLUMN_TYPES = dict(COLUMNS)
+CODED_COLUMNS = ('difficulty', 'mode')
+
+# Sentinel for games without a recorded secret number
+NO_NUMBER = -1
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _numpy():
+    """The numpy module, or None if it is not installed"""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        np = numpy
+    return np
+
+
+def _require_numpy():
+    if _numpy() is None:
+        raise ImportError("history analytics need numpy: pip install numpy")
+
+
+class HistoryArchive:
+    """Append-only columnar game history read through mmap"""
+    def __init__(self, directory=ARCHIVE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.codes = self._load_codes()
+        self._files = {}
+        self._maps = {}
+        self._mapped_count = 0
+        self.count = self._repair()
+
+    # -- codes ----------------------------------------------------------------
+
+    def _load_codes(self):
+        codes = {'difficulty': list(DIFFICULTY_ATTEMPTS), 'mode': list(GAME_MODES)}
+        try:
+            with open(os.path.join(self.directory, 'codes.json'), 'r') as f:
+                saved = json.load(f)
+            for column in CODED_COLUMNS:
+                codes[column] = list(saved.get(column, codes[column]))
+        except (OSError, ValueError):
+            pass
+        return codes
+
+    def _save_codes(self):
+        path = os.path.join(self.directory, 'codes.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.codes, f)
+        os.replace(path + '.tmp', path)
+
+    def code(self, column, name):
+        """One-byte code for a difficulty or mode name, added if new"""
+        names = self.codes[column]
+        name = str(name)
+        if name not in names:
+            if len(names) >= 256:
+                raise ValueError(f"Too many distinct {column} values")
+            names.append(name)
+            self._save_codes()
+        return names.index(name)
+
+    # -- files ----------------------------------------------------------------
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.col")
+
+    def _repair(self):
+        """Row count; cuts off a half-written last row"""
+        sizes = {}
+        for name, typecode in COLUMNS:
+            path = self._path(name)
+            sizes[name] = os.path.getsize(path) if os.path.exists(path) else 0
+        count = min(sizes[name] // struct.calcsize(typecode) for name, typecode in COLUMNS)
+        for name, typecode in COLUMNS:
+            expected = count * struct.calcsize(typecode)
+            if sizes[name] != expected:
+                with open(self._path(name), 'ab') as f:
+                    f.truncate(expected)
+        return count
+
+    def _writer(self, name):
+        f = self._files.get(name)
+        if f is None:
+            f = self._files[name] = open(self._path(name), 'ab')
+        return f
+
+    def _flush(self):
+        for f in self._files.values():
+            f.flush()
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+        # Views handed out keep their own reference to the maps
+        self._maps = {}
+
+    def __len__(self):
+        return self.count
+
+    # -- writing --------------------------------------------------------------
+
+    def append(self, difficulty, attempts_used, won, number=None, mode='classic',
+               score=0, duration=0.0, timestamp=None):
+        """Add one game"""
+        row = {
+            'timestamp': time.time() if timestamp is None else timestamp,
+            'difficulty': self.code('difficulty', difficulty),
+            'mode': self.code('mode', mode),
+            'attempts_used': attempts_used,
+            'won': 1 if won else 0,
+            'number': NO_NUMBER if number is None else number,
+            'score': score,
+            'duration': duration or 0.0
+        }
+        for name, typecode in COLUMNS:
+            self._writer(name).write(struct.pack('<' + typecode, row[name]))
+        self._flush()
+        self.count += 1
+
+    def append_many(self, columns):
+        """Add many games at once from {column: sequence}.
+
+        difficulty and mode may be names or codes; every sequence must have
+        the same length. NumPy arrays are written without a Python loop.
+        """
+        lengths = {len(columns[name]) for name, _ in COLUMNS}
+        if len(lengths) != 1:
+            raise ValueError("All columns must have the same length")
+        rows = lengths.pop()
+        if not rows:
+            return
+        for name, typecode in COLUMNS:
+            values = columns[name]
+            if name in CODED_COLUMNS and len(values) and isinstance(values[0], str):
+                values = [self.code(name, value) for value in values]
+            if _numpy() is not None:
+                data = np.asarray(values).astype(np.dtype(typecode).newbyteorder('<')).tobytes()
+            else:
+                packed = array(typecode, values)
+                if sys.byteorder == 'big':
+                    packed.byteswap()
+                data = packed.tobytes()
+            self._writer(name).write(data)
+        self._flush()
+        self.count += rows
+
+    # -- reading --------------------------------------------------------------
+
+    def _map(self, name):
+        if self._mapped_count != self.count:
+            # The files grew; older views keep their maps alive
+            self._maps = {}
+            self._mapped_count = self.count
+        mapped = self._maps.get(name)
+        if mapped is None:
+            with open(self._path(name), 'rb') as f:
+                mapped = self._maps[name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return mapped
+
+    def column(self, name):
+        """A column as a read-only view over the file (NumPy array if available)"""
+        typecode = COLUMN_TYPES[name]
+        _numpy()
+        if self.count == 0:
+            return np.zeros(0, dtype=typecode) if np is not None else memoryview(array(typecode))
+        mapped = self._map(name)
+        if np is not None:
+            return np.frombuffer(mapped, dtype=np.dtype(typecode).newbyteorder('<'),
+                                 count=self.count)
+        return memoryview(mapped)[:self.count * struct.calcsize(typecode)].cast(typecode)
+
+    def columns(self, *names):
+        return {name: self.column(name) for name in (names or COLUMN_TYPES)}
+
+    def game(self, index):
+        """One game as a dict shaped like the JSON history"""
+        if index < 0:
+            index += self.count
+        row = {name: self.column(name)[index] for name, _ in COLUMNS}
+        number = int(row['number'])
+        return {
+            'difficulty': self.codes['difficulty'][row['difficulty']],
+            'mode': self.codes['mode'][row['mode']],
+            'attempts_used': int(row['attempts_used']),
+            'won': bool(row['won']),
+            'number': None if number == NO_NUMBER else number,
+            'score': int(row['score']),
+            'duration': float(row['duration']),
+            'date': datetime.fromtimestamp(float(row['timestamp'])).strftime(DATE_FORMAT)
+        }
+
+    def recent_games(self, limit=10):
+        """Most recent games first"""
+        return [self.game(i) for i in range(self.count - 1, max(-1, self.count - 1 - limit), -1)]
+
+    def import_json(self, history_file):
+        """Append the games of a StatsManager JSON history; returns how many"""
+        with open(history_file, 'r') as f:
+            data = json.load(f)
+        games = data['history'] if isinstance(data, dict) else data
+        added = 0
+        for game in games:
+            if not isinstance(game, dict) or not all(key in game for key in ["difficulty", "attempts_used", "won"]):
+                continue
+            try:
+                timestamp = datetime.strptime(game['date'], DATE_FORMAT).timestamp()
+            except (KeyError, TypeError, ValueError):
+                timestamp = None
+            self.append(game['difficulty'], game['attempts_used'], game['won'],
+                        number=game.get('number'), mode=game.get('mode', 'classic'),
+                        score=game.get('score', 0), duration=game.get('duration', 0.0),
+                        timestamp=timestamp)
+            added += 1
+        return added
+
+
+def _streaks(won):
+    """(current, best) winning streak of a boolean array"""
+    if not len(won):
+        return 0, 0
+    # Positions of losses, with sentinels before the first and after the last game
+    losses = np.flatnonzero(~won)
+    bounds = np.concatenate(([-1], losses, [len(won)]))
+    runs = np.diff(bounds) - 1
+    return int(runs[-1]), int(runs.max())
+
+
+def summarize(archive):
+    """Aggregate statistics over every game, computed on column views"""
+    _require_numpy()
+    difficulty = archive.column('difficulty')
+    attempts = archive.column('attempts_used')
+    won = archive.column('won').astype(bool)
+    games = len(won)
+    wins = int(won.sum())
+    current_streak, best_streak = _streaks(won)
+
+    by_difficulty = {}
+    codes = archive.codes['difficulty']
+    played = np.bincount(difficulty, minlength=len(codes))
+    won_per = np.bincount(difficulty, weights=won, minlength=len(codes))
+    won_attempts = np.bincount(difficulty, weights=attempts * won, minlength=len(codes))
+    for code, name in enumerate(codes):
+        if played[code]:
+            by_difficulty[name] = {
+                'games_played': int(played[code]),
+                'games_won': int(won_per[code]),
+                'win_rate': float(won_per[code] / played[code]),
+                'avg_attempts': float(won_attempts[code] / won_per[code]) if won_per[code] else 0.0
+            }
+
+    win_attempts = np.bincount(attempts[won]) if wins else np.zeros(0, dtype=np.int64)
+    return {
+        'games_played': games,
+        'games_won': wins,
+        'win_rate': wins / games if games else 0.0,
+        'avg_attempts': float(attempts[won].mean()) if wins else 0.0,
+        'mean_score': float(archive.column('score').mean()) if games else 0.0,
+        'mean_duration': float(archive.column('duration').mean()) if games else 0.0,
+        'current_streak': current_streak,
+        'best_streak': best_streak,
+        'attempts_distribution': {int(a): int(n) for a, n in enumerate(win_attempts) if n},
+        'difficulties': by_difficulty
+    }
+
+
+def synthetic_games(count, seed=0):
+    """Columns for count random games (for benchmarks)"""
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    difficulty = rng.integers(0, len(DIFFICULTY_ATTEMPTS), count, dtype=np.uint8)
+    attempts = rng.integers(1, 8, count, dtype=np.uint16)
+    won = rng.random(count) < 0.6
+    return {
+        'timestamp': time.time() - rng.random(count) * 365 * 86400,
+        'difficulty': difficulty,
+        'mode': rng.integers(0, len(GAME_MODES), count, dtype=np.uint8),
+        'attempts_used': attempts,
+        'won': won.astype(np.uint8),
+        'number': rng.integers(1, 21, count),
+        'score': np.where(won, 1000 - 50 * attempts, 0),
+        'duration': rng.random(count, dtype=np.float32) * 60
+    }
+
+
+def benchmark(count):
+    import tempfile
+    directory = tempfile.mkdtemp()
+    archive = HistoryArchive(directory)
+    columns = synthetic_games(count)
+
+    start = time.perf_counter()
+    archive.append_many(columns)
+    write_time = time.perf_counter() - start
+    size = sum(os.path.getsize(archive._path(name)) for name, _ in COLUMNS)
+    archive.close()
+
+    start = time.perf_counter()
+    archive = HistoryArchive(directory)
+    stats = summarize(archive)
+    read_time = time.perf_counter() - start
+
+    print(f"=== History archive: {count} games ===")
+    print(f"Append:    {write_time:.3f}s  ({size / count:.0f} bytes per game, {size / 2 ** 20:.1f} MiB)")
+    print(f"Open + summarize: {read_time:.3f}s")
+    print(f"Win rate {stats['win_rate'] * 100:.1f}%, best streak {stats['best_streak']}")
+
+    # The same games as the JSON history would hold them
+    json_count = min(count, 1_000_000)
+    names = archive.codes['difficulty']
+    games = [{"difficulty": names[d], "attempts_used": int(a), "won": bool(w), "number": int(n),
+              "date": "2024-01-01 00:00:00"}
+             for d, a, w, n in zip(columns['difficulty'][:json_count],
+                                   columns['attempts_used'][:json_count],
+                                   columns['won'][:json_count],
+                                   columns['number'][:json_count])]
+    text = json.dumps(games)
+    start = time.perf_counter()
+    parsed = json.loads(text)
+    wins = sum(1 for game in parsed if game['won'])
+    json_time = (time.perf_counter() - start) * count / json_count
+    print(f"JSON list of dicts: {json_time:.3f}s to parse and scan "
+          f"({len(text) / json_count:.0f} bytes per game)"
+          + ("" if json_count == count else f", extrapolated from {json_count} games"))
+    print(f"JSON win rate {wins / json_count * 100:.1f}%")
+    archive.close()
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == 'import':
+        archive = HistoryArchive(sys.argv[3] if len(sys.argv) > 3 else ARCHIVE_DIR)
+        added = archive.import_json(sys.argv[2])
+        print(f"Imported {added} games; the archive now holds {len(archive)}")
+        archive.close()
+        return
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
+
+
+if __name__ == "__main__":
+    main()
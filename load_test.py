@@ -0,0 +1,336 @@
+"""
+Load generator for game_server.py.
+
+Thousands of simulated players connect at once, each playing rounds with a
+tournament strategy (binary search or random guessing) over the JSON-lines
+protocol. The run reports guesses per second, round-trip latency
+percentiles, server memory per session (next to what a full GameEngine
+per session would take) and the round outcomes (win rate, attempts per
+round), and writes them to a JSON report. Given an earlier report the
+numbers are compared and the run fails on a regression, so a change to
+the round logic behind make_guess shows up as a number, not a feeling.
+
+By default a seeded server is started on a free port, so secrets are the
+same from run to run. Set GAME_SERVER=host:port to load an existing server
+instead (memory per session is then not measured).
+
+Usage:
+    python load_test.py [clients] [rounds] [strategy] [baseline.json]
+"""
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from game_engine import GameEngine
+from game_server import Session
+from online_stats import OnlineStats
+from rng_service import derive_seed
+from tournament import BinarySearchStrategy, RandomStrategy
+
+STRATEGIES = {strategy.name: strategy for strategy in (BinarySearchStrategy, RandomStrategy)}
+
+REPORT_FILE = 'data/load_test.json'
+SERVER_SEED = 'load-test'
+DIFFICULTY = 'medium'
+
+# Connections opened at the same time; the listen backlog is small
+CONNECT_CONCURRENCY = 200
+
+# Allowed change against a baseline report before it counts as a regression
+TOLERANCE = {
+    'guesses_per_s': 0.20,      # 20% slower
+    'latency_p99_ms': 0.50,     # 50% higher
+    'rss_per_session': 0.20,    # 20% more memory
+    'session_bytes': 0.10
+}
+# Round outcomes may differ by this many standard errors
+OUTCOME_SIGMAS = 4
+
+
+def raise_fd_limit(needed):
+    """Every client holds a socket; lift the soft file limit if we can"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+def rss_bytes(pid):
+    """Resident set size of a process (Linux only, else None)"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _footprint(make, count):
+    """Bytes allocated per object make(i) returns, measured with tracemalloc"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    live = [make(i) for i in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - before - sys.getsizeof(live)
+    tracemalloc.stop()
+    return used // count
+
+
+def session_footprint(count=1000, difficulty='medium'):
+    """Bytes allocated per server Session with a round in progress"""
+    def make(i):
+        session = Session(i, None, seed=i)
+        # Classic rounds have no time limit, so no event loop is needed
+        session.new_game(None, 'classic', difficulty)
+        return session
+    return _footprint(make, count)
+
+
+def engine_footprint(count=1000, difficulty='medium'):
+    """Bytes allocated per GameEngine with a round in progress, for comparison"""
+    def make(i):
+        engine = GameEngine(seed=i)
+        engine.set_difficulty(difficulty)
+        engine.start_round()
+        return engine
+    return _footprint(make, count)
+
+
+def start_server(seed=SERVER_SEED):
+    """Run game_server.py on a free port; returns (process, host, port)"""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'game_server.py')
+    process = subprocess.Popen([sys.executable, script, '127.0.0.1', '0', seed],
+                               stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if 'listening on' not in line:
+        process.kill()
+        raise RuntimeError(f"Game server did not start: {line!r}")
+    host, port = line.rsplit(' ', 1)[1].strip().rsplit(':', 1)
+    return process, host, int(port)
+
+
+class Player:
+    """One simulated client playing rounds with a strategy"""
+    def __init__(self, index, strategy, difficulty, rounds, seed):
+        self.index = index
+        self.strategy = STRATEGIES[strategy]()
+        self.difficulty = difficulty
+        self.rounds = rounds
+        self.rng = random.Random(derive_seed(seed, strategy, index))
+        self.reader = None
+        self.writer = None
+
+    async def connect(self, host, port):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+
+    async def request(self, op, **params):
+        self.writer.write(json.dumps(dict(params, op=op)).encode() + b'\n')
+        await self.writer.drain()
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                raise ConnectionError("Game server closed the connection")
+            message = json.loads(line)
+            if 'event' not in message:
+                break
+        if not message.get('ok'):
+            raise RuntimeError(message.get('error', 'Unknown error'))
+        return message
+
+    async def play(self, results):
+        perf_counter = time.perf_counter
+        latency = results['latency']
+        for _ in range(self.rounds):
+            state = await self.request('new_game', mode='classic', difficulty=self.difficulty)
+            low, high = state['range']
+            self.strategy.new_round(low, high, self.difficulty, self.rng)
+            attempts_left = state['max_attempts']
+            while True:
+                guess = self.strategy.next_guess(attempts_left)
+                start = perf_counter()
+                reply = await self.request('guess', value=guess)
+                latency.add((perf_counter() - start) * 1000)
+                results['guesses'] += 1
+                attempts_left = reply['max_attempts'] - reply['attempts']
+                self.strategy.feedback(guess, reply['result'])
+                if reply['game_over']:
+                    break
+            results['rounds'] += 1
+            results['wins'] += reply['won']
+            results['attempts'].add(reply['attempts'])
+
+    async def close(self):
+        if self.writer is not None:
+            try:
+                await self.request('quit')
+            except (OSError, RuntimeError):
+                pass
+            self.writer.close()
+
+
+async def run_load(host, port, clients, rounds, strategy, difficulty, seed, server_pid=None):
+    """Connect every client, then let them all play; returns the raw results"""
+    results = {'guesses': 0, 'rounds': 0, 'wins': 0,
+               'latency': OnlineStats(), 'attempts': OnlineStats()}
+    players = [Player(i, strategy, difficulty, rounds, seed) for i in range(clients)]
+    rss_idle = rss_bytes(server_pid) if server_pid else None
+
+    gate = asyncio.Semaphore(CONNECT_CONCURRENCY)
+
+    async def connect(player):
+        async with gate:
+            await player.connect(host, port)
+            # Hold a round open so the session is fully populated
+            await player.request('new_game', mode='classic', difficulty=difficulty)
+
+    await asyncio.gather(*(connect(player) for player in players))
+    rss_loaded = rss_bytes(server_pid) if server_pid else None
+
+    start = time.perf_counter()
+    await asyncio.gather(*(player.play(results) for player in players))
+    results['duration'] = time.perf_counter() - start
+    await asyncio.gather(*(player.close() for player in players))
+
+    if rss_idle is not None and rss_loaded is not None:
+        results['rss_per_session'] = max(0, rss_loaded - rss_idle) // clients
+    return results
+
+
+def build_report(results, clients, rounds, strategy, difficulty):
+    duration = results['duration']
+    latency = results['latency'].summary()
+    attempts = results['attempts']
+    return {
+        'config': {
+            'clients': clients,
+            'rounds_per_client': rounds,
+            'strategy': strategy,
+            'difficulty': difficulty,
+            'python': sys.version.split()[0]
+        },
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'duration_s': duration,
+        'guesses': results['guesses'],
+        'rounds': results['rounds'],
+        'guesses_per_s': results['guesses'] / duration if duration else 0,
+        'rounds_per_s': results['rounds'] / duration if duration else 0,
+        'latency_ms': {key: latency[key] for key in ('mean', 'p50', 'p90', 'p99', 'max')},
+        'latency_p99_ms': latency['p99'],
+        'win_rate': results['wins'] / results['rounds'] if results['rounds'] else 0,
+        'attempts_mean': attempts.mean,
+        'attempts_stdev': attempts.stdev,
+        'rss_per_session': results.get('rss_per_session'),
+        'session_bytes': session_footprint(difficulty=difficulty),
+        'engine_bytes': engine_footprint(difficulty=difficulty)
+    }
+
+
+def compare(report, baseline):
+    """Regressions of report against baseline, as printable lines"""
+    regressions = []
+    if report['config'] != baseline.get('config'):
+        print("Note: baseline was run with a different configuration")
+
+    def check(name, worse, limit):
+        old, new = baseline.get(name), report.get(name)
+        if not old or new is None:
+            return
+        change = (new - old) / old
+        flag = ''
+        if worse(change) > limit:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"  {name:<18}{old:>14.3f}{new:>14.3f}{change * 100:>+9.1f}%{flag}")
+
+    print(f"  {'Metric':<18}{'Baseline':>14}{'Now':>14}{'Change':>10}")
+    check('guesses_per_s', lambda change: -change, TOLERANCE['guesses_per_s'])
+    check('latency_p99_ms', lambda change: change, TOLERANCE['latency_p99_ms'])
+    check('rss_per_session', lambda change: change, TOLERANCE['rss_per_session'])
+    check('session_bytes', lambda change: change, TOLERANCE['session_bytes'])
+
+    # Round outcomes should not move at all beyond sampling noise
+    rounds = min(report['rounds'], baseline.get('rounds', 0))
+    if rounds:
+        p = baseline['win_rate']
+        error = max((p * (1 - p) / rounds) ** 0.5, 1 / rounds)
+        if abs(report['win_rate'] - p) > OUTCOME_SIGMAS * error:
+            regressions.append('win_rate')
+        error = max(baseline['attempts_stdev'] / rounds ** 0.5, 1 / rounds)
+        if abs(report['attempts_mean'] - baseline['attempts_mean']) > OUTCOME_SIGMAS * error:
+            regressions.append('attempts_mean')
+        for name in ('win_rate', 'attempts_mean'):
+            flag = '  REGRESSION' if name in regressions else ''
+            print(f"  {name:<18}{baseline[name]:>14.4f}{report[name]:>14.4f}{flag}")
+    return regressions
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    strategy = sys.argv[3] if len(sys.argv) > 3 else 'binary_search'
+    baseline_file = sys.argv[4] if len(sys.argv) > 4 else None
+    difficulty = DIFFICULTY
+    if strategy not in STRATEGIES:
+        print(f"Unknown strategy {strategy}; choose from {', '.join(STRATEGIES)}")
+        sys.exit(2)
+
+    # One socket per client here and one per session in the server
+    raise_fd_limit(clients + 256)
+
+    process = None
+    address = os.environ.get('GAME_SERVER')
+    if address:
+        host, port = address.rsplit(':', 1)
+        port = int(port)
+    else:
+        process, host, port = start_server()
+    try:
+        results = asyncio.run(run_load(host, port, clients, rounds, strategy, difficulty,
+                                       SERVER_SEED, process.pid if process else None))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    report = build_report(results, clients, rounds, strategy, difficulty)
+    print(f"=== Load test: {clients} clients x {rounds} rounds, {strategy} ===")
+    print(f"Guesses:          {report['guesses']} in {report['duration_s']:.2f}s "
+          f"({report['guesses_per_s']:.0f}/s, {report['rounds_per_s']:.0f} rounds/s)")
+    latency = report['latency_ms']
+    print(f"Latency (ms):     p50 {latency['p50']:.2f}  p90 {latency['p90']:.2f}  "
+          f"p99 {latency['p99']:.2f}  max {latency['max']:.2f}")
+    print(f"Win rate:         {report['win_rate'] * 100:.2f}%  "
+          f"(mean attempts {report['attempts_mean']:.3f})")
+    if report['rss_per_session'] is not None:
+        print(f"Server RSS:       {report['rss_per_session']} bytes per session")
+    print(f"Session objects:  {report['session_bytes']} bytes each (tracemalloc); "
+          f"a GameEngine per session would be {report['engine_bytes']} bytes")
+
+    os.makedirs(os.path.dirname(REPORT_FILE), exist_ok=True)
+    with open(REPORT_FILE, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {REPORT_FILE}")
+
+    if baseline_file:
+        with open(baseline_file, 'r') as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {baseline_file}:")
+        regressions = compare(report, baseline)
+        if regressions:
+            print(f"FAIL: {', '.join(regressions)} regressed")
+            sys.exit(1)
+        print("PASS: no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Streaming statistics for the player profile.
+
+OnlineStats tracks count, mean, variance (Welford), min/max and approximate
+percentiles in bounded memory with O(1) work per value. Percentiles come
+from a log-bucketed sketch with a fixed relative error: every value is
+counted in the bucket [gamma**(i-1), gamma**i), so any percentile is
+reported within `relative_accuracy` of the true value. Sketches with the
+same accuracy merge by adding bucket counts, so per-process or per-mode
+stats can be combined.
+"""
+import math
+
+DEFAULT_ACCURACY = 0.02
+DEFAULT_MAX_BUCKETS = 256
+
+
+class QuantileSketch:
+    """Mergeable relative-error quantile sketch for non-negative values"""
+    def __init__(self, relative_accuracy=DEFAULT_ACCURACY, max_buckets=DEFAULT_MAX_BUCKETS):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value, count=1):
+        self.count += count
+        if value <= 0:
+            self.zero_count += count
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+        """Fold the two lowest buckets together to stay within max_buckets.
+
+        Only the smallest values lose accuracy, which keeps the upper
+        percentiles (p90/p99) exact to the sketch's relative error.
+        """
+        lowest, second = sorted(self.buckets)[:2]
+        self.buckets[second] += self.buckets.pop(lowest)
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("Can only merge sketches with the same accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        while len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q):
+        """Approximate q-quantile (0 <= q <= 1); None when empty"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self):
+        indexes = sorted(self.buckets)
+        return {
+            'accuracy': self.relative_accuracy,
+            'max_buckets': self.max_buckets,
+            'zero': self.zero_count,
+            'indexes': indexes,
+            'counts': [self.buckets[index] for index in indexes]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['accuracy'], data['max_buckets'])
+        sketch.buckets = dict(zip(data['indexes'], data['counts']))
+        sketch.zero_count = data['zero']
+        sketch.count = sketch.zero_count + sum(sketch.buckets.values())
+        return sketch
+
+
+class OnlineStats:
+    """Mean, variance, min/max and percentiles of a stream of values"""
+    def __init__(self, relative_accuracy=DEFAULT_ACCURACY):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def add(self, value):
+        # Welford's update
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.sketch.add(value)
+
+    def add_array(self, values):
+        """Add a NumPy array of values at once, e.g. when replaying a log"""
+        import numpy as np
+        if len(values) == 0:
+            return
+        values = np.asarray(values, dtype=np.float64)
+        batch = OnlineStats(self.sketch.relative_accuracy)
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch._m2 = float(((values - batch.mean) ** 2).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        sketch = batch.sketch
+        positive = values[values > 0]
+        sketch.zero_count = len(values) - len(positive)
+        indexes, counts = np.unique(np.ceil(np.log(positive) / sketch._log_gamma).astype(np.int64),
+                                    return_counts=True)
+        sketch.buckets = dict(zip(indexes.tolist(), counts.tolist()))
+        sketch.count = len(values)
+        while len(sketch.buckets) > sketch.max_buckets:
+            sketch._collapse()
+        self.merge(batch)
+
+    def merge(self, other):
+        """Combine with another OnlineStats (Chan et al. parallel update)"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.min, self.max = other.min, other.max
+        else:
+            total = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / total
+            self._m2 += other._m2 + delta * delta * self.count * other.count / total
+            self.count = total
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    def quantile(self, q):
+        return self.sketch.quantile(q)
+
+    def summary(self):
+        """Plain dict for display"""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'stdev': self.stdev,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99)
+        }
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self._m2,
+            'min': self.min,
+            'max': self.max,
+            'sketch': self.sketch.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count = data['count']
+        stats.mean = data['mean']
+        stats._m2 = data['m2']
+        stats.min = data['min']
+        stats.max = data['max']
+        stats.sketch = QuantileSketch.from_dict(data['sketch'])
+        return stats
+
+
+# Metrics tracked per game mode
+METRICS = ('guess_time', 'attempts_to_win', 'score')
+
+
+class ModeStats:
+    """OnlineStats for each metric of one game mode"""
+    def __init__(self, metrics=None):
+        self.metrics = metrics or {name: OnlineStats() for name in METRICS}
+
+    def add(self, metric, value):
+        self.metrics[metric].add(value)
+
+    def summary(self):
+        return {name: stats.summary() for name, stats in self.metrics.items()}
+
+    def to_dict(self):
+        return {name: stats.to_dict() for name, stats in self.metrics.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        metrics = {name: OnlineStats() for name in METRICS}
+        for name, stats in (data or {}).items():
+            metrics[name] = OnlineStats.from_dict(stats)
+        return cls(metrics)
@@ -0,0 +1,139 @@
+"""
+Background write-behind persistence for the Number Guessing Game.
+
+Saving high scores and the profile used to block the Tk event loop inside
+make_guess. PersistenceWorker runs the writes on a daemon thread instead:
+callers submit a write under a key (usually the file path), a newer write
+for the same key replaces the pending one, and pending writes are flushed
+after a short debounce interval or when flush()/stop() is called.
+"""
+import json
+import os
+import threading
+import time
+
+
+def write_json(path, data):
+    """Write data to path atomically"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def append_jsonl(path, record):
+    """Append one JSON record as a line"""
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+
+class PersistenceWorker(threading.Thread):
+    """Debounced, coalescing writer thread"""
+    def __init__(self, debounce=0.5, max_pending=64):
+        super().__init__(name='PersistenceWorker', daemon=True)
+        self.debounce = debounce
+        self.max_pending = max_pending
+        self._pending = {}
+        self._first_pending = None
+        self._condition = threading.Condition()
+        self._flush_requested = False
+        self._in_flight = 0
+        self._stopping = False
+        self.counters = {
+            'submitted': 0,
+            'coalesced': 0,
+            'writes': 0,
+            'flushes': 0,
+            'errors': 0,
+            'last_flush_latency': 0.0,
+            'max_flush_latency': 0.0
+        }
+
+    def submit(self, key, fn, *args):
+        """Schedule fn(*args); replaces any pending write with the same key.
+
+        Blocks while max_pending distinct keys are already waiting.
+        """
+        with self._condition:
+            while len(self._pending) >= self.max_pending and key not in self._pending:
+                self._flush_requested = True
+                self._condition.notify_all()
+                self._condition.wait()
+            self.counters['submitted'] += 1
+            if key in self._pending:
+                self.counters['coalesced'] += 1
+            elif not self._pending:
+                self._first_pending = time.monotonic()
+            self._pending[key] = (fn, args)
+            self._condition.notify_all()
+
+    @property
+    def queue_depth(self):
+        with self._condition:
+            return len(self._pending)
+
+    def stats(self):
+        """Counters plus the current queue depth"""
+        with self._condition:
+            return dict(self.counters, queue_depth=len(self._pending))
+
+    def flush(self, timeout=None):
+        """Write everything pending now and wait until it is on disk"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def stop(self, timeout=5.0):
+        """Flush pending writes and end the thread"""
+        if self.is_alive():
+            self.flush(timeout)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopping:
+                    self._condition.wait()
+                if not self._pending and self._stopping:
+                    return
+                # Debounce: let bursts of writes coalesce before flushing
+                while not self._flush_requested and not self._stopping:
+                    remaining = self._first_pending + self.debounce - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                jobs = self._pending
+                self._pending = {}
+                self._flush_requested = False
+                self._in_flight = len(jobs)
+                self._condition.notify_all()
+
+            start = time.perf_counter()
+            errors = 0
+            for fn, args in jobs.values():
+                try:
+                    fn(*args)
+                except Exception as e:
+                    errors += 1
+                    print(f"Error saving game data: {e}")
+            latency = time.perf_counter() - start
+
+            with self._condition:
+                self._in_flight = 0
+                self.counters['writes'] += len(jobs)
+                self.counters['flushes'] += 1
+                self.counters['errors'] += errors
+                self.counters['last_flush_latency'] = latency
+                self.counters['max_flush_latency'] = max(self.counters['max_flush_latency'], latency)
+                self._condition.notify_all()
@@ -0,0 +1,168 @@
+"""
+Journaled storage for the player profile.
+
+Instead of rewriting data/profile.json after every change, small mutation
+records are appended to data/profile.journal. Every so often the journal is
+compacted into a fresh profile.json snapshot. On load the snapshot is read
+and the journal replayed on top of it.
+
+Records are one JSON list per line: [[op, path, value], ...] where op is
+"set" (assign value at path) or "add" (append value to the list at path if
+it is not already there). Both are idempotent, so replaying a journal over
+a snapshot that already contains some of its records is harmless. A torn
+last line from a crash is cut off on load, so later records are not
+appended onto it.
+
+stage() and flush_pending() let the Tk thread queue changes cheaply while
+a PersistenceWorker does the file I/O. The worker never reads the live
+profile: when a compaction is due, stage() copies the profile on the Tk
+thread and the worker writes that copy.
+"""
+import copy
+import json
+import os
+import threading
+
+from game_engine import default_profile
+
+SET = 'set'
+ADD = 'add'
+
+
+def apply_change(profile, op, path, value):
+    """Apply one journal record to a profile dict"""
+    target = profile
+    for key in path[:-1]:
+        target = target.setdefault(key, {})
+    key = path[-1]
+    if op == SET:
+        target[key] = value
+    elif op == ADD:
+        items = target.setdefault(key, [])
+        if value not in items:
+            items.append(value)
+
+
+class ProfileStore:
+    """Snapshot + append-only journal for the player profile"""
+    def __init__(self, path='data/profile.json', journal_path=None,
+                 compact_every=500, fsync=False):
+        self.path = path
+        self.journal_path = journal_path or os.path.splitext(path)[0] + '.journal'
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.records = 0
+        self._journal = None
+        self._lock = threading.RLock()
+        self._staged = []
+        # Copy of the profile for the next compaction, taken by stage()
+        self._snapshot = None
+        self.profile = None
+
+    def load(self):
+        """Read the snapshot and replay the journal; returns the profile"""
+        try:
+            with open(self.path, 'r') as f:
+                profile = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            profile = default_profile()
+
+        self.records = 0
+        if os.path.exists(self.journal_path):
+            # End of the last complete record
+            good = 0
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        changes = json.loads(line)
+                    except ValueError:
+                        # Torn write from a crash: everything after it is lost
+                        break
+                    for op, path, value in changes:
+                        apply_change(profile, op, path, value)
+                    self.records += 1
+                    good += len(line)
+            if good < os.path.getsize(self.journal_path):
+                with self._lock:
+                    if self._journal is not None:
+                        self._journal.close()
+                        self._journal = None
+                    with open(self.journal_path, 'r+b') as f:
+                        f.truncate(good)
+        self.profile = profile
+        return profile
+
+    def commit(self, changes, snapshot=None):
+        """Append one record holding a batch of (op, path, value) changes.
+
+        snapshot is a private copy of the profile including these changes;
+        the journal is compacted into it once it is long enough.
+        """
+        if not changes:
+            return
+        with self._lock:
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'a')
+            self._journal.write(json.dumps(changes) + '\n')
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+            self.records += 1
+            if self.records >= self.compact_every and snapshot is not None:
+                self._write_snapshot(snapshot)
+
+    def stage(self, changes, profile=None):
+        """Queue changes for the next flush_pending() call.
+
+        Called on the thread that changes profile, which must already hold
+        the changes; it is copied here when the next flush will compact.
+        """
+        with self._lock:
+            self._staged.extend(changes)
+            if profile is not None and self.records + 1 >= self.compact_every:
+                self._snapshot = copy.deepcopy(profile)
+
+    def flush_pending(self):
+        """Commit everything staged so far as one record"""
+        with self._lock:
+            changes, snapshot = self._staged, self._snapshot
+            self._staged, self._snapshot = [], None
+            self.commit(changes, snapshot)
+
+    def set(self, path, value):
+        """Record a single assignment, e.g. set(['name'], 'Ada')"""
+        self.commit([(SET, list(path), value)])
+
+    def compact(self, profile=None):
+        """Write a full snapshot and start an empty journal; call it on the thread that changes the profile"""
+        with self._lock:
+            if profile is not None:
+                self.profile = profile
+            if self.profile is None:
+                return
+            # Staged changes are already in the profile dict
+            self._staged = []
+            self._snapshot = None
+            self._write_snapshot(self.profile)
+
+    def _write_snapshot(self, profile):
+        with self._lock:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(profile, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+            if self._journal is not None:
+                self._journal.close()
+            self._journal = open(self.journal_path, 'w')
+            self.records = 0
+
+    def close(self):
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
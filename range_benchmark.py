@@ -0,0 +1,82 @@
+"""
+Large-range benchmark for GameEngine.
+
+Plays binary-search rounds on ranges from 2**8 up to 2**16384 wide and
+times every make_guess call and every hint. A round on an n-wide range
+takes about log2(n) guesses, and each guess only compares and narrows
+Python ints, so its cost should grow no faster than the number of bits;
+the run fails if it grows faster than that. Hints (bucket, parity,
+divisibility, midpoint and digit sum) are computed without str(), so they
+also work past Python's 4300-digit str() limit.
+
+Usage:
+    python range_benchmark.py [rounds]
+"""
+import sys
+import time
+
+from game_engine import GameEngine, TOO_LOW, TOO_HIGH, DIFFICULTY_ATTEMPTS, attempts_for_range
+
+BITS = (8, 16, 32, 64, 128, 256, 1024, 4096, 16384)
+
+
+def play(bits, rounds):
+    """Returns (seconds per guess, guesses per round, seconds per hint)"""
+    low, high = 1, 1 << bits
+    engine = GameEngine(seed=bits, clock=lambda: 0)
+    engine.set_range(low, high)
+    guesses = 0
+    guess_time = 0.0
+    hint_time = 0.0
+    hints = 0
+    perf_counter = time.perf_counter
+    for i in range(rounds):
+        engine.set_difficulty(tuple(DIFFICULTY_ATTEMPTS)[i % len(DIFFICULTY_ATTEMPTS)])
+        engine.max_attempts = attempts_for_range(low, high)
+        engine.start_round(now=0)
+
+        start = perf_counter()
+        engine.get_hint()
+        hint_time += perf_counter() - start
+        hints += 1
+
+        lo, hi = low, high
+        while engine.game_active:
+            guess = (lo + hi) // 2
+            start = perf_counter()
+            outcome = engine.make_guess(guess, now=0)
+            guess_time += perf_counter() - start
+            guesses += 1
+            if outcome['result'] == TOO_LOW:
+                lo = guess + 1
+            elif outcome['result'] == TOO_HIGH:
+                hi = guess - 1
+        if not outcome['won']:
+            raise AssertionError(f"Binary search lost a round on a {bits}-bit range")
+    return guess_time / guesses, guesses / rounds, hint_time / hints
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"=== Large ranges: {rounds} binary-search rounds per range ===")
+    print(f"{'Range':>10}{'Guesses':>10}{'us/guess':>12}{'us/hint':>12}")
+    results = {}
+    for bits in BITS:
+        per_guess, per_round, per_hint = play(bits, rounds)
+        results[bits] = per_guess
+        print(f"{'2**' + str(bits):>10}{per_round:>10.1f}{per_guess * 1e6:>12.2f}{per_hint * 1e6:>12.1f}")
+
+    # Per-guess cost may grow with the number of bits (int compares), no faster
+    small, large = BITS[0], BITS[-1]
+    growth = results[large] / results[small]
+    allowed = large / small
+    print(f"\nPer-guess cost grew {growth:.1f}x while the range grew from 2**{small} "
+          f"to 2**{large} ({allowed:.0f}x the bits)")
+    if growth > allowed:
+        print("FAIL: per-guess cost grows faster than O(log n)")
+        sys.exit(1)
+    print("PASS: per-guess cost is O(log n)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Seeded random numbers for game sessions.
+
+Every session has a 64-bit seed. Round i of the session gets its own seed,
+round_seed(session_seed, i), and everything random in the round (the
+secret number and which hint is given) is a pure function of that round
+seed. Recording the round seed with a game is therefore enough to replay it
+exactly, on any machine and in any process.
+
+spawn() splits off independent child services by key (one per worker
+process, server session or tournament task), so parallel runs stay
+reproducible whatever order the work is scheduled in. secrets() generates
+the secret numbers of many consecutive rounds at once with NumPy; they are
+the same numbers GameEngine picks for those rounds.
+
+Values are mixed with SplitMix64 and mapped onto a range with a
+multiply-shift on 32 bits, whose bias (at most span / 2**32) is far below
+anything a game can notice. Ranges wider than 2**32 fall back to
+random.Random seeded from the same value.
+"""
+import hashlib
+import os
+import random
+
+MASK64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+# Streams drawn from a round seed
+SECRET_STREAM = 0
+HINT_STREAM = 1
+
+
+def new_seed():
+    """A fresh random 64-bit seed"""
+    return int.from_bytes(os.urandom(8), 'big')
+
+
+def derive_seed(base_seed, *key):
+    """Deterministic 64-bit seed for a key, independent of call order"""
+    text = ':'.join(str(part) for part in (base_seed,) + key)
+    return int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], 'big')
+
+
+def parse_seed(text):
+    """Seed from text such as an environment variable.
+
+    Numbers (42, 0x2a) are the seed itself, as GameEngine(seed=42) or a
+    logged round seed; any other text is hashed into one.
+    """
+    try:
+        return int(text, 0)
+    except ValueError:
+        return derive_seed(text)
+
+
+def mix64(value):
+    """SplitMix64 output function"""
+    z = value & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+
+def stream_value(seed, stream):
+    """The 64-bit value of one numbered stream of a seed"""
+    return mix64(seed + (stream + 1) * GOLDEN_GAMMA)
+
+
+def round_seed(session_seed, index):
+    """Seed of a session's index-th round"""
+    return stream_value(session_seed, index)
+
+
+def below(seed, span, stream=0):
+    """Uniform integer in [0, span) from one stream of a seed"""
+    value = stream_value(seed, stream)
+    if span <= 1 << 32:
+        return ((value >> 32) * span) >> 32
+    return random.Random(value).randrange(span)
+
+
+def secret_for(seed, low, high):
+    """The secret number of a round with this seed"""
+    return low + below(seed, high - low + 1, SECRET_STREAM)
+
+
+def hint_index(seed, count):
+    """Which of count possible hints a round with this seed gives"""
+    return below(seed, count, HINT_STREAM) if count > 1 else 0
+
+
+class RNGService:
+    """Source of round seeds for one session"""
+    __slots__ = ('seed', 'rounds')
+
+    def __init__(self, seed=None, rounds=0):
+        if seed is None:
+            seed = new_seed()
+        elif isinstance(seed, str):
+            seed = parse_seed(seed)
+        elif not isinstance(seed, int):
+            # Any other printable seed
+            seed = derive_seed(seed)
+        self.seed = seed & MASK64
+        self.rounds = rounds
+
+    def spawn(self, *key):
+        """Independent child service for a worker, session or task"""
+        return RNGService(derive_seed(self.seed, *key))
+
+    def next_round(self):
+        """Seed for the next round"""
+        seed = round_seed(self.seed, self.rounds)
+        self.rounds += 1
+        return seed
+
+    def secrets(self, low, high, count, start=0):
+        """Secrets of rounds start .. start + count - 1 as a NumPy array.
+
+        Rounds of a GameEngine seeded with this service's seed get the same
+        numbers, so bulk simulations can be replayed round by round.
+        """
+        import numpy as np
+        span = high - low + 1
+        if span > 1 << 32:
+            return np.array([secret_for(round_seed(self.seed, i), low, high)
+                             for i in range(start, start + count)], dtype=object)
+        gamma = np.uint64(GOLDEN_GAMMA)
+        index = np.arange(start + 1, start + count + 1, dtype=np.uint64)
+        seeds = _mix64_array(np.uint64(self.seed) + index * gamma)
+        values = _mix64_array(seeds + np.uint64(SECRET_STREAM + 1) * gamma)
+        return low + (((values >> np.uint64(32)) * np.uint64(span)) >> np.uint64(32)).astype(np.int64)
+
+
+def _mix64_array(z):
+    """mix64 on a uint64 array; NumPy arithmetic wraps like & MASK64"""
+    import numpy as np
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
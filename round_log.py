@@ -0,0 +1,544 @@
+"""
+Event-sourced log of every round.
+
+A RoundLog attached to a GameEngine appends one fixed-size binary record
+per round event (session, start, guess, hint, timeout, end) to a rolling
+set of segment files, so nothing about a round is lost when it ends. From
+the log alone, replay() rebuilds the profile statistics, high scores and
+achievements the engine accumulated, folding whole NumPy arrays of events
+at a time: a million-round log replays in a few seconds.
+
+Each record is 24 bytes, little-endian:
+
+    kind   u8   SESSION, START, GUESS, HINT, TIMEOUT or END
+    code   u8   START: mode << 4 | difficulty, GUESS: result, END: won
+    small  u16  START: max attempts, GUESS/HINT/END: attempts so far
+    round  u32  round number, counted across the whole log
+    time   f64  START: the engine clock; others: seconds since the start,
+                never decreasing within a round
+    value  i64  SESSION/START: seed, GUESS: guess, END: score
+
+Guesses outside 64 bits are stored clamped; their result code is exact.
+Difficulty and mode names are stored as codes; the names are kept in
+codes.json. A segment is closed once it passes segment_bytes at the end
+of a round, and a snapshot of the replayed state up to there is written to
+snapshot.json, so replay() only folds the events after it. A torn record
+from a crash is dropped on open.
+
+Benchmark with:
+    python round_log.py [rounds] [copies]
+"""
+import json
+import math
+import os
+import shutil
+import struct
+import sys
+import time
+
+from game_engine import (GAME_MODES, DIFFICULTY_ATTEMPTS, TOO_LOW, TOO_HIGH,
+                         CORRECT, EVENT_START, EVENT_GUESS, EVENT_HINT, EVENT_TIMEOUT, EVENT_END,
+                         default_profile, default_high_scores)
+from achievements import OPS, RULES, WIN
+from online_stats import ModeStats
+from persistence import write_json
+
+LOG_DIR = os.path.join('data', 'round_log')
+
+EVENT = struct.Struct('<BBHIdq')
+
+# Record kinds
+SESSION, START, GUESS, HINT, TIMEOUT, END = range(6)
+
+KINDS = {
+    EVENT_START: START,
+    EVENT_GUESS: GUESS,
+    EVENT_HINT: HINT,
+    EVENT_TIMEOUT: TIMEOUT,
+    EVENT_END: END
+}
+
+RESULT_CODES = {TOO_LOW: 0, TOO_HIGH: 1, CORRECT: 2}
+
+# Segments are closed past this size, at the end of a round
+SEGMENT_BYTES = 64 * 2 ** 20
+
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+
+def _int64(value):
+    """Clamp to int64; 64-bit seeds wrap to their signed form"""
+    if 0 <= value < 1 << 64 and value > INT64_MAX:
+        return value - (1 << 64)
+    return min(max(value, INT64_MIN), INT64_MAX)
+
+
+def event_dtype():
+    """NumPy dtype matching EVENT"""
+    import numpy as np
+    return np.dtype([('kind', 'u1'), ('code', 'u1'), ('small', '<u2'), ('round', '<u4'),
+                     ('time', '<f8'), ('value', '<i8')])
+
+
+def _segment_name(number):
+    return f"events-{number:06d}.bin"
+
+
+class LogState:
+    """Profile, high scores and achievements folded from log events"""
+    def __init__(self):
+        self.profile = default_profile()
+        self.high_scores = default_high_scores()
+        # Sum of guess times, so the average can keep growing
+        self.guess_time_total = 0.0
+        # Wins in the engine session the last events belong to
+        self.session_wins = 0
+        self.mode_stats = {}
+        self.rounds = 0
+        # (segment number, byte offset) folded up to
+        self.position = (1, 0)
+
+    def apply(self, events, codes):
+        """Fold a NumPy array of whole rounds' events, in log order, into the state"""
+        import numpy as np
+        if len(events) == 0:
+            return
+        kind = events['kind']
+        profile = self.profile
+        stats = profile['stats']
+
+        starts = events[kind == START]
+        start_rounds = starts['round']
+        # Indexed only where a START was found; padded so indexing never fails
+        start_codes = starts['code'] if len(starts) else np.zeros(1, dtype=np.uint8)
+
+        def start_of(rows):
+            """Index of each row's START record, and whether it has one"""
+            if len(starts) == 0:
+                return np.zeros(len(rows), dtype=np.int64), np.zeros(len(rows), dtype=bool)
+            index = np.minimum(np.searchsorted(start_rounds, rows['round']), len(starts) - 1)
+            return index, start_rounds[index] == rows['round']
+
+        # Every guess counts towards the guess stats, finished round or not
+        guesses = events[kind == GUESS]
+        stats['total_guesses'] += len(guesses)
+        self.guess_time_total += float(guesses['time'].sum())
+
+        # Rounds whose START was lost to a crash are left out
+        end_rows = np.flatnonzero(kind == END)
+        end_index, found = start_of(events[end_rows])
+        end_rows, end_index = end_rows[found], end_index[found]
+        won = events['code'][end_rows] == 1
+        win_rows = end_rows[won]
+        wins = events[win_rows]
+        start_code = start_codes[end_index[won]]
+        difficulty = start_code & 15
+        mode = start_code >> 4
+
+        win_count = len(wins)
+        total_wins, total_score = profile['games_played'], profile['total_score']
+        profile['games_played'] += win_count
+        profile['total_score'] += int(wins['value'].sum())
+        stats['correct_guesses'] += win_count
+        if win_count:
+            profile['best_time'] = min(profile['best_time'], float(wins['time'].min()))
+        if stats['total_guesses'] > 0:
+            stats['accuracy'] = stats['correct_guesses'] / stats['total_guesses'] * 100
+            stats['avg_guess_time'] = self.guess_time_total / stats['total_guesses']
+
+        for code in np.unique(difficulty).tolist():
+            name = codes['difficulty'][code]
+            best = int(wins['value'][difficulty == code].max())
+            if best > self.high_scores.get(name, 0):
+                self.high_scores[name] = best
+
+        # Mode distributions; guess times run from the previous guess (or the start)
+        guess_index, guess_found = start_of(guesses)
+        same_round = np.zeros(len(guesses), dtype=bool)
+        same_round[1:] = guesses['round'][1:] == guesses['round'][:-1]
+        guess_time = guesses['time'] - np.where(same_round, np.roll(guesses['time'], 1), 0.0)
+        guess_mode = np.where(guess_found, start_codes[guess_index] >> 4, -1)
+        for code in np.unique(np.concatenate([mode, guess_mode[guess_found]])).tolist():
+            mode_stats = self._mode(codes['mode'][code])
+            mode_stats.metrics['guess_time'].add_array(guess_time[guess_mode == code])
+            mode_stats.metrics['attempts_to_win'].add_array(wins['small'][mode == code])
+            mode_stats.metrics['score'].add_array(wins['value'][mode == code])
+
+        self._apply_achievements(np.cumsum(kind == SESSION), win_rows, wins, total_wins, total_score)
+        self.rounds += len(starts)
+
+    def _mode(self, name):
+        if name not in self.mode_stats:
+            self.mode_stats[name] = ModeStats()
+        return self.mode_stats[name]
+
+    def _apply_achievements(self, session, win_rows, wins, total_wins, total_score):
+        """Unlock achievements in the order the engine would have.
+
+        session numbers every record by the SESSION records before it; 0 is
+        the session carried over from earlier events. Win rules are
+        evaluated on every win at once; rules on counters the log does not
+        hold, and rules on other events, are skipped.
+        """
+        import numpy as np
+        win_session = session[win_rows]
+        # Wins so far within each session, the carried one included
+        ordinal = np.arange(1, len(wins) + 1) - np.searchsorted(win_session, win_session)
+        ordinal[win_session == 0] += self.session_wins
+        counters = {
+            'score': wins['value'],
+            'attempts': wins['small'],
+            'time_elapsed': wins['time'],
+            'winning_streak': ordinal,
+            'session_wins': ordinal,
+            'total_wins': total_wins + np.arange(1, len(wins) + 1),
+            'total_score': total_score + np.cumsum(wins['value'])
+        }
+        triggers = {rule.id: OPS[rule.op](counters[rule.counter], rule.threshold)
+                    for rule in RULES.values() if rule.event == WIN and rule.counter in counters}
+        unlocked = self.profile['achievements']
+        found = []
+        for order, (achievement_id, hits) in enumerate(triggers.items()):
+            if achievement_id not in unlocked and hits.any():
+                found.append((int(np.argmax(hits)), order, achievement_id))
+        unlocked.extend(achievement_id for _, _, achievement_id in sorted(found))
+
+        last_session = int(session[-1])
+        wins_in_last = int((win_session == last_session).sum())
+        self.session_wins = wins_in_last if last_session else self.session_wins + wins_in_last
+
+    def finish(self):
+        """Copy the mode distributions into the profile; returns self"""
+        self.profile['distributions'] = {name: stats.to_dict()
+                                         for name, stats in self.mode_stats.items()}
+        return self
+
+    def to_dict(self):
+        self.finish()
+        return {
+            'profile': self.profile,
+            'high_scores': self.high_scores,
+            'guess_time_total': self.guess_time_total,
+            'session_wins': self.session_wins,
+            'rounds': self.rounds,
+            'position': list(self.position)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls()
+        state.profile = data['profile']
+        state.high_scores = data['high_scores']
+        state.guess_time_total = data['guess_time_total']
+        state.session_wins = data['session_wins']
+        state.rounds = data['rounds']
+        state.position = tuple(data['position'])
+        state.mode_stats = {name: ModeStats.from_dict(saved)
+                            for name, saved in state.profile.get('distributions', {}).items()}
+        return state
+
+
+class RoundLog:
+    """Rolling binary event log with snapshots, fed by GameEngine.event_sink"""
+    def __init__(self, directory=LOG_DIR, segment_bytes=SEGMENT_BYTES, snapshots=True):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.snapshots = snapshots
+        os.makedirs(directory, exist_ok=True)
+        self.codes = self._load_codes()
+        self.segment = max(self.segments() or [1])
+        self.rounds = self._repair()
+        self._file = None
+        self._round = 0
+        self._start = 0.0
+        self._last = 0.0
+
+    # -- codes ----------------------------------------------------------------
+
+    def _load_codes(self):
+        codes = {'difficulty': list(DIFFICULTY_ATTEMPTS), 'mode': list(GAME_MODES)}
+        try:
+            with open(os.path.join(self.directory, 'codes.json'), 'r') as f:
+                saved = json.load(f)
+            for column in codes:
+                codes[column] = list(saved.get(column, codes[column]))
+        except (OSError, ValueError):
+            pass
+        return codes
+
+    def code(self, column, name):
+        """Four-bit code for a difficulty or mode name, added if new"""
+        names = self.codes[column]
+        if name not in names:
+            if len(names) >= 16:
+                raise ValueError(f"Too many distinct {column} values")
+            names.append(name)
+            write_json(os.path.join(self.directory, 'codes.json'), self.codes)
+        return names.index(name)
+
+    # -- files ----------------------------------------------------------------
+
+    def segments(self):
+        """Numbers of the segment files present, in order"""
+        numbers = []
+        for name in os.listdir(self.directory):
+            if name.startswith('events-') and name.endswith('.bin'):
+                numbers.append(int(name[7:-4]))
+        return sorted(numbers)
+
+    def segment_path(self, number):
+        return os.path.join(self.directory, _segment_name(number))
+
+    def _repair(self):
+        """Drop a torn last record; returns the number of the next round"""
+        path = self.segment_path(self.segment)
+        if os.path.exists(path):
+            size = os.path.getsize(path)
+            if size % EVENT.size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size - size % EVENT.size)
+        # The last record tells: SESSION records carry the next round's number
+        for number in reversed(self.segments()):
+            path = self.segment_path(number)
+            if os.path.getsize(path) >= EVENT.size:
+                with open(path, 'rb') as f:
+                    f.seek(-EVENT.size, os.SEEK_END)
+                    record = EVENT.unpack(f.read(EVENT.size))
+                return record[3] if record[0] == SESSION else record[3] + 1
+        return 0
+
+    def _write(self, kind, code, small, time_value, value, number=None):
+        if self._file is None:
+            self._file = open(self.segment_path(self.segment), 'ab')
+        number = self._round if number is None else number
+        self._file.write(EVENT.pack(kind, code, min(small, 0xFFFF), number & 0xFFFFFFFF,
+                                    time_value, _int64(value)))
+        self._file.flush()
+
+    # -- recording ------------------------------------------------------------
+
+    def attach(self, engine):
+        """Log engine's rounds from now on, as a new session"""
+        engine.event_sink = self.record
+        self._write(SESSION, 0, 0, 0.0, engine.rng_service.seed, self.rounds)
+
+    def record(self, event, engine, now, value):
+        """GameEngine.event_sink: append one event"""
+        kind = KINDS[event]
+        state = engine.round
+        if kind == START:
+            self._round = self.rounds
+            self.rounds += 1
+            self._start = self._last = now
+            code = self.code('mode', engine.current_mode) << 4 | self.code('difficulty', engine.difficulty)
+            self._write(START, code, state.max_attempts, now, value)
+            return
+        # Seconds since the start, never going back even if the clock does
+        self._last = max(self._last, now)
+        elapsed = self._last - self._start
+        if kind == GUESS:
+            self._write(GUESS, RESULT_CODES[engine.judge(value)], state.attempts, elapsed, value)
+        elif kind == END:
+            won = state.attempts > 0 and state.last_guess == state.secret
+            self._write(END, 1 if won else 0, state.attempts, elapsed, value if won else 0)
+            if self._file.tell() >= self.segment_bytes:
+                self.roll()
+        else:
+            self._write(kind, 0, state.attempts, elapsed, 0)
+
+    def roll(self):
+        """Close the current segment, snapshot the state and start a new one"""
+        self.close()
+        self.segment += 1
+        if self.snapshots:
+            self.snapshot()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # -- replay ---------------------------------------------------------------
+
+    def read_segment(self, number, offset=0):
+        """Events of a segment from a byte offset, as a NumPy array"""
+        import numpy as np
+        path = self.segment_path(number)
+        if not os.path.exists(path):
+            return np.zeros(0, dtype=event_dtype())
+        size = os.path.getsize(path)
+        count = (size - offset) // EVENT.size
+        return np.fromfile(path, dtype=event_dtype(), count=count, offset=offset)
+
+    def load_snapshot(self):
+        """The snapshot's LogState, or None if there is none or it is stale"""
+        try:
+            with open(os.path.join(self.directory, 'snapshot.json'), 'r') as f:
+                state = LogState.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+        number, offset = state.position
+        path = self.segment_path(number)
+        if offset and (not os.path.exists(path) or os.path.getsize(path) < offset):
+            return None
+        return state
+
+    def replay(self, use_snapshot=True):
+        """Rebuild profile stats, high scores and achievements from the log.
+
+        Starts from the snapshot unless use_snapshot is False, in which case
+        every segment is folded from scratch. Returns a LogState.
+        """
+        if self._file is not None:
+            self._file.flush()
+        state = self.load_snapshot() if use_snapshot else None
+        if state is None:
+            state = LogState()
+            state.position = (min(self.segments() or [1]), 0)
+        number, offset = state.position
+        for segment in self.segments():
+            if segment < number:
+                continue
+            start = offset if segment == number else 0
+            events = self.read_segment(segment, start)
+            state.apply(events, self.codes)
+            state.position = (segment, start + len(events) * EVENT.size)
+        return state.finish()
+
+    def snapshot(self):
+        """Fold everything logged so far and save it as the snapshot"""
+        state = self.replay()
+        write_json(os.path.join(self.directory, 'snapshot.json'), state.to_dict())
+        return state
+
+    def round_records(self):
+        """A replay_round() record for every finished round, oldest first"""
+        difficulties, modes = self.codes['difficulty'], self.codes['mode']
+        for segment in self.segments():
+            with open(self.segment_path(segment), 'rb') as f:
+                data = f.read()
+            record = None
+            current = None
+            for kind, code, small, number, time_value, value in EVENT.iter_unpack(data):
+                if kind == START:
+                    current = number
+                    record = {'seed': value % (1 << 64), 'mode': modes[code >> 4],
+                              'difficulty': difficulties[code & 15], 'max_attempts': small,
+                              'guesses': [], 'hint_at': None}
+                elif record is None or number != current:
+                    continue
+                elif kind == GUESS:
+                    record['guesses'].append(value)
+                elif kind == HINT:
+                    record['hint_at'] = small
+                elif kind == END:
+                    record.update(duration=time_value, won=bool(code), score=value)
+                    yield record
+                    record = None
+
+
+def _play(log, rounds, seed=0):
+    """Play binary-search rounds on a logged engine; returns the engine"""
+    from game_engine import GameEngine
+    difficulties = tuple(DIFFICULTY_ATTEMPTS)
+    modes = tuple(GAME_MODES)
+    clock = [0.0]
+    engine = GameEngine(seed=seed, clock=lambda: clock[0])
+    log.attach(engine)
+    for i in range(rounds):
+        if i % 5000 == 0 and i:
+            # A new process: session counters start again
+            profile = engine.player_profile
+            high_scores = engine.high_scores
+            engine = GameEngine(seed=seed + i, clock=lambda: clock[0])
+            engine.set_profile(profile)
+            engine.high_scores = high_scores
+            log.attach(engine)
+        engine.set_mode(modes[i % len(modes)])
+        engine.set_difficulty(difficulties[i % len(difficulties)])
+        engine.start_round()
+        low, high = engine.number_range
+        if i % 3 == 0:
+            clock[0] += 1.5
+            engine.get_hint()
+        while engine.game_active:
+            clock[0] += 2.0 + i % 7
+            if i % 11 == 0 and engine.attempts == 1:
+                engine.expire()
+                break
+            guess = (low + high) // 2
+            outcome = engine.make_guess(guess)
+            if outcome['result'] == TOO_LOW:
+                low = guess + 1
+            elif outcome['result'] == TOO_HIGH:
+                high = guess - 1
+    return engine
+
+
+def _check(state, engine):
+    """Compare a replayed state with the engine's own; returns mismatches"""
+    profile = engine.player_profile
+    mismatches = []
+    for key in ('games_played', 'total_score', 'best_time', 'achievements'):
+        if state.profile[key] != profile[key]:
+            mismatches.append((key, state.profile[key], profile[key]))
+    for key in ('total_guesses', 'correct_guesses', 'accuracy', 'avg_guess_time'):
+        if not math.isclose(state.profile['stats'][key], profile['stats'][key], rel_tol=1e-9):
+            mismatches.append((key, state.profile['stats'][key], profile['stats'][key]))
+    if state.high_scores != engine.high_scores:
+        mismatches.append(('high_scores', state.high_scores, engine.high_scores))
+    return mismatches
+
+
+def main():
+    import numpy as np
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    copies = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    directory = os.path.join('data', 'round_log_benchmark')
+    shutil.rmtree(directory, ignore_errors=True)
+
+    log = RoundLog(directory, segment_bytes=EVENT.size * rounds)
+    start = time.perf_counter()
+    engine = _play(log, rounds)
+    log.close()
+    played = time.perf_counter() - start
+    size = sum(os.path.getsize(log.segment_path(n)) for n in log.segments())
+    print(f"Logged {rounds} rounds in {played:.2f}s ({size / rounds:.0f} bytes per round, "
+          f"{len(log.segments())} segments)")
+
+    for use_snapshot in (False, True):
+        state = log.replay(use_snapshot)
+        mismatches = _check(state, engine)
+        print(f"Replay {'from snapshot' if use_snapshot else 'from scratch'}: "
+              f"{len(mismatches)} mismatches")
+        for mismatch in mismatches:
+            print("  ", mismatch)
+        if mismatches:
+            sys.exit(1)
+
+    # A big log: the played events repeated, as separate sessions
+    events = np.concatenate([log.read_segment(n) for n in log.segments()])
+    big = os.path.join(directory, 'big')
+    os.makedirs(big, exist_ok=True)
+    if os.path.exists(os.path.join(directory, 'codes.json')):
+        shutil.copy(os.path.join(directory, 'codes.json'), big)
+    with open(os.path.join(big, _segment_name(1)), 'wb') as f:
+        for copy in range(copies):
+            shifted = events.copy()
+            shifted['round'] += copy * rounds
+            shifted.tofile(f)
+    big_log = RoundLog(big)
+    start = time.perf_counter()
+    state = big_log.replay(use_snapshot=False)
+    duration = time.perf_counter() - start
+    total = rounds * copies
+    print(f"Replayed {total} rounds ({len(events) * copies} events) from scratch in {duration:.2f}s")
+    if state.profile['games_played'] != engine.player_profile['games_played'] * copies:
+        print("FAIL: replayed win count is wrong")
+        sys.exit(1)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compact per-round state.
+
+A RoundState holds everything that changes during one round (secret,
+attempts, bounds, hint, timing) in __slots__, with the guesses in a
+fixed-size array sized by the attempt budget. GameEngine keeps its round in
+one, and servers or simulators that only need rounds can keep a million of
+them without the profile, high scores and achievements an engine carries.
+
+Measure the footprint with:
+    python round_state.py [rounds] [max_attempts]
+"""
+import sys
+import tracemalloc
+from array import array
+
+# Signed 64-bit guesses; wider ranges keep them in a list
+GUESS_TYPECODE = 'q'
+GUESS_MIN = -(1 << 63)
+GUESS_MAX = (1 << 63) - 1
+
+
+class RoundState:
+    """One round: seed, secret, attempts, bounds, hint, timing and guesses"""
+    __slots__ = ('seed', 'secret', 'attempts', 'max_attempts', 'hints_remaining', 'active',
+                 'start_time', 'last_guess_at', 'time_elapsed',
+                 'low_bound', 'high_bound', 'hint_text', 'hint_at', 'guesses')
+
+    def __init__(self, secret=0, max_attempts=5, low=1, high=20, now=0, active=True, hints=1,
+                 seed=0):
+        self.seed = seed
+        self.secret = secret
+        self.attempts = 0
+        self.max_attempts = max_attempts
+        self.hints_remaining = hints
+        self.active = active
+        self.start_time = now
+        self.last_guess_at = now
+        self.time_elapsed = 0
+        self.low_bound = low
+        self.high_bound = high
+        self.hint_text = None
+        # Attempt count when the hint was taken, for replays
+        self.hint_at = None
+        if GUESS_MIN <= low and high <= GUESS_MAX:
+            self.guesses = array(GUESS_TYPECODE, bytes(8 * max_attempts))
+        else:
+            self.guesses = [0] * max_attempts
+
+    @property
+    def history(self):
+        """Guesses made so far, oldest first"""
+        return list(self.guesses[:self.attempts])
+
+    @property
+    def last_guess(self):
+        return self.guesses[self.attempts - 1] if self.attempts else None
+
+    @property
+    def attempts_left(self):
+        return self.max_attempts - self.attempts
+
+    def record(self, guess):
+        """Store a guess in the buffer; raises IndexError when it is full"""
+        self.guesses[self.attempts] = guess
+        self.attempts += 1
+
+    def narrow(self, guess, too_low):
+        """Tighten the known bounds after a wrong guess"""
+        if too_low:
+            if guess >= self.low_bound:
+                self.low_bound = guess + 1
+        elif guess <= self.high_bound:
+            self.high_bound = guess - 1
+
+
+def footprint(rounds=100000, max_attempts=5, low=1, high=20):
+    """Bytes allocated per live RoundState, measured with tracemalloc"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    live = [RoundState(low + i % (high - low + 1), max_attempts, low, high)
+            for i in range(rounds)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    # The list holding them is not part of a round
+    used -= sys.getsizeof(live)
+    return used / rounds
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    max_attempts = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    per_round = footprint(rounds, max_attempts)
+    print(f"RoundState with {max_attempts} guesses: {per_round:.0f} bytes per round")
+    print(f"{rounds} live rounds: {per_round * rounds / 2 ** 20:.1f} MiB")
+
+    from game_engine import GameEngine
+    engines = max(1, min(rounds, 10000))
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    live = []
+    for _ in range(engines):
+        engine = GameEngine()
+        engine.start_round(now=0)
+        live.append(engine)
+    per_engine = (tracemalloc.get_traced_memory()[0] - before - sys.getsizeof(live)) / engines
+    tracemalloc.stop()
+    print(f"GameEngine for comparison: {per_engine:.0f} bytes per round")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Optimal-play solver for the Number Guessing Game.
+
+Precomputes, for a number range, an attempt budget and a hint family (the
+difficulty's, or one chosen with GameEngine.set_hints()) and policy, the best next move and the win probability for every state
+(remaining interval, attempts left, hint available). Tables are written to
+data/solver/ and memory-mapped on load, so queries are O(1).
+
+How the DP collapses:
+  * Comparison feedback only ever splits the candidates into "below" and
+    "above", so without a hint the value of a state depends only on the
+    candidate count m: k attempts find at most 2**k - 1 secrets, and the
+    median guess always reaches that bound.
+  * A hint is free in attempts and only adds information, so with a hint
+    available, taking it now is never worse than taking it later. The
+    stored table therefore holds the value of hinting at every interval;
+    the hint is recommended only when it strictly beats guessing, since it
+    costs 100 points.
+
+Usage:
+    python solver.py [low] [high] [attempts] [difficulty]
+"""
+import mmap
+import os
+import sys
+import time
+from array import array
+
+from game_engine import GAME_MODES, DIFFICULTY_ATTEMPTS
+from hints import possible_hints
+
+TABLE_DIR = os.path.join('data', 'solver')
+
+# Tables grow with the square of the range; wider ranges are not solved
+MAX_RANGE = 2000
+
+# Bumped when hint texts change so old tables are rebuilt
+TABLE_VERSION = 2
+
+_solvers = {}
+
+
+def max_wins(count, attempts_left):
+    """Most secrets out of count that attempts_left guesses can find"""
+    if attempts_left <= 0:
+        return 0
+    return min(count, (1 << attempts_left) - 1)
+
+
+class Solver:
+    """Decision tables for one (range, attempts, hint family, hint policy).
+
+    hint_names replaces the difficulty's family; with a policy other than
+    'random' every secret has a single hint, so the hint tells the player
+    more than the family's random draw would.
+    """
+    def __init__(self, low, high, max_attempts, difficulty=None, table_dir=TABLE_DIR,
+                 hint_names=None, hint_policy='random'):
+        self.low = low
+        self.high = high
+        self.size = high - low + 1
+        if self.size > MAX_RANGE:
+            raise ValueError(f"Range {low}-{high} is too wide for the solver (max {MAX_RANGE} numbers)")
+        self.max_attempts = max_attempts
+        self.difficulty = difficulty
+        self.hint_names = tuple(hint_names) if hint_names else None
+        self.hint_policy = hint_policy
+        self.table_dir = table_dir
+        self._index_hints()
+        self.hint_wins = self._load_or_build()
+
+    # -- hint index ---------------------------------------------------------
+
+    def _index_hints(self):
+        """Build prefix counts and positions for every hint text"""
+        self.hint_types = 0
+        self._labels = []
+        self._prefix = {}
+        self._positions = {}
+        if self.difficulty is None:
+            return
+        for offset in range(self.size):
+            texts = possible_hints(self.low + offset, self.difficulty, self.low, self.high,
+                                   self.hint_names, self.hint_policy)
+            self.hint_types = len(texts)
+            self._labels.append(texts)
+            for text in texts:
+                self._positions.setdefault(text, []).append(self.low + offset)
+        for text, positions in self._positions.items():
+            # prefix[i] = how many numbers below low + i give this text
+            prefix = array('I', bytes(4 * (self.size + 1)))
+            for value in positions:
+                prefix[value - self.low + 1] = 1
+            for i in range(1, self.size + 1):
+                prefix[i] += prefix[i - 1]
+            self._prefix[text] = prefix
+
+    # -- table build / load -------------------------------------------------
+
+    @property
+    def table_path(self):
+        hints = self.difficulty or 'none'
+        if self.hint_names:
+            hints += '_' + '-'.join(self.hint_names)
+        if self.hint_policy != 'random':
+            hints += '_' + self.hint_policy
+        name = f"{self.low}_{self.high}_{self.max_attempts}_{hints}_v{TABLE_VERSION}.bin"
+        return os.path.join(self.table_dir, name)
+
+    def _index(self, lo, hi, attempts_left):
+        return ((lo - self.low) * self.size + (hi - self.low)) * (self.max_attempts + 1) + attempts_left
+
+    def _build(self):
+        """Fill wins-after-hint for every interval and attempt count.
+
+        Values are scaled by the number of hint types (hard picks one of
+        three at random). For each lo, hi sweeps upwards and every group's
+        min(size, cap) total is updated in O(1) as the group grows.
+        """
+        budgets = self.max_attempts + 1
+        caps = [(1 << k) - 1 for k in range(budgets)]
+        table = array('I', bytes(4 * self.size * self.size * budgets))
+        for lo_offset in range(self.size):
+            counts = {}
+            totals = [0] * budgets
+            base = lo_offset * self.size * budgets
+            for hi_offset in range(lo_offset, self.size):
+                for text in self._labels[hi_offset]:
+                    seen = counts.get(text, 0)
+                    counts[text] = seen + 1
+                    for k in range(1, budgets):
+                        if seen < caps[k]:
+                            totals[k] += 1
+                table[base + hi_offset * budgets:base + (hi_offset + 1) * budgets] = array('I', totals)
+        return table
+
+    def _load_or_build(self):
+        if self.difficulty is None:
+            return None
+        path = self.table_path
+        expected = 4 * self.size * self.size * (self.max_attempts + 1)
+        if os.path.exists(path) and os.path.getsize(path) == expected:
+            with open(path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return memoryview(self._mmap).cast('I')
+        table = self._build()
+        try:
+            os.makedirs(self.table_dir, exist_ok=True)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                table.tofile(f)
+            os.replace(tmp_path, path)
+        except OSError:
+            print("Error saving solver table")
+        return table
+
+    # -- queries ------------------------------------------------------------
+
+    def win_probability(self, lo, hi, attempts_left, hint_available=False, hint=None):
+        """Chance of winning from here under optimal play.
+
+        hint is the text already received, if any; it narrows the
+        candidates inside [lo, hi] to the numbers that give that text.
+        """
+        count = self.candidate_count(lo, hi, hint)
+        if count <= 0:
+            return 0.0
+        if hint_available and hint is None and self.hint_wins is not None and attempts_left > 0:
+            wins = self.hint_wins[self._index(lo, hi, min(attempts_left, self.max_attempts))]
+            return max(wins / self.hint_types, max_wins(count, attempts_left)) / count
+        return max_wins(count, attempts_left) / count
+
+    def optimal_move(self, lo, hi, attempts_left, hint_available=False, hint=None):
+        """Return ('hint', None) or ('guess', number) for the current state"""
+        count = self.candidate_count(lo, hi, hint)
+        if count <= 0:
+            return ('guess', None)
+        if hint_available and hint is None and self.hint_wins is not None and attempts_left > 0:
+            wins = self.hint_wins[self._index(lo, hi, min(attempts_left, self.max_attempts))]
+            if wins > max_wins(count, attempts_left) * self.hint_types:
+                return ('hint', None)
+        if hint is None:
+            return ('guess', (lo + hi) // 2)
+        # Median of the numbers in [lo, hi] that match the hint
+        prefix = self._prefix[hint]
+        first = prefix[lo - self.low]
+        last = prefix[hi - self.low + 1]
+        return ('guess', self._positions[hint][(first + last - 1) // 2])
+
+    def candidate_count(self, lo, hi, hint=None):
+        lo = max(lo, self.low)
+        hi = min(hi, self.high)
+        if lo > hi:
+            return 0
+        if hint is None:
+            return hi - lo + 1
+        prefix = self._prefix.get(hint)
+        if prefix is None:
+            return 0
+        return prefix[hi - self.low + 1] - prefix[lo - self.low]
+
+
+def get_solver(low, high, max_attempts, difficulty=None, hint_names=None, hint_policy='random'):
+    """Shared Solver per configuration, built or loaded on first use"""
+    hint_names = tuple(hint_names) if hint_names else None
+    key = (low, high, max_attempts, difficulty, hint_names, hint_policy)
+    if key not in _solvers:
+        _solvers[key] = Solver(low, high, max_attempts, difficulty,
+                               hint_names=hint_names, hint_policy=hint_policy)
+    return _solvers[key]
+
+
+def precompute_all():
+    """Build tables for every game mode and difficulty"""
+    for mode in GAME_MODES.values():
+        low, high = mode['range']
+        for difficulty, attempts in DIFFICULTY_ATTEMPTS.items():
+            get_solver(low, high, attempts, difficulty)
+
+
+def main():
+    if len(sys.argv) > 1:
+        low, high, attempts = (int(arg) for arg in sys.argv[1:4])
+        difficulty = sys.argv[4] if len(sys.argv) > 4 else 'hard'
+        configs = [(low, high, attempts, difficulty)]
+    else:
+        configs = [(1, 20, attempts, difficulty) for difficulty, attempts in DIFFICULTY_ATTEMPTS.items()]
+
+    for low, high, attempts, difficulty in configs:
+        start = time.perf_counter()
+        solver = get_solver(low, high, attempts, difficulty)
+        duration = time.perf_counter() - start
+        print(f"{low}-{high}, {attempts} attempts, {difficulty} hints (ready in {duration:.2f}s):")
+        print(f"  win probability without hint: {solver.win_probability(low, high, attempts):.3f}")
+        print(f"  win probability with hint:     {solver.win_probability(low, high, attempts, True):.3f}")
+        print(f"  optimal first move:            {solver.optimal_move(low, high, attempts, True)}")
+
+
+if __name__ == "__main__":
+    main()
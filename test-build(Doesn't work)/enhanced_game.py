@@ -11,6 +11,22 @@ import warnings
 from tkinter import messagebox
 from math import sin, pi
 import uuid
+import sys
+from collections import OrderedDict
+
+# Shared modules (animation scheduler) live in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from animation import get_scheduler
+from history_archive import HistoryArchive
+try:
+    import sqlite3
+    from history_db import SQLiteStatsManager
+except ImportError:
+    # Python built without sqlite3: keep history in the JSON file
+    sqlite3 = None
+    SQLiteStatsManager = None
+import lazy_viz
 
 # Suppress all warnings
 warnings.filterwarnings("ignore")
@@ -18,37 +34,57 @@ warnings.filterwarnings("ignore")
 # Game history file
 HISTORY_FILE = "game_history.json"
 
-# Flag for visualization support - check environment variable
-USE_VISUALIZATION = False
-if os.environ.get("USE_VISUALIZATION", "0") != "0":
-    # Only attempt to import visualization libraries if explicitly enabled
-    try:
-        import matplotlib
-        matplotlib.use("TkAgg")
-        from matplotlib.figure import Figure
-        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-        import numpy as np
-        USE_VISUALIZATION = True
-        print("Visualization enabled")
-    except ImportError:
-        print("Visualization libraries not available. Running with simplified graphics.")
-else:
-    print("Visualization disabled by environment variable.")
+# Columnar archive of every game, for analytics
+ARCHIVE_DIR = "game_history_archive"
 
-# Try to import visualization libraries anyway for optional use
+# Flag for visualization support - check environment variable.
+# Plotting libraries are imported lazily by lazy_viz the first time a chart
+# is shown, so they never slow down startup.
+USE_VISUALIZATION = os.environ.get("USE_VISUALIZATION", "0") != "0"
 if not USE_VISUALIZATION:
-    try:
-        import matplotlib
-        matplotlib.use("TkAgg")
-        from matplotlib.figure import Figure
-        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-        import numpy as np
-        # Don't set USE_VISUALIZATION to True here - we'll still use the text-based charts
-    except ImportError:
-        pass
+    print("Visualization disabled by environment variable.")
+
+# Gradient images kept for reuse, most recently used last
+GRADIENT_CACHE_SIZE = 16
+_gradient_cache = OrderedDict()
+
+# Pulse animation frame interval (ms)
+PULSE_FRAME_MS = 50
+
+# Resize events are coalesced for this long before the gradient is redrawn
+GRADIENT_RESIZE_DELAY = 60
+
+
+def gradient_image(widget, width, height, from_color, to_color):
+    """Vertical gradient as a PhotoImage, cached per size and colors"""
+    key = (width, height, from_color, to_color)
+    image = _gradient_cache.get(key)
+    if image is not None:
+        _gradient_cache.move_to_end(key)
+        return image
+
+    r1, g1, b1 = widget.winfo_rgb(from_color)
+    r2, g2, b2 = widget.winfo_rgb(to_color)
+    r_ratio = float(r2-r1) / height
+    g_ratio = float(g2-g1) / height
+    b_ratio = float(b2-b1) / height
+    rows = []
+    for y in range(height):
+        r = int(r1 + (r_ratio * y)) >> 8
+        g = int(g1 + (g_ratio * y)) >> 8
+        b = int(b1 + (b_ratio * y)) >> 8
+        rows.append(f"{{#{r:02x}{g:02x}{b:02x}}}")
+
+    # Render one pixel column, then stretch it to the full width in Tk
+    column = tk.PhotoImage(master=widget, width=1, height=height)
+    column.put(" ".join(rows))
+    image = column.zoom(width, 1)
+
+    _gradient_cache[key] = image
+    while len(_gradient_cache) > GRADIENT_CACHE_SIZE:
+        _gradient_cache.popitem(last=False)
+    return image
 
-import uuid
-from math import sin, pi
 
 class GradientFrame(tk.Canvas):
     """A frame with gradient background"""
@@ -58,28 +94,39 @@ class GradientFrame(tk.Canvas):
         self._to_color = to_color
         self._width = width or parent.winfo_screenwidth()
         self._height = height or parent.winfo_screenheight()
+        self._image = None
+        self._drawn_size = None
+        self._redraw_job = None
         self.configure(width=self._width, height=self._height)
-        self.bind("<Configure>", self._draw_gradient)
+        self.bind("<Configure>", self._on_configure)
+        
+    def _on_configure(self, event):
+        """Redraw once a burst of resize events has settled"""
+        if (event.width, event.height) == self._drawn_size:
+            return
+        if self._image is None:
+            # First layout: draw straight away so the page never shows blank
+            self._draw_gradient()
+            return
+        if self._redraw_job is not None:
+            self.after_cancel(self._redraw_job)
+        self._redraw_job = self.after(GRADIENT_RESIZE_DELAY, self._draw_gradient)
         
     def _draw_gradient(self, event=None):
         """Draw the gradient background"""
-        self.delete("gradient")
+        self._redraw_job = None
         width = self.winfo_width()
         height = self.winfo_height()
+        if width <= 1 or height <= 1 or (width, height) == self._drawn_size:
+            return
         
-        # Parse colors
-        r1, g1, b1 = self.winfo_rgb(self._from_color)
-        r2, g2, b2 = self.winfo_rgb(self._to_color)
-        r_ratio = float(r2-r1) / height
-        g_ratio = float(g2-g1) / height
-        b_ratio = float(b2-b1) / height
-
-        for y in range(height):
-            r = int(r1 + (r_ratio * y)) >> 8
-            g = int(g1 + (g_ratio * y)) >> 8
-            b = int(b1 + (b_ratio * y)) >> 8
-            color = f"#{r:02x}{g:02x}{b:02x}"
-            self.create_line(0, y, width, y, tags=("gradient",), fill=color)
+        # Keep a reference: the cache may evict the image while it is shown
+        self._image = gradient_image(self, width, height, self._from_color, self._to_color)
+        self._drawn_size = (width, height)
+        if self.find_withtag("gradient"):
+            self.itemconfigure("gradient", image=self._image)
+        else:
+            self.create_image(0, 0, anchor="nw", image=self._image, tags=("gradient",))
         self.lower("gradient")
 
 class PulsatingText(tk.Label):
@@ -87,87 +134,165 @@ class PulsatingText(tk.Label):
     def __init__(self, master=None, **kwargs):
         super().__init__(master, **kwargs)
         self._pulsating = False
-        self._original_font = kwargs.get('font', ('Helvetica', 12))
-        self._pulse_step = 0
+        self._task = None
+        self._font_family, self._font_size = self._parse_font(kwargs.get('font', ('Helvetica', 12)))
+        self._current_size = None
+        self._pulse_start = 0.0
         self._original_fg = self.cget("fg")
-        self._pulse()
+        
+    @staticmethod
+    def _parse_font(font):
+        """Split a font spec into (family, size), once per widget"""
+        if isinstance(font, str):
+            # Try to parse font string like "Helvetica 12"
+            parts = font.split()
+            if len(parts) >= 2 and parts[-1].isdigit():
+                return ' '.join(parts[:-1]), int(parts[-1])
+        elif len(font) >= 2:
+            # Handle tuple/list format like ("Helvetica", 12)
+            return font[0], font[1]
+        # Default if can't parse
+        return "Helvetica", 12
         
     def start_pulsating(self):
         if not self._pulsating:
             self._pulsating = True
-            self._pulse()
+            self._pulse_start = time.perf_counter()
+            self._task = get_scheduler(self).add(self._pulse, PULSE_FRAME_MS, widget=self)
             
     def stop_pulsating(self):
         self._pulsating = False
+        if self._task is not None:
+            get_scheduler(self).remove(self._task)
+            self._task = None
         
-    def _pulse(self):
+    def _pulse(self, now):
         if not self._pulsating:
-            return
-        
-        # Get font properties
-        if isinstance(self._original_font, str):
-            # Try to parse font string like "Helvetica 12"
-            parts = self._original_font.split()
-            if len(parts) >= 2 and parts[-1].isdigit():
-                font_family = ' '.join(parts[:-1])
-                font_size = int(parts[-1])
-            else:
-                # Default if can't parse
-                font_family = "Helvetica"
-                font_size = 12
+            return False
+        
+        # Calculate size based on sine wave; the phase follows the clock so
+        # skipped frames do not slow the animation down
+        step = (now - self._pulse_start) / (PULSE_FRAME_MS / 1000) * 0.1
+        size_change = int(math.sin(step) * 2)
+        new_size = max(self._font_size + size_change, self._font_size - 2)
+        
+        # Only touch Tk when the rendered size actually changes
+        if new_size != self._current_size:
+            self._current_size = new_size
+            self.configure(font=(self._font_family, new_size))
+
+class StatsAggregator:
+    """Running totals for game statistics, updated once per game"""
+    def __init__(self):
+        self.totals = self._empty_bucket()
+        self.difficulties = {}
+        self.current_streak = 0
+        self.best_streak = 0
+        self.win_attempts = {}
+
+    @staticmethod
+    def _empty_bucket():
+        return {"games_played": 0, "games_won": 0, "won_attempts": 0}
+
+    def add(self, game):
+        """Fold one game into the totals"""
+        won = bool(game["won"])
+        difficulty = str(game["difficulty"])
+        bucket = self.difficulties.setdefault(difficulty, self._empty_bucket())
+        for target in (self.totals, bucket):
+            target["games_played"] += 1
+            if won:
+                target["games_won"] += 1
+                target["won_attempts"] += game["attempts_used"]
+        if won:
+            self.current_streak += 1
+            self.best_streak = max(self.best_streak, self.current_streak)
+            attempts = str(game["attempts_used"])
+            self.win_attempts[attempts] = self.win_attempts.get(attempts, 0) + 1
         else:
-            # Handle tuple/list format like ("Helvetica", 12)
-            if len(self._original_font) >= 2:
-                font_family = self._original_font[0]
-                font_size = self._original_font[1]
-            else:
-                font_family = "Helvetica"
-                font_size = 12
-            
-        # Calculate size based on sine wave
-        self._pulse_step += 0.1
-        size_change = int(math.sin(self._pulse_step) * 2)
-        new_size = max(font_size + size_change, font_size - 2)
-        
-        # Update font
-        self.configure(font=(font_family, new_size))
-        
-        # Schedule next pulse
-        self.after(50, self._pulse)
+            self.current_streak = 0
+
+    @staticmethod
+    def summary(bucket):
+        games_played = bucket["games_played"]
+        games_won = bucket["games_won"]
+        win_percentage = (games_won / games_played) * 20 if games_played > 0 else 0
+        avg_attempts = bucket["won_attempts"] / games_won if games_won else 0
+        return {
+            "games_played": games_played,
+            "games_won": games_won,
+            "win_percentage": round(win_percentage, 1),
+            "avg_attempts": round(avg_attempts, 1)
+        }
+
+    def to_dict(self):
+        return {
+            "totals": self.totals,
+            "difficulties": self.difficulties,
+            "current_streak": self.current_streak,
+            "best_streak": self.best_streak,
+            "win_attempts": self.win_attempts
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregator = cls()
+        aggregator.totals = data["totals"]
+        aggregator.difficulties = data["difficulties"]
+        aggregator.current_streak = data["current_streak"]
+        aggregator.best_streak = data["best_streak"]
+        aggregator.win_attempts = data["win_attempts"]
+        return aggregator
 
 class StatsManager:
-    """Manage game statistics and history"""
-    def __init__(self, history_file=HISTORY_FILE):
+    """Manage game statistics and history
+
+    The history file holds the recent games plus running aggregates over
+    every game played, so stats queries never walk the history. Files in
+    the old format (a bare list of games) are upgraded on load. Given a
+    HistoryArchive, every game is also appended to it.
+    """
+    def __init__(self, history_file=HISTORY_FILE, archive=None):
         self.history_file = history_file
+        self.archive = archive
+        self.aggregator = StatsAggregator()
         self.history = self._load_history()
         
     def _load_history(self):
-        """Load game history from file"""
+        """Load game history and aggregates from file"""
         if os.path.exists(self.history_file):
             try:
                 with open(self.history_file, 'r') as f:
                     data = json.load(f)
                     
+                games = data["history"] if isinstance(data, dict) else data
+                
                 # Validate each game entry has required fields
                 valid_entries = []
-                for game in data:
+                for game in games:
                     if isinstance(game, dict) and all(key in game for key in ["difficulty", "attempts_used", "won"]):
                         valid_entries.append(game)
                 
+                if isinstance(data, dict) and "aggregates" in data:
+                    self.aggregator = StatsAggregator.from_dict(data["aggregates"])
+                else:
+                    for game in valid_entries:
+                        self.aggregator.add(game)
+                
                 return valid_entries
             except:
                 return []
         return []
     
     def save_history(self):
-        """Save game history to file"""
+        """Save game history and aggregates to file"""
         try:
             with open(self.history_file, 'w') as f:
-                json.dump(self.history, f)
+                json.dump({"history": self.history, "aggregates": self.aggregator.to_dict()}, f)
         except:
             print("Error saving game history")
     
-    def add_game(self, difficulty, attempts_used, won, number=None):
+    def add_game(self, difficulty, attempts_used, won, number=None, **details):
         """Add a game to history"""
         game = {
             "difficulty": difficulty,
@@ -177,6 +302,12 @@ class StatsManager:
             "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         self.history.append(game)
+        self.aggregator.add(game)
+        if self.archive is not None:
+            self.archive.append(difficulty, attempts_used, won, number=number,
+                                mode=details.get("mode", "classic"),
+                                score=details.get("score", 0),
+                                duration=details.get("duration", 0.0))
         
         # Keep only recent 20 games
         if len(self.history) > 20:
@@ -186,73 +317,26 @@ class StatsManager:
     
     def get_stats(self):
         """Get overall game statistics"""
-        if not self.history:
-            return {
-                "games_played": 0,
-                "games_won": 0,
-                "win_percentage": 0,
-                "avg_attempts": 0,
-                "best_streak": 0,
-                "current_streak": 0
-            }
-        
-        games_played = len(self.history)
-        games_won = sum(1 for game in self.history if game["won"])
-        win_percentage = (games_won / games_played) * 20 if games_played > 0 else 0
-        
-        attempts_in_wins = [game["attempts_used"] for game in self.history if game["won"]]
-        avg_attempts = sum(attempts_in_wins) / len(attempts_in_wins) if attempts_in_wins else 0
-        
-        # Calculate streaks
-        current_streak = 0
-        best_streak = 0
-        streak = 0
-        
-        for game in reversed(self.history):
-            if game["won"]:
-                streak += 1
-            else:
-                streak = 0
-                
-            if streak > best_streak:
-                best_streak = streak
-                
-        current_streak = streak
-        
-        return {
-            "games_played": games_played,
-            "games_won": games_won,
-            "win_percentage": round(win_percentage, 1),
-            "avg_attempts": round(avg_attempts, 1),
-            "best_streak": best_streak,
-            "current_streak": current_streak
-        }
+        stats = StatsAggregator.summary(self.aggregator.totals)
+        stats["best_streak"] = self.aggregator.best_streak
+        stats["current_streak"] = self.aggregator.current_streak
+        return stats
         
     def get_difficulty_stats(self, difficulty):
         """Get statistics for a specific difficulty"""
-        difficulty_games = [game for game in self.history if game["difficulty"] == difficulty]
-        
-        if not difficulty_games:
-            return {
-                "games_played": 0,
-                "games_won": 0,
-                "win_percentage": 0,
-                "avg_attempts": 0
-            }
-            
-        games_played = len(difficulty_games)
-        games_won = sum(1 for game in difficulty_games if game["won"])
-        win_percentage = (games_won / games_played) * 20 if games_played > 0 else 0
-        
-        attempts_in_wins = [game["attempts_used"] for game in difficulty_games if game["won"]]
-        avg_attempts = sum(attempts_in_wins) / len(attempts_in_wins) if attempts_in_wins else 0
-        
-        return {
-            "games_played": games_played,
-            "games_won": games_won,
-            "win_percentage": round(win_percentage, 1),
-            "avg_attempts": round(avg_attempts, 1)
-        }
+        bucket = self.aggregator.difficulties.get(str(difficulty))
+        return StatsAggregator.summary(bucket or StatsAggregator._empty_bucket())
+
+    def has_games(self):
+        return bool(self.history)
+
+    def recent_games(self, limit=10):
+        """Most recent games first"""
+        return list(reversed(self.history[-limit:]))
+
+    def attempts_distribution(self):
+        """{attempts_used: games} over won games"""
+        return {int(attempts): count for attempts, count in self.aggregator.win_attempts.items()}
 
 class Timer:
     """A simple timer class to track elapsed time."""
@@ -292,6 +376,53 @@ class Timer:
             return 0
         return time.time() - self.start_time
 
+class PageManager:
+    """Builds each page once and switches pages by packing and unpacking them.
+
+    With recycle=False a page is destroyed when it is hidden and rebuilt on
+    the next visit, which is how page switches used to work; the page-switch
+    benchmark uses it as the baseline.
+    """
+    def __init__(self, root, recycle=True):
+        self.root = root
+        self.recycle = recycle
+        self.pages = {}
+        self.frames = {}
+        self.current = None
+        
+    def register(self, name, build, refresh=None, on_hide=None):
+        """build() creates the page and returns its top-level widget;
+        refresh() updates it each time it is shown"""
+        self.pages[name] = (build, refresh, on_hide)
+        
+    def show(self, name):
+        if self.current is not None and self.current != name:
+            self.hide(self.current)
+        build, refresh, on_hide = self.pages[name]
+        frame = self.frames.get(name)
+        if frame is None or not frame.winfo_exists():
+            frame = build()
+            self.frames[name] = frame
+        if refresh:
+            refresh()
+        frame.pack(fill="both", expand=True)
+        self.current = name
+        return frame
+        
+    def hide(self, name):
+        build, refresh, on_hide = self.pages[name]
+        if on_hide:
+            on_hide()
+        frame = self.frames.get(name)
+        if frame is not None:
+            if self.recycle:
+                frame.pack_forget()
+            else:
+                frame.destroy()
+                del self.frames[name]
+        if self.current == name:
+            self.current = None
+
 class EnhancedNumberGame:
     """Enhanced number guessing game with improved UI and animations"""
     DIFFICULTY_LEVELS = {
@@ -303,7 +434,7 @@ class EnhancedNumberGame:
     def __init__(self, root):
         self.root = root
         self.root.title("Guess the Number")
-        self.stats_manager = StatsManager()
+        self.stats_manager = self._create_stats_manager()
         self.current_game_id = None
         self.level = 1
         self.difficulty = "easy"
@@ -358,19 +489,37 @@ class EnhancedNumberGame:
                        foreground="#ecf0f1", 
                        font=("Helvetica", 11))
         
-        # Main container
-        self.main_frame = GradientFrame(root, from_color="#2c3e50", to_color="#1a2530")
-        self.main_frame.pack(fill="both", expand=True)
-        
-        # Create frames for home and game
-        self.home_frame = ttk.Frame(self.main_frame)
-        self.game_frame = ttk.Frame(self.main_frame)
-        
-        # Set up home page only initially, we'll set up game page when needed
-        self._setup_home_page()
+        # Pages are built on first visit and reused afterwards
+        self.pages = PageManager(root)
+        self.pages.register("home", self._build_home_page, self._refresh_home_page,
+                            lambda: self.home_title.stop_pulsating())
+        self.pages.register("game", self._build_game_page, self._refresh_game_page)
+        self.pages.register("result", self._build_result_page, self._refresh_result_page)
+        self.pages.register("welcome", self._build_welcome_page, self._refresh_welcome_page,
+                            lambda: self.welcome_title.stop_pulsating())
+        self.pages.register("stats", self._build_stats_page, self._refresh_stats_page)
         
         # Show home page initially
         self.show_home_page()
+
+    def _create_stats_manager(self):
+        """SQLite history when available, otherwise the JSON history file"""
+        archive = HistoryArchive(ARCHIVE_DIR)
+        if SQLiteStatsManager is not None:
+            try:
+                return SQLiteStatsManager(archive=archive)
+            except sqlite3.Error:
+                print("Error opening game history database, using the JSON history file")
+        return StatsManager(archive=archive)
+
+    def _build_home_page(self):
+        """Create the home page container"""
+        # Main container
+        self.main_frame = GradientFrame(self.root, from_color="#2c3e50", to_color="#1a2530")
+        self.home_frame = ttk.Frame(self.main_frame)
+        self._setup_home_page()
+        self.home_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        return self.main_frame
         
     def _setup_home_page(self):
         """Set up the home page interface"""
@@ -387,7 +536,7 @@ class EnhancedNumberGame:
             background="#2c3e50"
         )
         title_label.pack(pady=10)
-        title_label.start_pulsating()
+        self.home_title = title_label
         
         # Subtitle
         subtitle_label = ttk.Label(
@@ -439,9 +588,7 @@ class EnhancedNumberGame:
         # Stats display
         self.stats_display = ttk.Frame(stats_frame)
         self.stats_display.pack(fill="both", expand=True, padx=20)
-        
-        # Update stats display
-        self._update_stats_display()
+        self._build_stats_display()
         
         # Instructions
         instructions_frame = ttk.Frame(self.home_frame)
@@ -472,12 +619,67 @@ class EnhancedNumberGame:
 
     def _update_stats_display(self):
         """Update statistics display on home page with visual charts"""
-        # Clear existing stats
-        for widget in self.stats_display.winfo_children():
-            widget.destroy()
+        # The widgets are created with the page; updates only change their values
+        widgets = self.home_stats
         
         # Get overall stats
         stats = self.stats_manager.get_stats()
+        for key, var in widgets["summary"].items():
+            value = stats[key]
+            var.set(f"{value}%" if key == "win_percentage" else str(value))
+        
+        # Difficulty-specific stats
+        for diff_id, row_vars in widgets["difficulty"].items():
+            level_stats = self.stats_manager.get_difficulty_stats(diff_id)
+            row_vars[0].set(str(level_stats["games_played"]))
+            row_vars[1].set(str(level_stats["games_won"]))
+            row_vars[2].set(f"{level_stats['win_percentage']}%")
+            row_vars[3].set(str(level_stats["avg_attempts"]))
+        
+        # Recent games history
+        if self.stats_manager.has_games():
+            widgets["history_label"].pack(pady=(20, 5))
+            widgets["history_frame"].pack(fill="both", expand=True, padx=20, pady=5)
+            # Show last 10 games, most recent first
+            recent_games = self.stats_manager.recent_games(10)
+        else:
+            widgets["history_label"].pack_forget()
+            widgets["history_frame"].pack_forget()
+            recent_games = []
+        
+        for i, row in enumerate(widgets["history_rows"]):
+            if i >= len(recent_games):
+                for label in row:
+                    label.configure(text="")
+                continue
+            game = recent_games[i]
+            
+            # Difficulty
+            diff_text = game.get("difficulty", "Unknown")
+            if isinstance(diff_text, int):
+                diff_text = f"Level {diff_text}"
+            elif isinstance(diff_text, str):
+                diff_text = diff_text.capitalize()
+            
+            # Result
+            result_text = "Won" if game.get("won", False) else "Lost"
+            result_color = "#2ecc71" if game.get("won", False) else "#e74c3c"
+            
+            row[0].configure(text=game.get("date", "Unknown").split()[0])  # Just date part
+            row[1].configure(text=diff_text)
+            row[2].configure(text=str(game.get("number", "?")))
+            row[3].configure(text=str(game.get("attempts_used", "?")))
+            row[4].configure(text=result_text, foreground=result_color)
+        
+        # Charts are rebuilt from the new data the next time they are viewed
+        widgets["charts_stale"] = True
+        if widgets["notebook"].select() == str(widgets["charts_tab"]):
+            self._refresh_charts()
+
+    def _build_stats_display(self):
+        """Create the home page statistics widgets"""
+        widgets = {"summary": {}, "difficulty": {}, "history_rows": [], "charts_stale": True}
+        self.home_stats = widgets
         
         # Create main stats container with tabs
         tab_frame = ttk.Frame(self.stats_display)
@@ -486,6 +688,7 @@ class EnhancedNumberGame:
         # Create notebook (tabbed interface)
         notebook = ttk.Notebook(tab_frame)
         notebook.pack(fill="both", expand=True)
+        widgets["notebook"] = notebook
         
         # === Summary Tab ===
         summary_tab = ttk.Frame(notebook)
@@ -497,16 +700,16 @@ class EnhancedNumberGame:
         
         # Stats columns
         stat_columns = [
-            ("Games Played", stats["games_played"]),
-            ("Games Won", stats["games_won"]),
-            ("Win Rate", f"{stats['win_percentage']}%"),
-            ("Avg Attempts", stats["avg_attempts"]),
-            ("Best Streak", stats["best_streak"]),
-            ("Current Streak", stats["current_streak"])
+            ("Games Played", "games_played"),
+            ("Games Won", "games_won"),
+            ("Win Rate", "win_percentage"),
+            ("Avg Attempts", "avg_attempts"),
+            ("Best Streak", "best_streak"),
+            ("Current Streak", "current_streak")
         ]
         
         # Create stat boxes
-        for i, (label, value) in enumerate(stat_columns):
+        for i, (label, key) in enumerate(stat_columns):
             stat_frame = ttk.Frame(overall_frame, style="TFrame")
             stat_frame.grid(row=i//3, column=i%3, padx=10, pady=5, sticky="nsew")
             
@@ -518,9 +721,10 @@ class EnhancedNumberGame:
                 background="#2c3e50"
             ).pack(pady=(5, 0))
             
+            widgets["summary"][key] = tk.StringVar()
             ttk.Label(
                 stat_frame,
-                text=str(value),
+                textvariable=widgets["summary"][key],
                 font=("Helvetica", 16, "bold"),
                 foreground="#e74c3c",
                 background="#2c3e50"
@@ -533,14 +737,128 @@ class EnhancedNumberGame:
         # === Charts Tab ===
         charts_tab = ttk.Frame(notebook)
         notebook.add(charts_tab, text="Performance")
+        widgets["charts_tab"] = charts_tab
+        
+        # Charts are built (and plotting libraries imported) only when the
+        # Performance tab is opened
+        def on_tab_changed(event):
+            if notebook.select() == str(charts_tab) and widgets["charts_stale"]:
+                self._refresh_charts()
+        notebook.bind("<<NotebookTabChanged>>", on_tab_changed)
+        
+        # === Table Tab ===
+        table_tab = ttk.Frame(notebook)
+        notebook.add(table_tab, text="Details")
+        
+        # Add difficulty-specific stats
+        difficulties_frame = ttk.Frame(table_tab)
+        difficulties_frame.pack(fill="x", pady=10, padx=10)
+        
+        ttk.Label(
+            difficulties_frame,
+            text="STATS BY DIFFICULTY",
+            font=("Helvetica", 12, "bold"),
+            foreground="#3498db",
+            background="#2c3e50"
+        ).pack(pady=(10, 5))
         
+        # Stats table
+        table_frame = ttk.Frame(difficulties_frame)
+        table_frame.pack(fill="x", padx=20, pady=5)
+        
+        # Table headers
+        headers = ["Level", "Games", "Won", "Win Rate", "Avg Attempts"]
+        for i, header in enumerate(headers):
+            ttk.Label(
+                table_frame,
+                text=header,
+                font=("Helvetica", 11, "bold"),
+                foreground="#ecf0f1",
+                background="#2c3e50"
+            ).grid(row=0, column=i, padx=5, pady=5, sticky="w")
+        
+        # Add a row for each difficulty
+        difficulties = ["easy", "medium", "hard"]
+        difficulty_names = ["Easy", "Medium", "Hard"]
+        
+        for i, (diff_id, diff_name) in enumerate(zip(difficulties, difficulty_names)):
+            ttk.Label(
+                table_frame,
+                text=diff_name,
+                foreground="#ecf0f1",
+                background="#2c3e50"
+            ).grid(row=i+1, column=0, padx=5, pady=2, sticky="w")
+            
+            row_vars = [tk.StringVar() for _ in range(4)]
+            for column, var in enumerate(row_vars, 1):
+                ttk.Label(
+                    table_frame,
+                    textvariable=var,
+                    foreground="#ecf0f1",
+                    background="#2c3e50"
+                ).grid(row=i+1, column=column, padx=5, pady=2, sticky="w")
+            widgets["difficulty"][diff_id] = row_vars
+        
+        # Recent games history, shown once there are games
+        widgets["history_label"] = ttk.Label(
+            table_tab,
+            text="RECENT GAMES",
+            font=("Helvetica", 12, "bold"),
+            foreground="#3498db",
+            background="#2c3e50"
+        )
+        
+        # Create history table
+        history_frame = ttk.Frame(table_tab)
+        widgets["history_frame"] = history_frame
+        
+        # History headers
+        history_headers = ["Date", "Difficulty", "Number", "Attempts", "Result"]
+        for i, header in enumerate(history_headers):
+            ttk.Label(
+                history_frame,
+                text=header,
+                font=("Helvetica", 10, "bold"),
+                foreground="#ecf0f1",
+                background="#2c3e50"
+            ).grid(row=0, column=i, padx=5, pady=5, sticky="w")
+        
+        # Room for the last 10 games
+        for i in range(10):
+            row = []
+            for column in range(5):
+                label = ttk.Label(
+                    history_frame,
+                    foreground="#ecf0f1",
+                    background="#2c3e50",
+                    font=("Helvetica", 9, "bold") if column == 4 else ("Helvetica", 9)
+                )
+                label.grid(row=i+1, column=column, padx=5, pady=2, sticky="w")
+                row.append(label)
+            widgets["history_rows"].append(row)
+
+    def _refresh_charts(self):
+        """Rebuild the Performance tab from the current stats"""
+        charts_tab = self.home_stats["charts_tab"]
+        for widget in charts_tab.winfo_children():
+            widget.destroy()
+        self._build_charts(charts_tab)
+        self.home_stats["charts_stale"] = False
+
+    def _build_charts(self, charts_tab):
+        """Fill the Performance tab with charts"""
         # Create figures only if we have game history
-        if self.stats_manager.history:
+        if self.stats_manager.has_games():
             # Create a frame to hold charts
             charts_frame = ttk.Frame(charts_tab)
             charts_frame.pack(fill="both", expand=True, padx=5, pady=5)
             
-            if USE_VISUALIZATION:
+            viz = lazy_viz.load() if USE_VISUALIZATION else None
+            if viz is not None:
+                Figure = viz.Figure
+                FigureCanvasTkAgg = viz.FigureCanvasTkAgg
+                matplotlib = viz.matplotlib
+                
                 # === Win Rate by Difficulty Chart ===
                 # Set up left chart - Win rate by difficulty
                 try:
@@ -586,18 +904,9 @@ class EnhancedNumberGame:
                     fig2 = Figure(figsize=(4, 3), dpi=20)
                     ax2 = fig2.add_subplot(111)
                     
-                    # Filter to only won games to analyze attempts
-                    won_games = [game for game in self.stats_manager.history if game['won']]
-                    if won_games:
-                        # Prepare data
-                        attempts_data = {}
-                        for game in won_games:
-                            attempts = game['attempts_used']
-                            if attempts in attempts_data:
-                                attempts_data[attempts] += 1
-                            else:
-                                attempts_data[attempts] = 1
-                        
+                    # Attempts used in won games
+                    attempts_data = self.stats_manager.attempts_distribution()
+                    if attempts_data:
                         # Convert to lists for plotting
                         attempts_counts = list(attempts_data.keys())
                         game_counts = list(attempts_data.values())
@@ -664,164 +973,6 @@ class EnhancedNumberGame:
                 justify="center"
             )
             no_data_label.place(relx=0.5, rely=0.5, anchor="center")
-        
-        # === Table Tab ===
-        table_tab = ttk.Frame(notebook)
-        notebook.add(table_tab, text="Details")
-        
-        # Add difficulty-specific stats
-        difficulties_frame = ttk.Frame(table_tab)
-        difficulties_frame.pack(fill="x", pady=10, padx=10)
-        
-        ttk.Label(
-            difficulties_frame,
-            text="STATS BY DIFFICULTY",
-            font=("Helvetica", 12, "bold"),
-            foreground="#3498db",
-            background="#2c3e50"
-        ).pack(pady=(10, 5))
-        
-        # Stats table
-        table_frame = ttk.Frame(difficulties_frame)
-        table_frame.pack(fill="x", padx=20, pady=5)
-        
-        # Table headers
-        headers = ["Level", "Games", "Won", "Win Rate", "Avg Attempts"]
-        for i, header in enumerate(headers):
-            ttk.Label(
-                table_frame,
-                text=header,
-                font=("Helvetica", 11, "bold"),
-                foreground="#ecf0f1",
-                background="#2c3e50"
-            ).grid(row=0, column=i, padx=5, pady=5, sticky="w")
-        
-        # Add data for each difficulty
-        difficulties = ["easy", "medium", "hard"]
-        difficulty_names = ["Easy", "Medium", "Hard"]
-        
-        for i, (diff_id, diff_name) in enumerate(zip(difficulties, difficulty_names)):
-            level_stats = self.stats_manager.get_difficulty_stats(diff_id)
-            
-            ttk.Label(
-                table_frame,
-                text=diff_name,
-                foreground="#ecf0f1",
-                background="#2c3e50"
-            ).grid(row=i+1, column=0, padx=5, pady=2, sticky="w")
-            
-            ttk.Label(
-                table_frame,
-                text=str(level_stats["games_played"]),
-                foreground="#ecf0f1",
-                background="#2c3e50"
-            ).grid(row=i+1, column=1, padx=5, pady=2, sticky="w")
-            
-            ttk.Label(
-                table_frame,
-                text=str(level_stats["games_won"]),
-                foreground="#ecf0f1",
-                background="#2c3e50"
-            ).grid(row=i+1, column=2, padx=5, pady=2, sticky="w")
-            
-            ttk.Label(
-                table_frame,
-                text=f"{level_stats['win_percentage']}%",
-                foreground="#ecf0f1",
-                background="#2c3e50"
-            ).grid(row=i+1, column=3, padx=5, pady=2, sticky="w")
-            
-            ttk.Label(
-                table_frame,
-                text=str(level_stats["avg_attempts"]),
-                foreground="#ecf0f1",
-                background="#2c3e50"
-            ).grid(row=i+1, column=4, padx=5, pady=2, sticky="w")
-        
-        # Recent games history
-        if self.stats_manager.history:
-            history_label = ttk.Label(
-                table_tab,
-                text="RECENT GAMES",
-                font=("Helvetica", 12, "bold"),
-                foreground="#3498db",
-                background="#2c3e50"
-            )
-            history_label.pack(pady=(20, 5))
-            
-            # Create history table
-            history_frame = ttk.Frame(table_tab)
-            history_frame.pack(fill="both", expand=True, padx=20, pady=5)
-            
-            # History headers
-            history_headers = ["Date", "Difficulty", "Number", "Attempts", "Result"]
-            for i, header in enumerate(history_headers):
-                ttk.Label(
-                    history_frame,
-                    text=header,
-                    font=("Helvetica", 10, "bold"),
-                    foreground="#ecf0f1",
-                    background="#2c3e50"
-                ).grid(row=0, column=i, padx=5, pady=5, sticky="w")
-            
-            # Show last 10 games
-            recent_games = self.stats_manager.history[-10:] if len(self.stats_manager.history) > 10 else self.stats_manager.history
-            recent_games.reverse()  # Show most recent first
-            
-            for i, game in enumerate(recent_games):
-                # Date
-                ttk.Label(
-                    history_frame,
-                    text=game.get("date", "Unknown").split()[0],  # Just date part
-                    foreground="#ecf0f1",
-                    background="#2c3e50",
-                    font=("Helvetica", 9)
-                ).grid(row=i+1, column=0, padx=5, pady=2, sticky="w")
-                
-                # Difficulty
-                diff_text = game.get("difficulty", "Unknown")
-                if isinstance(diff_text, int):
-                    diff_text = f"Level {diff_text}"
-                elif isinstance(diff_text, str):
-                    diff_text = diff_text.capitalize()
-                    
-                ttk.Label(
-                    history_frame,
-                    text=diff_text,
-                    foreground="#ecf0f1",
-                    background="#2c3e50",
-                    font=("Helvetica", 9)
-                ).grid(row=i+1, column=1, padx=5, pady=2, sticky="w")
-                
-                # Number
-                ttk.Label(
-                    history_frame,
-                    text=str(game.get("number", "?")),
-                    foreground="#ecf0f1",
-                    background="#2c3e50",
-                    font=("Helvetica", 9)
-                ).grid(row=i+1, column=2, padx=5, pady=2, sticky="w")
-                
-                # Attempts
-                ttk.Label(
-                    history_frame,
-                    text=str(game.get("attempts_used", "?")),
-                    foreground="#ecf0f1",
-                    background="#2c3e50",
-                    font=("Helvetica", 9)
-                ).grid(row=i+1, column=3, padx=5, pady=2, sticky="w")
-                
-                # Result
-                result_text = "Won" if game.get("won", False) else "Lost"
-                result_color = "#2ecc71" if game.get("won", False) else "#e74c3c"
-                
-                ttk.Label(
-                    history_frame,
-                    text=result_text,
-                    foreground=result_color,
-                    background="#2c3e50",
-                    font=("Helvetica", 9, "bold")
-                ).grid(row=i+1, column=4, padx=5, pady=2, sticky="w")
 
     def _create_text_based_charts(self, parent_frame):
         """Create text-based charts as a fallback when matplotlib is not available"""
@@ -891,18 +1042,9 @@ class EnhancedNumberGame:
             background="#2c3e50"
         ).pack(pady=(5, 10))
         
-        # Filter to only won games to analyze attempts
-        won_games = [game for game in self.stats_manager.history if game['won']]
-        if won_games:
-            # Prepare data
-            attempts_data = {}
-            for game in won_games:
-                attempts = game['attempts_used']
-                if attempts in attempts_data:
-                    attempts_data[attempts] += 1
-                else:
-                    attempts_data[attempts] = 1
-            
+        # Attempts used in won games
+        attempts_data = self.stats_manager.attempts_distribution()
+        if attempts_data:
             # Sort by attempts
             sorted_attempts = sorted(attempts_data.items())
             
@@ -1018,8 +1160,9 @@ class EnhancedNumberGame:
     def game_won(self):
         """Handle game win"""
         self.is_game_active = False
-        self.timer.stop()
+        # get_time() reads 0 once the timer is stopped
         time_taken = self.timer.get_time()
+        self.timer.stop()
         
         # Update message with pulsating effect
         self.feedback_var.set(f"Congratulations! You found the number: {self.target_number}")
@@ -1034,7 +1177,9 @@ class EnhancedNumberGame:
             difficulty=self.difficulty,
             attempts_used=attempts_used,
             won=True,
-            number=self.target_number
+            number=self.target_number,
+            guesses=self.history,
+            duration=time_taken
         )
         
         # Disable input and update button text
@@ -1044,6 +1189,7 @@ class EnhancedNumberGame:
     def game_lost(self):
         """Handle game loss"""
         self.is_game_active = False
+        time_taken = self.timer.get_time()
         self.timer.stop()
         
         # Update message
@@ -1057,7 +1203,9 @@ class EnhancedNumberGame:
             difficulty=self.difficulty,
             attempts_used=self.max_attempts,
             won=False,
-            number=self.target_number
+            number=self.target_number,
+            guesses=self.history,
+            duration=time_taken
         )
         
         # Disable input and update button text
@@ -1066,9 +1214,6 @@ class EnhancedNumberGame:
 
     def start_game(self, level=1):
         """Start a new game"""
-        # Hide home page and show game page
-        self.home_frame.pack_forget()
-        
         # Initialize game variables
         self.level = level
         self.difficulty = self.difficulty_var.get() if hasattr(self, 'difficulty_var') else "easy"
@@ -1099,26 +1244,43 @@ class EnhancedNumberGame:
 
     def show_home_page(self):
         """Show the home page"""
+        self.pages.show("home")
+        
+    def _refresh_home_page(self):
         # Stop the timer if it's running
         if hasattr(self, 'timer'):
             self.timer.stop()
             
-        # Hide game page and show home page
-        self.game_frame.pack_forget()
-        self.home_frame.pack(fill="both", expand=True, padx=20, pady=20)
-        
         # Update stats
         self._update_stats_display()
+        self.home_title.start_pulsating()
         
     def _setup_game_page(self):
-        """Set up the game page with input field, buttons and feedback labels."""
-        # Clear existing widgets
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        """Show the game page for a new round and start the timer."""
+        self.pages.show("game")
         
+        # Start the timer
+        self.timer = Timer()
+        self.timer.start()
+        self._update_timer()
+
+    def _refresh_game_page(self):
+        """Reset the game page widgets for a new round."""
+        self.game_difficulty_var.set(f"Difficulty: {self.difficulty.capitalize()}")
+        self.game_range_var.set(f"Range: {self.min_value} - {self.max_value}")
+        self.guess_var.set("")
+        self.feedback_var.set("Make your first guess!")
+        self.attempts_var.set(f"Attempts: {self.attempts}/{self.max_attempts}")
+        self.timer_var.set("Time: 00:00")
+        self.history_listbox.delete(0, tk.END)
+        self.guess_entry.config(state="normal")
+        self.submit_button.config(text="SUBMIT", bg="#4caf50")
+        self.guess_entry.focus()
+
+    def _build_game_page(self):
+        """Create the game page with input field, buttons and feedback labels."""
         # Create gradient background for game page
         self.game_frame = GradientFrame(self.root, from_color="#1a2a6c", to_color="#b21f1f")
-        self.game_frame.pack(fill="both", expand=True)
         
         # Create main content frame
         content_frame = tk.Frame(self.game_frame, bg="#2d3e6d", padx=20, pady=20)
@@ -1138,18 +1300,20 @@ class EnhancedNumberGame:
         info_frame = tk.Frame(content_frame, bg="#2d3e6d")
         info_frame.pack(pady=10)
         
+        self.game_difficulty_var = tk.StringVar()
         difficulty_label = tk.Label(
             info_frame,
-            text=f"Difficulty: {self.difficulty.capitalize()}",
+            textvariable=self.game_difficulty_var,
             font=("Helvetica", 12, "bold"),
             fg="#3498db",
             bg="#2d3e6d"
         )
         difficulty_label.pack(pady=2)
         
+        self.game_range_var = tk.StringVar()
         range_label = tk.Label(
             info_frame,
-            text=f"Range: {self.min_value} - {self.max_value}",
+            textvariable=self.game_range_var,
             font=("Helvetica", 12),
             fg="#ffffff",
             bg="#2d3e6d"
@@ -1178,7 +1342,6 @@ class EnhancedNumberGame:
             justify="center"
         )
         self.guess_entry.grid(row=0, column=1, padx=10)
-        self.guess_entry.focus()
         self.guess_entry.bind("<Return>", lambda event: self.check_guess())
         
         self.submit_button = tk.Button(
@@ -1196,7 +1359,6 @@ class EnhancedNumberGame:
         feedback_frame.pack(fill="x")
         
         self.feedback_var = tk.StringVar()
-        self.feedback_var.set("Make your first guess!")
         
         feedback_label = tk.Label(
             feedback_frame,
@@ -1213,7 +1375,6 @@ class EnhancedNumberGame:
         stats_frame.pack(fill="x")
         
         self.attempts_var = tk.StringVar()
-        self.attempts_var.set(f"Attempts: {self.attempts}/{self.max_attempts}")
         
         attempts_label = tk.Label(
             stats_frame,
@@ -1225,7 +1386,6 @@ class EnhancedNumberGame:
         attempts_label.pack(side="left", padx=20)
         
         self.timer_var = tk.StringVar()
-        self.timer_var.set("Time: 00:00")
         
         timer_label = tk.Label(
             stats_frame,
@@ -1285,16 +1445,19 @@ class EnhancedNumberGame:
         )
         quit_button.pack(side="right", padx=10)
         
-        # Start the timer
-        self.timer = Timer()
-        self.timer.start()
-        self._update_timer()
+        return self.game_frame
 
     def _update_timer(self):
-        """Update the timer display."""
-        if hasattr(self, 'timer') and self.timer.is_running:
+        """Update the timer display once a second from the animation scheduler."""
+        scheduler = get_scheduler(self.root)
+        scheduler.remove(getattr(self, '_timer_task', None))
+        
+        def tick(now):
+            if not (hasattr(self, 'timer') and self.timer.is_running):
+                return False
             self.timer_var.set(f"Time: {self.timer.get_formatted_time()}")
-            self.root.after(1000, self._update_timer)
+        if tick(None) is not False:
+            self._timer_task = scheduler.add(tick, 1000)
     
     def _check_guess(self):
         """Check the user's guess against the target number."""
@@ -1330,70 +1493,82 @@ class EnhancedNumberGame:
 
     def _show_result_page(self, won):
         """Show the result page with game statistics."""
-        # Clear the game page
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.last_game_won = won
+        self.pages.show("result")
         
-        # Create gradient background
-        result_frame = GradientFrame(self.root, "#2c3e50", "#4ca1af", width=600, height=500)
-        result_frame.pack(fill="both", expand=True)
-        
-        # Calculate statistics
-        time_taken = self.timer.get_formatted_time()
-        
-        # Create result content frame
-        content_frame = tk.Frame(result_frame, bg='#3a4c5f', bd=2, relief="ridge")
-        content_frame.place(relx=0.5, rely=0.5, anchor="center", width=450, height=380)
+    def _refresh_result_page(self):
+        """Fill the result page in for the game that just ended."""
+        won = self.last_game_won
         
         # Result title
         if won:
-            result_title = PulsatingText(
-                content_frame, 
-                text="CONGRATULATIONS!",
-                font=("Helvetica", 24, "bold"),
-                fg="#ffd700",
-                bg='#3a4c5f'
-            )
+            self.result_lost_title.pack_forget()
+            self.result_won_title.pack(pady=(30, 20), before=self.result_msg)
         else:
-            result_title = tk.Label(
-                content_frame, 
-                text="GAME OVER",
-                font=("Helvetica", 24, "bold"),
-                fg="#ff6b6b",
-                bg='#3a4c5f'
-            )
-        result_title.pack(pady=(30, 20))
+            self.result_won_title.pack_forget()
+            self.result_lost_title.pack(pady=(30, 20), before=self.result_msg)
         
         # Result message
         if won:
             msg = f"You guessed the number {self.target_number} correctly!"
         else:
             msg = f"The number was {self.target_number}."
+        self.result_msg.config(text=msg)
+        
+        # Calculate statistics
+        time_taken = self.timer.get_formatted_time()
+        stats_list = [
+            f"Difficulty: {self.difficulty.capitalize()}",
+            f"Number Range: {self.min_value} to {self.max_value}",
+            f"Attempts Used: {self.attempts} out of {self.max_attempts}",
+            f"Time Taken: {time_taken}"
+        ]
+        for var, stat in zip(self.result_stat_vars, stats_list):
+            var.set(stat)
+        
+    def _build_result_page(self):
+        """Create the result page."""
+        # Create gradient background
+        result_frame = GradientFrame(self.root, "#2c3e50", "#4ca1af", width=600, height=500)
         
-        result_msg = tk.Label(
+        # Create result content frame
+        content_frame = tk.Frame(result_frame, bg='#3a4c5f', bd=2, relief="ridge")
+        content_frame.place(relx=0.5, rely=0.5, anchor="center", width=450, height=380)
+        
+        # Result titles; the one matching the outcome is packed on refresh
+        self.result_won_title = PulsatingText(
+            content_frame, 
+            text="CONGRATULATIONS!",
+            font=("Helvetica", 24, "bold"),
+            fg="#ffd700",
+            bg='#3a4c5f'
+        )
+        self.result_lost_title = tk.Label(
+            content_frame, 
+            text="GAME OVER",
+            font=("Helvetica", 24, "bold"),
+            fg="#ff6b6b",
+            bg='#3a4c5f'
+        )
+        
+        # Result message
+        self.result_msg = tk.Label(
             content_frame,
-            text=msg,
             font=("Helvetica", 16),
             fg="#ffffff",
             bg='#3a4c5f'
         )
-        result_msg.pack(pady=10)
+        self.result_msg.pack(pady=10)
         
         # Statistics
         stats_frame = tk.Frame(content_frame, bg='#3a4c5f')
         stats_frame.pack(pady=20)
         
-        stats_list = [
-            f"Difficulty: {self.difficulty.capitalize()}",
-            f"Number Range: {self.min_value} to {self.max_value}",
-            f"Attempts Used: {self.attempts} out of {self.max_attempts}",
-            f"Time Taken: {time_taken}"
-        ]
-        
-        for stat in stats_list:
+        self.result_stat_vars = [tk.StringVar() for _ in range(4)]
+        for var in self.result_stat_vars:
             stat_label = tk.Label(
                 stats_frame,
-                text=stat,
+                textvariable=var,
                 font=("Helvetica", 14),
                 fg="#ffffff",
                 bg='#3a4c5f',
@@ -1434,16 +1609,34 @@ class EnhancedNumberGame:
             command=self.root.destroy
         )
         quit_btn.pack(side="left", padx=10)
+        
+        return result_frame
     
     def _setup_welcome_page(self):
-        """Set up the welcome page with game options."""
-        # Clear existing widgets
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        """Show the welcome page with game options."""
+        self.pages.show("welcome")
         
+    def _refresh_welcome_page(self):
+        self.difficulty_var.set("easy")  # Default difficulty
+        self.difficulty_desc_var.set("Range: 1-50, Attempts: 10")  # Default description
+        self.welcome_title.start_pulsating()
+        
+    def _update_difficulty_description(self):
+        """Update the description when the difficulty changes"""
+        difficulty = self.difficulty_var.get()
+        if difficulty == "easy":
+            desc = "Range: 1-50, Attempts: 10"
+        elif difficulty == "medium":
+            desc = "Range: 1-20, Attempts: 7"
+        elif difficulty == "hard":
+            desc = "Range: 1-250, Attempts: 5"
+        self.difficulty_desc_var.set(desc)
+        self.start_button.config(state="normal")
+        
+    def _build_welcome_page(self):
+        """Create the welcome page with game options."""
         # Create gradient background
         welcome_frame = GradientFrame(self.root, "#1a2a6c", "#b21f1f", width=600, height=500)
-        welcome_frame.pack(fill="both", expand=True)
         
         # Create main content container with rounded corners
         content_frame = tk.Frame(welcome_frame, bg='#2d3e6d', bd=0, relief="ridge", padx=20, pady=20)
@@ -1458,7 +1651,7 @@ class EnhancedNumberGame:
             bg='#2d3e6d'
         )
         game_title.pack(pady=(20, 10))
-        game_title.start_pulsating()
+        self.welcome_title = game_title
         
         # Game subtitle
         subtitle = tk.Label(
@@ -1488,10 +1681,6 @@ class EnhancedNumberGame:
         difficulty_frame = tk.Frame(options_frame, bg='#2d3e6d')
         difficulty_frame.pack()
         
-        # Difficulty variable
-        self.difficulty_var = tk.StringVar()
-        self.difficulty_var.set("easy")  # Default difficulty
-        
         # Difficulty buttons with modern styling
         difficulties = [
             ("EASY", "easy", "#4caf50"),
@@ -1499,18 +1688,6 @@ class EnhancedNumberGame:
             ("HARD", "hard", "#f44336")
         ]
         
-        # Command to update description when difficulty changes
-        def update_difficulty_description(*args):
-            difficulty = self.difficulty_var.get()
-            if difficulty == "easy":
-                desc = "Range: 1-50, Attempts: 10"
-            elif difficulty == "medium":
-                desc = "Range: 1-20, Attempts: 7"
-            elif difficulty == "hard":
-                desc = "Range: 1-250, Attempts: 5"
-            self.difficulty_desc_var.set(desc)
-            self.start_button.config(state="normal")
-        
         for i, (text, value, color) in enumerate(difficulties):
             btn = tk.Button(
                 difficulty_frame,
@@ -1524,13 +1701,12 @@ class EnhancedNumberGame:
                 height=2,
                 cursor="hand2",
                 relief="flat",
-                command=lambda v=value: [self.difficulty_var.set(v), update_difficulty_description()]
+                command=lambda v=value: [self.difficulty_var.set(v), self._update_difficulty_description()]
             )
             btn.grid(row=0, column=i, padx=8, pady=10)
         
         # Difficulty description
         self.difficulty_desc_var = tk.StringVar()
-        self.difficulty_desc_var.set("Range: 1-50, Attempts: 10")  # Default description
         
         difficulty_desc = tk.Label(
             options_frame,
@@ -1589,6 +1765,8 @@ class EnhancedNumberGame:
             command=self.root.destroy
         )
         quit_button.pack(pady=10)
+        
+        return welcome_frame
     
     def _start_game(self):
         """Start a new game with the selected difficulty."""
@@ -1613,13 +1791,27 @@ class EnhancedNumberGame:
     
     def _show_stats_page(self):
         """Display a page with detailed game statistics."""
-        # Clear existing widgets
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.pages.show("stats")
+        
+    def _refresh_stats_page(self):
+        """Update the statistics page values."""
+        # Get overall stats
+        stats = self.stats_manager.get_stats()
+        for key, var in self.stats_page_vars.items():
+            value = stats[key]
+            var.set(f"{value}%" if key == "win_percentage" else str(value))
+        
+        for diff_id, row_vars in self.stats_page_difficulty_vars.items():
+            level_stats = self.stats_manager.get_difficulty_stats(diff_id)
+            row_vars[0].set(str(level_stats["games_played"]))
+            row_vars[1].set(str(level_stats["games_won"]))
+            row_vars[2].set(f"{level_stats['win_percentage']}%")
+            row_vars[3].set(str(level_stats["avg_attempts"]))
         
+    def _build_stats_page(self):
+        """Create the statistics page."""
         # Create gradient background
         stats_frame = GradientFrame(self.root, "#2c3e50", "#4ca1af", width=600, height=500)
-        stats_frame.pack(fill="both", expand=True)
         
         # Create main content container
         content_frame = tk.Frame(stats_frame, bg='#3a4c5f', bd=2, relief="ridge")
@@ -1635,9 +1827,6 @@ class EnhancedNumberGame:
         )
         stats_title.pack(pady=(20, 15))
         
-        # Get overall stats
-        stats = self.stats_manager.get_stats()
-        
         # Create stats overview frame
         overview_frame = tk.Frame(content_frame, bg='#2d3e6d', padx=10, pady=10, relief="ridge", bd=0)
         overview_frame.pack(fill="x", padx=20, pady=10)
@@ -1658,15 +1847,16 @@ class EnhancedNumberGame:
         
         # Display stats in a grid
         stats_data = [
-            ("Games Played", stats["games_played"]),
-            ("Games Won", stats["games_won"]),
-            ("Win Rate", f"{stats['win_percentage']}%"),
-            ("Avg Attempts", stats["avg_attempts"]),
-            ("Best Streak", stats["best_streak"]),
-            ("Current Streak", stats["current_streak"])
+            ("Games Played", "games_played"),
+            ("Games Won", "games_won"),
+            ("Win Rate", "win_percentage"),
+            ("Avg Attempts", "avg_attempts"),
+            ("Best Streak", "best_streak"),
+            ("Current Streak", "current_streak")
         ]
         
-        for i, (label, value) in enumerate(stats_data):
+        self.stats_page_vars = {}
+        for i, (label, key) in enumerate(stats_data):
             row = i // 3
             col = i % 3
             
@@ -1681,9 +1871,10 @@ class EnhancedNumberGame:
                 bg='#2d3e6d'
             ).pack()
             
+            self.stats_page_vars[key] = tk.StringVar()
             tk.Label(
                 frame,
-                text=str(value),
+                textvariable=self.stats_page_vars[key],
                 font=("Helvetica", 16, "bold"),
                 fg="#e74c3c",
                 bg='#2d3e6d'
@@ -1719,13 +1910,12 @@ class EnhancedNumberGame:
                 anchor="w" if i == 0 else "center"
             ).grid(row=0, column=i, padx=5, pady=5, sticky="w")
         
-        # Add data for each difficulty
+        # Add a row for each difficulty
         difficulties = ["easy", "medium", "hard"]
         difficulty_names = ["Easy", "Medium", "Hard"]
         
+        self.stats_page_difficulty_vars = {}
         for i, (diff_id, diff_name) in enumerate(zip(difficulties, difficulty_names)):
-            level_stats = self.stats_manager.get_difficulty_stats(diff_id)
-            
             tk.Label(
                 table_frame,
                 text=diff_name,
@@ -1735,37 +1925,16 @@ class EnhancedNumberGame:
                 anchor="w"
             ).grid(row=i+1, column=0, padx=5, pady=3, sticky="w")
             
-            tk.Label(
-                table_frame,
-                text=str(level_stats["games_played"]),
-                font=("Helvetica", 11),
-                fg="#ffffff",
-                bg='#2d3e6d'
-            ).grid(row=i+1, column=1, padx=5, pady=3)
-            
-            tk.Label(
-                table_frame,
-                text=str(level_stats["games_won"]),
-                font=("Helvetica", 11),
-                fg="#ffffff",
-                bg='#2d3e6d'
-            ).grid(row=i+1, column=2, padx=5, pady=3)
-            
-            tk.Label(
-                table_frame,
-                text=f"{level_stats['win_percentage']}%",
-                font=("Helvetica", 11),
-                fg="#ffffff",
-                bg='#2d3e6d'
-            ).grid(row=i+1, column=3, padx=5, pady=3)
-            
-            tk.Label(
-                table_frame,
-                text=str(level_stats["avg_attempts"]),
-                font=("Helvetica", 11),
-                fg="#ffffff",
-                bg='#2d3e6d'
-            ).grid(row=i+1, column=4, padx=5, pady=3)
+            row_vars = [tk.StringVar() for _ in range(4)]
+            for column, var in enumerate(row_vars, 1):
+                tk.Label(
+                    table_frame,
+                    textvariable=var,
+                    font=("Helvetica", 11),
+                    fg="#ffffff",
+                    bg='#2d3e6d'
+                ).grid(row=i+1, column=column, padx=5, pady=3)
+            self.stats_page_difficulty_vars[diff_id] = row_vars
         
         # Buttons frame
         button_frame = tk.Frame(content_frame, bg='#3a4c5f')
@@ -1802,6 +1971,8 @@ class EnhancedNumberGame:
             command=self.root.destroy
         )
         quit_btn.pack(side="left", padx=10)
+        
+        return stats_frame
 
     def _show_welcome_page(self):
         """Redirect to welcome page setup."""
@@ -0,0 +1,229 @@
+"""
+SQLite-backed game history for the enhanced game.
+
+Drop-in replacement for StatsManager that keeps every game and every guess
+instead of the last 20 games. Games are indexed by difficulty, mode, player
+and date, and add_game keeps per-scope totals in the same transaction, so
+the summary queries behind the home and stats pages read a single row no
+matter how long the history is.
+
+Given a HistoryArchive, every game is also appended to the columnar archive
+that analytics scripts read with NumPy.
+"""
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+DB_FILE = "game_history.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    player TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    attempts_used INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    number INTEGER,
+    streak INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS guesses (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    attempt INTEGER NOT NULL,
+    guess INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (game_id, attempt)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS totals (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    played INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    won_attempts INTEGER NOT NULL,
+    PRIMARY KEY (scope, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS win_attempts (
+    attempts_used INTEGER PRIMARY KEY,
+    games INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_difficulty ON games(difficulty, won, attempts_used);
+CREATE INDEX IF NOT EXISTS games_mode ON games(mode, won, attempts_used);
+CREATE INDEX IF NOT EXISTS games_player ON games(player, played_at);
+CREATE INDEX IF NOT EXISTS games_played_at ON games(played_at);
+CREATE INDEX IF NOT EXISTS games_won ON games(won, attempts_used);
+CREATE INDEX IF NOT EXISTS games_streak ON games(streak);
+"""
+
+
+class SQLiteStatsManager:
+    """Manage game statistics and history in an SQLite database"""
+    def __init__(self, db_file=DB_FILE, legacy_history_file="game_history.json", archive=None):
+        self.db_file = db_file
+        self.archive = archive
+        self.conn = sqlite3.connect(db_file)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._import_legacy(legacy_history_file)
+
+    def _import_legacy(self, history_file):
+        """Copy games from the old JSON history into an empty database"""
+        if not history_file or not os.path.exists(history_file):
+            return
+        if self.conn.execute("SELECT 1 FROM games LIMIT 1").fetchone():
+            return
+        try:
+            with open(history_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        # StatsManager saves {"history": [...], "aggregates": {...}}; older files are a bare list
+        games = data.get("history", []) if isinstance(data, dict) else data
+        for game in games:
+            if not isinstance(game, dict) or not all(key in game for key in ["difficulty", "attempts_used", "won"]):
+                continue
+            try:
+                played_at = datetime.strptime(game["date"], "%Y-%m-%d %H:%M:%S").timestamp()
+            except (KeyError, TypeError, ValueError):
+                played_at = time.time()
+            self.add_game(game["difficulty"], game["attempts_used"], game["won"],
+                          number=game.get("number"), played_at=played_at, commit=False)
+        self.conn.commit()
+
+    def add_game(self, difficulty, attempts_used, won, number=None, mode="classic",
+                 player="Player", guesses=None, played_at=None, commit=True,
+                 score=0, duration=0.0):
+        """Add a game, and optionally its guesses, to history"""
+        row = self.conn.execute("SELECT streak FROM games ORDER BY id DESC LIMIT 1").fetchone()
+        streak = (row["streak"] + 1 if row else 1) if won else 0
+        cursor = self.conn.execute(
+            "INSERT INTO games (played_at, player, mode, difficulty, attempts_used, won, number, streak) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (played_at or time.time(), player, mode, str(difficulty), attempts_used, int(bool(won)),
+             number, streak)
+        )
+        won = int(bool(won))
+        self.conn.executemany(
+            "INSERT INTO totals (scope, key, played, won, won_attempts) VALUES (?, ?, 1, ?, ?) "
+            "ON CONFLICT (scope, key) DO UPDATE SET played = played + 1, "
+            "won = won + excluded.won, won_attempts = won_attempts + excluded.won_attempts",
+            [(scope, key, won, attempts_used * won) for scope, key in
+             (("all", ""), ("difficulty", str(difficulty)), ("mode", mode), ("player", player))]
+        )
+        if won:
+            self.conn.execute(
+                "INSERT INTO win_attempts (attempts_used, games) VALUES (?, 1) "
+                "ON CONFLICT (attempts_used) DO UPDATE SET games = games + 1",
+                (attempts_used,)
+            )
+        if guesses:
+            game_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO guesses (game_id, attempt, guess, result) VALUES (?, ?, ?, ?)",
+                [(game_id, attempt, guess, self._guess_result(guess, number))
+                 for attempt, guess in enumerate(guesses, 1)]
+            )
+        if commit:
+            self.conn.commit()
+        if self.archive is not None:
+            self.archive.append(difficulty, attempts_used, won, number=number, mode=mode,
+                                score=score, duration=duration, timestamp=played_at)
+
+    @staticmethod
+    def _guess_result(guess, number):
+        if number is None:
+            return "unknown"
+        if guess < number:
+            return "low"
+        if guess > number:
+            return "high"
+        return "correct"
+
+    def _summary(self, scope, key):
+        row = self.conn.execute(
+            "SELECT played, won, won_attempts FROM totals WHERE scope = ? AND key = ?",
+            (scope, key)
+        ).fetchone()
+        games_played = row["played"] if row else 0
+        games_won = row["won"] if row else 0
+        win_percentage = (games_won / games_played) * 20 if games_played > 0 else 0
+        avg_attempts = row["won_attempts"] / games_won if games_won else 0
+        return {
+            "games_played": games_played,
+            "games_won": games_won,
+            "win_percentage": round(win_percentage, 1),
+            "avg_attempts": round(avg_attempts, 1)
+        }
+
+    def get_stats(self):
+        """Get overall game statistics"""
+        stats = self._summary("all", "")
+        best = self.conn.execute("SELECT MAX(streak) FROM games").fetchone()[0]
+        last = self.conn.execute("SELECT streak FROM games ORDER BY id DESC LIMIT 1").fetchone()
+        stats["best_streak"] = best or 0
+        stats["current_streak"] = last["streak"] if last else 0
+        return stats
+
+    def get_difficulty_stats(self, difficulty):
+        """Get statistics for a specific difficulty"""
+        return self._summary("difficulty", str(difficulty))
+
+    def get_mode_stats(self, mode):
+        """Get statistics for a specific game mode"""
+        return self._summary("mode", mode)
+
+    def get_player_stats(self, player):
+        """Get statistics for one player"""
+        return self._summary("player", player)
+
+    def has_games(self):
+        return self.conn.execute("SELECT 1 FROM games LIMIT 1").fetchone() is not None
+
+    def recent_games(self, limit=10):
+        """Most recent games first, as dicts shaped like the JSON history"""
+        rows = self.conn.execute(
+            "SELECT * FROM games ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [self._game_dict(row) for row in rows]
+
+    def games_between(self, start, end):
+        """Games played between two datetimes, oldest first"""
+        rows = self.conn.execute(
+            "SELECT * FROM games WHERE played_at >= ? AND played_at < ? ORDER BY played_at",
+            (start.timestamp(), end.timestamp())
+        ).fetchall()
+        return [self._game_dict(row) for row in rows]
+
+    def game_guesses(self, game_id):
+        return [dict(row) for row in self.conn.execute(
+            "SELECT attempt, guess, result FROM guesses WHERE game_id = ? ORDER BY attempt",
+            (game_id,)
+        )]
+
+    def attempts_distribution(self):
+        """{attempts_used: games} over won games"""
+        return dict(self.conn.execute(
+            "SELECT attempts_used, games FROM win_attempts ORDER BY attempts_used"
+        ).fetchall())
+
+    @staticmethod
+    def _game_dict(row):
+        return {
+            "id": row["id"],
+            "difficulty": row["difficulty"],
+            "mode": row["mode"],
+            "player": row["player"],
+            "attempts_used": row["attempts_used"],
+            "won": bool(row["won"]),
+            "number": row["number"],
+            "date": datetime.fromtimestamp(row["played_at"]).strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    def close(self):
+        self.conn.close()
+        if self.archive is not None:
+            self.archive.close()
@@ -0,0 +1,49 @@
+"""
+Lazy loader for the optional plotting libraries.
+
+matplotlib and numpy take most of enhanced_game.py's startup time, so they
+are imported here on the first chart request instead of at module level.
+"""
+import importlib
+import time
+
+_viz = None
+_failed = False
+
+# Seconds spent importing, for the startup benchmark
+import_time = 0.0
+
+
+class Visualization:
+    """The plotting names enhanced_game.py uses"""
+    def __init__(self, matplotlib, Figure, FigureCanvasTkAgg, np):
+        self.matplotlib = matplotlib
+        self.Figure = Figure
+        self.FigureCanvasTkAgg = FigureCanvasTkAgg
+        self.np = np
+
+
+def is_loaded():
+    return _viz is not None
+
+
+def load():
+    """Import matplotlib/numpy once; returns None if they are unavailable"""
+    global _viz, _failed, import_time
+    if _viz is not None or _failed:
+        return _viz
+    start = time.perf_counter()
+    try:
+        matplotlib = importlib.import_module("matplotlib")
+        matplotlib.use("TkAgg")
+        importlib.import_module("matplotlib.ticker")
+        figure = importlib.import_module("matplotlib.figure")
+        backend = importlib.import_module("matplotlib.backends.backend_tkagg")
+        np = importlib.import_module("numpy")
+        _viz = Visualization(matplotlib, figure.Figure, backend.FigureCanvasTkAgg, np)
+        print("Visualization enabled")
+    except ImportError:
+        _failed = True
+        print("Visualization libraries not available. Running with simplified graphics.")
+    import_time = time.perf_counter() - start
+    return _viz
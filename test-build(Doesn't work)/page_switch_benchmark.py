@@ -0,0 +1,73 @@
+"""
+Page-switch latency benchmark for enhanced_game.py.
+
+Cycles through the welcome, game, result, stats and home pages and times
+each switch until Tk has drawn it. The run is repeated with pages rebuilt
+on every visit (the old destroy-and-rebuild behaviour) and with recycled
+pages, and the medians are compared. Needs a display.
+
+Usage:
+    python page_switch_benchmark.py [cycles]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import enhanced_game
+
+
+def run(recycle, cycles):
+    """Returns {page: [seconds per switch]}"""
+    root = tk.Tk()
+    game = enhanced_game.EnhancedNumberGame(root)
+    game.pages.recycle = recycle
+    root.update()
+
+    switches = [
+        ("welcome", game._setup_welcome_page),
+        ("game", game._start_game),
+        ("result", lambda: game._show_result_page(True)),
+        ("stats", game._show_stats_page),
+        ("home", game.show_home_page),
+    ]
+    timings = {name: [] for name, _ in switches}
+    for _ in range(cycles):
+        for name, switch in switches:
+            start = time.perf_counter()
+            switch()
+            root.update()
+            timings[name].append(time.perf_counter() - start)
+    root.destroy()
+    return timings
+
+
+def main():
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    # Keep the benchmark's game history out of the real one
+    os.chdir(tempfile.mkdtemp())
+    try:
+        before = run(False, cycles)
+        after = run(True, cycles)
+    except tk.TclError as e:
+        print(f"Cannot run the page-switch benchmark without a display: {e}")
+        return
+
+    print(f"=== Page switch latency, median of {cycles} switches (ms) ===")
+    print(f"{'Page':<10}{'Rebuild':>10}{'Recycle':>10}{'Speedup':>10}")
+    for name in before:
+        old = statistics.median(before[name]) * 1000
+        new = statistics.median(after[name]) * 1000
+        print(f"{name:<10}{old:>10.2f}{new:>10.2f}{old / new if new else 0:>9.1f}x")
+    old_all = statistics.median([t for times in before.values() for t in times]) * 1000
+    new_all = statistics.median([t for times in after.values() for t in times]) * 1000
+    print(f"{'all':<10}{old_all:>10.2f}{new_all:>10.2f}{old_all / new_all if new_all else 0:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Cold-start benchmark for enhanced_game.py.
+
+Launches fresh interpreters that import the game, build the window and
+process events until the first frame is drawn, then checks the median time
+against a budget. Also reports whether the plotting libraries were loaded
+during startup (they should not be).
+
+Usage:
+    python startup_benchmark.py [budget_seconds] [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import enhanced_game, lazy_viz
+imported = time.perf_counter()
+result = {"import": imported - start, "frame": None, "viz_loaded": False}
+try:
+    import tkinter as tk
+    root = tk.Tk()
+    game = enhanced_game.EnhancedNumberGame(root)
+    root.update()
+    result["frame"] = time.perf_counter() - start
+    root.destroy()
+except tk.TclError as e:
+    result["error"] = str(e)
+result["viz_loaded"] = lazy_viz.is_loaded() or "matplotlib" in sys.modules
+print("RESULT " + json.dumps(result))
+"""
+
+
+def run_once(env):
+    """Run one cold start; returns (wall seconds, child result dict)"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD],
+            cwd=work_dir, env=env, capture_output=True, text=True
+        ).stdout
+        wall = time.perf_counter() - start
+    for line in output.splitlines():
+        if line.startswith("RESULT "):
+            return wall, json.loads(line[len("RESULT "):])
+    raise RuntimeError("Benchmark child failed:\n" + output)
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 1.5
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = GAME_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    env.setdefault("USE_VISUALIZATION", "1")
+
+    walls, imports, frames, viz_loaded = [], [], [], False
+    for _ in range(runs):
+        wall, result = run_once(env)
+        walls.append(wall)
+        imports.append(result["import"])
+        if result["frame"] is not None:
+            frames.append(result["frame"])
+        viz_loaded = viz_loaded or result["viz_loaded"]
+
+    print("=== Enhanced game cold start ===")
+    print(f"Runs: {runs}, budget: {budget:.2f}s")
+    print(f"Module import (median):      {statistics.median(imports) * 1000:7.1f} ms")
+    if frames:
+        print(f"First frame in-process:      {statistics.median(frames) * 1000:7.1f} ms")
+    else:
+        print("First frame: no display available, measured import only")
+    print(f"Process launch to exit:      {statistics.median(walls) * 1000:7.1f} ms")
+    print(f"Plotting libraries loaded at startup: {'yes' if viz_loaded else 'no'}")
+
+    measured = statistics.median(walls)
+    if measured > budget or viz_loaded:
+        print("FAIL: cold start is over budget" if measured > budget
+              else "FAIL: plotting libraries were imported at startup")
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Behaviour of the headless GameEngine: guess results, scoring, timeouts,
+seeded rounds and replays.
+
+Run with:
+    python -m pytest -q
+"""
+from game_engine import (GameEngine, RoundRules, replay_round, CORRECT, INACTIVE, OUT_OF_RANGE,
+                         TOO_HIGH, TOO_LOW)
+from hints import hint_family
+
+
+def new_engine(seed=42, mode='classic', difficulty='medium'):
+    engine = GameEngine(clock=lambda: 0, seed=seed)
+    engine.set_mode(mode)
+    engine.set_difficulty(difficulty)
+    engine.start_round(now=0)
+    return engine
+
+
+def wrong_guess(engine):
+    low, high = engine.number_range
+    return low if engine.secret_number != low else high
+
+
+def test_win_scores_and_ends_round():
+    engine = new_engine()
+    secret = engine.secret_number
+    outcome = engine.make_guess(secret, now=10)
+    assert outcome['result'] == CORRECT
+    assert outcome['won'] and outcome['game_over']
+    # 1000 - 2 * 10 seconds - 50 per attempt
+    assert outcome['score'] == 930
+    assert outcome['seed'] == engine.round.seed
+    assert not engine.game_active
+    assert engine.player_profile['games_played'] == 1
+    assert engine.high_scores['medium'] == 930
+
+
+def test_first_guess_win_unlocks_achievements_in_rule_order():
+    engine = new_engine()
+    outcome = engine.make_guess(engine.secret_number, now=10)
+    assert outcome['achievements'] == ['first_win', 'perfect_game', 'speed_demon']
+    assert engine.player_profile['achievements'] == outcome['achievements']
+
+
+def test_wrong_guesses_narrow_then_lose():
+    engine = new_engine(difficulty='hard')
+    results = []
+    for attempt in range(engine.max_attempts):
+        guess = wrong_guess(engine)
+        outcome = engine.make_guess(guess, now=attempt + 1)
+        results.append(outcome['result'])
+    assert set(results) <= {TOO_LOW, TOO_HIGH}
+    assert outcome['game_over'] and not outcome['won']
+    assert outcome['score'] == 0
+    assert not engine.game_active
+    assert engine.low_bound <= engine.secret_number <= engine.high_bound
+    assert engine.make_guess(engine.secret_number)['result'] == INACTIVE
+
+
+def test_out_of_range_guess_is_not_counted():
+    engine = new_engine()
+    low, high = engine.number_range
+    assert engine.make_guess(high + 1)['result'] == OUT_OF_RANGE
+    assert engine.attempts == 0
+
+
+def test_expire_ends_running_round_once():
+    engine = new_engine(mode='time_attack')
+    assert engine.expire(now=60)
+    assert not engine.game_active
+    assert not engine.expire(now=61)
+    outcome = engine.make_guess(engine.secret_number, now=62)
+    assert outcome['result'] == INACTIVE
+    assert engine.player_profile['games_played'] == 0
+
+
+def test_calculate_score_penalties():
+    engine = new_engine()
+    engine.time_elapsed = 12.7
+    engine.attempts = 3
+    engine.hints_remaining = 0
+    # 1000 - int(25.4) - 100 for the hint - 3 * 50
+    assert engine.calculate_score() == 725
+    engine.attempts = 30
+    assert engine.calculate_score() == 0
+
+
+def test_hint_is_used_once():
+    engine = new_engine(difficulty='easy')
+    hint = engine.get_hint()
+    assert hint and engine.hints_remaining == 0
+    assert engine.get_hint() is None
+    engine.make_guess(engine.secret_number, now=0)
+    assert engine.score == 1000 - 100 - 50
+
+
+def test_same_seed_gives_same_rounds():
+    first = GameEngine(clock=lambda: 0, seed=42)
+    second = GameEngine(clock=lambda: 0, seed=42)
+    secrets = []
+    for engine in (first, second):
+        secrets.append([engine.start_round(now=0) for _ in range(20)])
+    assert secrets[0] == secrets[1]
+    assert len(set(secrets[0])) > 1
+
+
+def test_replay_round_reproduces_seeded_round():
+    engine = new_engine(seed=7, difficulty='hard')
+    engine.set_range(1, 1000)
+    engine.max_attempts = 10
+    engine.start_round(now=0)
+    hint = engine.get_hint()
+    guesses = []
+    low, high = engine.number_range
+    while engine.game_active:
+        guess = (low + high) // 2
+        guesses.append(guess)
+        outcome = engine.make_guess(guess, now=len(guesses) * 3)
+        if outcome['result'] == TOO_LOW:
+            low = guess + 1
+        elif outcome['result'] == TOO_HIGH:
+            high = guess - 1
+    record = engine.round_record()
+    assert record['guesses'] == guesses
+
+    replayed, replay_outcome = replay_round(record)
+    assert replayed.secret_number == engine.secret_number
+    assert replayed.hint_text == hint
+    assert replayed.guess_history == guesses
+    assert replay_outcome['won'] == outcome['won']
+    assert replay_outcome['score'] == outcome['score']
+    assert replay_outcome['seed'] == record['seed']
+
+
+def test_round_rules_play_like_the_engine():
+    engine = new_engine(seed=11, difficulty='hard')
+    low, high = engine.number_range
+    rules = RoundRules(clock=lambda: 0)
+    state = rules.start_round(engine.round.seed, low, high, engine.max_attempts, now=0)
+    assert state.secret == engine.secret_number
+    assert rules.get_hint(state, low, high, hint_family('hard')) == engine.get_hint()
+    for attempt, guess in enumerate((10, 15, engine.secret_number)):
+        expected = engine.make_guess(guess, now=attempt + 4)
+        outcome = rules.make_guess(state, guess, low, high, now=attempt + 4)
+        for key in ('result', 'game_over', 'won', 'score'):
+            assert outcome[key] == expected[key]
+        if expected['game_over']:
+            break
+    assert state.history == engine.guess_history
+    assert not state.active and not engine.game_active
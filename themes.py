@@ -0,0 +1,131 @@
+"""
+Theme registry for the Tk game.
+
+Widgets are registered once with a role ("card", "title", ...) instead of
+being reconfigured by name in change_theme. Each theme's palette is compiled
+into a per-role table of Tk options the first time it is used, so switching
+themes is one configure() call per live widget with no lookups, and widgets
+in Toplevel dialogs are included. Widgets are held through weak references
+and drop out of the registry when they are destroyed.
+
+User themes are JSON files in data/themes/, one per theme, named after the
+theme (e.g. data/themes/ocean.json). Any color they leave out is taken from
+the light theme.
+"""
+import json
+import os
+import tkinter as tk
+import weakref
+
+BUILTIN_THEMES = {
+    'light': {
+        'bg': '#C3E0E5',
+        'card': '#F8F8F8',
+        'primary': '#39A78E',
+        'secondary': '#6497B1',
+        'accent': '#FFD700',
+        'text': '#333333',
+        'success': '#4CAF50',
+        'warning': '#FF9800',
+        'error': '#F44336',
+        'border': '#BBBBBB'
+    },
+    'dark': {
+        'bg': '#1A1A1A',
+        'card': '#2D2D2D',
+        'primary': '#64B5F6',
+        'secondary': '#7986CB',
+        'accent': '#9575CD',
+        'text': '#FFFFFF',
+        'success': '#81C784',
+        'warning': '#FFB74D',
+        'error': '#E57373',
+        'border': '#424242'
+    }
+}
+
+# Tk option -> palette color for each widget role
+ROLES = {
+    'background': {'bg': 'bg'},
+    'card': {'bg': 'card'},
+    'title': {'bg': 'bg', 'fg': 'primary'},
+    'text': {'bg': 'bg', 'fg': 'text'},
+    'card_title': {'bg': 'card', 'fg': 'primary'},
+    'card_text': {'bg': 'card', 'fg': 'text'},
+    'entry': {'bg': 'bg', 'fg': 'text'}
+}
+
+THEME_DIR = 'data/themes'
+
+
+def compile_theme(palette, roles=ROLES):
+    """Resolve every role to concrete option values: {role: {option: color}}"""
+    return {role: {option: palette[color] for option, color in options.items()}
+            for role, options in roles.items()}
+
+
+def load_user_themes(directory=THEME_DIR, base=None):
+    """Read *.json themes from directory; returns {name: palette}"""
+    base = base or BUILTIN_THEMES['light']
+    themes = {}
+    if not os.path.isdir(directory):
+        return themes
+    for filename in sorted(os.listdir(directory)):
+        name, ext = os.path.splitext(filename)
+        if ext != '.json':
+            continue
+        try:
+            with open(os.path.join(directory, filename), 'r') as f:
+                colors = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading theme {filename}: {e}")
+            continue
+        if not isinstance(colors, dict):
+            print(f"Error loading theme {filename}: expected an object of colors")
+            continue
+        palette = dict(base)
+        palette.update({key: value for key, value in colors.items() if key in base})
+        themes[name] = palette
+    return themes
+
+
+class ThemeManager:
+    """Tracks themed widgets by role and restyles them all on a theme change"""
+    def __init__(self, theme='light', theme_dir=THEME_DIR):
+        self.themes = dict(BUILTIN_THEMES)
+        self.themes.update(load_user_themes(theme_dir))
+        self._compiled = {}
+        self._widgets = {role: weakref.WeakSet() for role in ROLES}
+        self.current = theme if theme in self.themes else 'light'
+
+    @property
+    def colors(self):
+        return self.themes[self.current]
+
+    def styles(self, theme=None):
+        """Compiled role table for a theme, built on first use"""
+        theme = theme or self.current
+        table = self._compiled.get(theme)
+        if table is None:
+            table = compile_theme(self.themes[theme])
+            self._compiled[theme] = table
+        return table
+
+    def register(self, widget, role):
+        """Style widget for the current theme and keep it themed; returns it"""
+        widget.configure(**self.styles()[role])
+        self._widgets[role].add(widget)
+        return widget
+
+    def apply(self, theme):
+        """Switch to theme and restyle every live registered widget"""
+        self.current = theme
+        table = self.styles(theme)
+        for role, widgets in self._widgets.items():
+            options = table[role]
+            for widget in list(widgets):
+                try:
+                    widget.configure(**options)
+                except tk.TclError:
+                    # Destroyed but not yet garbage collected
+                    widgets.discard(widget)
@@ -0,0 +1,152 @@
+"""
+Opt-in Tk event-loop profiler.
+
+Wraps every Tk callback (button commands, key bindings and after() timers)
+to record how long each handler runs, and keeps a heartbeat timer on the
+event loop to measure how late it fires (event-loop lag) and the gaps
+between frames. Results can be exported as JSON or CSV to find the handler
+that blocks the main loop.
+
+Enable it for the main game with:
+    GAME_TK_PROFILE=1 python Final_fixed_game.py
+"""
+import csv
+import json
+import time
+import tkinter as tk
+
+from online_stats import OnlineStats
+
+# Upper edges (ms) of the frame-gap histogram buckets
+FRAME_GAP_BUCKETS = (16, 33, 50, 100, 250, 500, 1000)
+
+
+def handler_name(func):
+    """Readable name for a callback, with its source line for lambdas"""
+    name = getattr(func, '__qualname__', None) or repr(func)
+    code = getattr(func, '__code__', None)
+    if name.endswith('<lambda>') and code is not None:
+        name = f"{name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})"
+    return name
+
+
+class TkProfiler:
+    """Records per-handler wall time, event-loop lag and frame gaps"""
+    def __init__(self, root, heartbeat_ms=16):
+        self.root = root
+        self.heartbeat_ms = heartbeat_ms
+        self.handlers = {}
+        self.lag = OnlineStats()
+        self.frame_gaps = [0] * (len(FRAME_GAP_BUCKETS) + 1)
+        self._last_beat = None
+        self._expected = None
+        self._originals = None
+        self._running = False
+
+    def record(self, name, seconds):
+        if name not in self.handlers:
+            self.handlers[name] = OnlineStats()
+        self.handlers[name].add(seconds * 1000)
+
+    def install(self):
+        """Start wrapping callbacks and measuring the event loop"""
+        if self._originals is not None:
+            return
+        profiler = self
+        original_call = tk.CallWrapper.__call__
+        original_after = tk.Misc.after
+
+        def timed_call(wrapper, *args):
+            func = wrapper.func
+            # after() callbacks are timed in timed_after with a better name
+            if getattr(func, '__qualname__', '').endswith('after.<locals>.callit'):
+                return original_call(wrapper, *args)
+            start = time.perf_counter()
+            try:
+                return original_call(wrapper, *args)
+            finally:
+                profiler.record(handler_name(func), time.perf_counter() - start)
+
+        def timed_after(widget, ms, func=None, *args):
+            if func is None or getattr(func, '_tk_profiler_skip', False):
+                return original_after(widget, ms, func, *args)
+            name = 'after:' + handler_name(func)
+
+            def timed(*call_args):
+                start = time.perf_counter()
+                try:
+                    return func(*call_args)
+                finally:
+                    profiler.record(name, time.perf_counter() - start)
+            return original_after(widget, ms, timed, *args)
+
+        self._originals = (original_call, original_after)
+        tk.CallWrapper.__call__ = timed_call
+        tk.Misc.after = timed_after
+        self._running = True
+        self._schedule_beat()
+
+    def uninstall(self):
+        """Restore the original Tk callback machinery"""
+        if self._originals is None:
+            return
+        tk.CallWrapper.__call__, tk.Misc.after = self._originals
+        self._originals = None
+        self._running = False
+
+    def _schedule_beat(self):
+        self._expected = time.perf_counter() + self.heartbeat_ms / 1000
+        self.root.after(self.heartbeat_ms, self._beat)
+
+    def _beat(self):
+        if not self._running:
+            return
+        now = time.perf_counter()
+        self.lag.add(max(0.0, now - self._expected) * 1000)
+        if self._last_beat is not None:
+            gap_ms = (now - self._last_beat) * 1000
+            for i, edge in enumerate(FRAME_GAP_BUCKETS):
+                if gap_ms < edge:
+                    self.frame_gaps[i] += 1
+                    break
+            else:
+                self.frame_gaps[-1] += 1
+        self._last_beat = now
+        self._schedule_beat()
+
+    _beat._tk_profiler_skip = True
+
+    def report(self):
+        """Per-handler timings, slowest total first, plus loop health"""
+        handlers = []
+        for name, stats in self.handlers.items():
+            summary = stats.summary()
+            handlers.append({
+                'handler': name,
+                'calls': stats.count,
+                'total_ms': stats.mean * stats.count,
+                'mean_ms': summary['mean'],
+                'p50_ms': summary['p50'],
+                'p90_ms': summary['p90'],
+                'p99_ms': summary['p99'],
+                'max_ms': summary['max']
+            })
+        handlers.sort(key=lambda row: row['total_ms'], reverse=True)
+        labels = [f"<{edge}ms" for edge in FRAME_GAP_BUCKETS] + [f">={FRAME_GAP_BUCKETS[-1]}ms"]
+        return {
+            'handlers': handlers,
+            'event_loop_lag_ms': self.lag.summary(),
+            'frame_gaps': dict(zip(labels, self.frame_gaps))
+        }
+
+    def export_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def export_csv(self, path):
+        rows = self.report()['handlers']
+        fields = ['handler', 'calls', 'total_ms', 'mean_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms']
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
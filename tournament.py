@@ -0,0 +1,226 @@
+"""
+Monte Carlo tournament runner for guessing strategies.
+
+Strategies play full rounds through GameEngine (too low / too high
+feedback, attempt caps per difficulty) across every mode and difficulty.
+Work is split into tasks that run on a process pool; each task gets its
+own deterministic seed and sends back only a few counters, never the
+individual rounds.
+
+Usage:
+    python tournament.py [rounds] [workers]
+"""
+import random
+import sys
+import time
+from multiprocessing import Pool, cpu_count
+
+from game_engine import GameEngine, GAME_MODES, DIFFICULTY_ATTEMPTS, TOO_LOW, TOO_HIGH
+from hints import possible_hints
+from rng_service import derive_seed
+
+SECONDS_PER_GUESS = 3
+
+
+class Strategy:
+    """Base class for guessing strategies.
+
+    A strategy sees the same feedback as a player: the number range, the
+    attempts left and "too low"/"too high" after each guess.
+    """
+    name = 'base'
+    uses_hint = False
+
+    def new_round(self, low, high, difficulty, rng, hint_names=None, hint_policy='random'):
+        self.low, self.high = low, high
+        self.candidates = list(range(low, high + 1))
+        self.difficulty = difficulty
+        # The engine's hint family and policy, as set with set_hints()
+        self.hint_names = hint_names
+        self.hint_policy = hint_policy
+        self.rng = rng
+
+    def next_guess(self, attempts_left):
+        raise NotImplementedError
+
+    def feedback(self, guess, result):
+        if result == TOO_LOW:
+            self.candidates = [c for c in self.candidates if c > guess]
+        elif result == TOO_HIGH:
+            self.candidates = [c for c in self.candidates if c < guess]
+
+    def hint(self, text):
+        self.candidates = [c for c in self.candidates
+                           if text in possible_hints(c, self.difficulty, self.low, self.high,
+                                                     self.hint_names, self.hint_policy)]
+
+
+class BinarySearchStrategy(Strategy):
+    """Always guess the median candidate"""
+    name = 'binary_search'
+
+    def next_guess(self, attempts_left):
+        return self.candidates[(len(self.candidates) - 1) // 2]
+
+
+class RandomStrategy(Strategy):
+    """Guess any candidate at random"""
+    name = 'random'
+
+    def next_guess(self, attempts_left):
+        return self.rng.choice(self.candidates)
+
+
+class HintExploitingStrategy(BinarySearchStrategy):
+    """Take the hint before the first guess, then binary search"""
+    name = 'hint_exploiting'
+    uses_hint = True
+
+
+class AdversarialAwareStrategy(Strategy):
+    """Pick randomly among the guesses that keep the worst case optimal.
+
+    A fixed median strategy always misses the same secrets, which an
+    adversarial number picker can learn. Any guess that leaves at most
+    2**(k-1) - 1 candidates on each side still wins whenever binary search
+    would, so choosing among those at random hides the pattern.
+    """
+    name = 'adversarial_aware'
+
+    def next_guess(self, attempts_left):
+        count = len(self.candidates)
+        side = (1 << (attempts_left - 1)) - 1
+        first = max(0, count - 1 - side)
+        last = min(count - 1, side)
+        if first > last:
+            return self.candidates[(count - 1) // 2]
+        return self.candidates[self.rng.randint(first, last)]
+
+
+STRATEGIES = {
+    strategy.name: strategy for strategy in (
+        BinarySearchStrategy,
+        RandomStrategy,
+        HintExploitingStrategy,
+        AdversarialAwareStrategy
+    )
+}
+
+
+def play_rounds(task):
+    """Worker entry point: play a batch of rounds and return counters only"""
+    strategy_name, mode, difficulty, rounds, seed = task
+    rng = random.Random(seed)
+    engine = GameEngine(seed=seed)
+    engine.set_mode(mode)
+    engine.set_difficulty(difficulty)
+    strategy = STRATEGIES[strategy_name]()
+    low, high = engine.number_range
+
+    totals = {'rounds': rounds, 'wins': 0, 'score': 0, 'attempts': 0, 'hints': 0}
+    for _ in range(rounds):
+        engine.start_round(now=0)
+        strategy.new_round(low, high, difficulty, rng, engine.hint_names, engine.hint_policy)
+        if strategy.uses_hint:
+            strategy.hint(engine.get_hint())
+            totals['hints'] += 1
+        while engine.game_active:
+            guess = strategy.next_guess(engine.max_attempts - engine.attempts)
+            outcome = engine.make_guess(guess, now=(engine.attempts + 1) * SECONDS_PER_GUESS)
+            strategy.feedback(guess, outcome['result'])
+        totals['attempts'] += engine.attempts
+        if outcome['won']:
+            totals['wins'] += 1
+            totals['score'] += outcome['score']
+    return (strategy_name, mode, difficulty), totals
+
+
+def build_tasks(strategies, modes, difficulties, rounds, chunks, seed):
+    tasks = []
+    for strategy_name in strategies:
+        for mode in modes:
+            for difficulty in difficulties:
+                base, extra = divmod(rounds, chunks)
+                for chunk in range(chunks):
+                    size = base + (1 if chunk < extra else 0)
+                    if size:
+                        tasks.append((strategy_name, mode, difficulty, size,
+                                      derive_seed(seed, strategy_name, mode, difficulty, chunk)))
+    return tasks
+
+
+def merge(results):
+    """Sum per-task counters into {(strategy, mode, difficulty): totals}"""
+    merged = {}
+    for key, totals in results:
+        if key not in merged:
+            merged[key] = dict(totals)
+        else:
+            for field, value in totals.items():
+                merged[key][field] += value
+    return merged
+
+
+def run_tournament(rounds=10000, strategies=None, modes=None, difficulties=None,
+                   workers=None, seed=0):
+    """Play rounds per (strategy, mode, difficulty) and return merged totals.
+
+    Results only depend on seed, not on the number of workers.
+    """
+    strategies = list(strategies or STRATEGIES)
+    modes = list(modes or GAME_MODES)
+    difficulties = list(difficulties or DIFFICULTY_ATTEMPTS)
+    workers = workers or cpu_count()
+    # Fixed chunking keeps per-task seeds the same for any worker count
+    chunks = max(1, min(64, rounds // 1000))
+    tasks = build_tasks(strategies, modes, difficulties, rounds, chunks, seed)
+
+    if workers == 1:
+        results = map(play_rounds, tasks)
+        return merge(results)
+    with Pool(workers) as pool:
+        return merge(pool.imap_unordered(play_rounds, tasks))
+
+
+def leaderboard(merged):
+    """Rank strategies by overall win rate, then mean score"""
+    board = {}
+    for (strategy_name, mode, difficulty), totals in merged.items():
+        entry = board.setdefault(strategy_name, {'rounds': 0, 'wins': 0, 'score': 0})
+        for field in entry:
+            entry[field] += totals[field]
+    return sorted(
+        ((name, entry['wins'] / entry['rounds'], entry['score'] / entry['rounds'])
+         for name, entry in board.items()),
+        key=lambda row: (row[1], row[2]),
+        reverse=True
+    )
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    start = time.perf_counter()
+    merged = run_tournament(rounds=rounds, workers=workers)
+    duration = time.perf_counter() - start
+    total = sum(totals['rounds'] for totals in merged.values())
+
+    print(f"=== Tournament: {rounds} rounds per strategy, mode and difficulty ===")
+    for difficulty in DIFFICULTY_ATTEMPTS:
+        print(f"\n{difficulty.capitalize()}:")
+        for strategy_name in STRATEGIES:
+            for mode in GAME_MODES:
+                totals = merged[(strategy_name, mode, difficulty)]
+                print(f"  {strategy_name:>18} {mode:>12}: "
+                      f"win rate {totals['wins'] / totals['rounds'] * 100:5.1f}%  "
+                      f"mean score {totals['score'] / totals['rounds']:6.1f}")
+
+    print("\nLeaderboard:")
+    for rank, (name, win_rate, mean_score) in enumerate(leaderboard(merged), 1):
+        print(f"  {rank}. {name:<18} {win_rate * 100:5.1f}%  {mean_score:6.1f}")
+    print(f"\n{total} rounds in {duration:.2f}s ({total / duration:.0f} rounds/s)")
+
+
+if __name__ == "__main__":
+    main()